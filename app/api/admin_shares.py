@@ -12,6 +12,9 @@ from ..models.models import ShareLink
 from ..schemas.schemas import ShareLinkResponse, ShareListResponse
 from ..core.deps import get_current_user, get_current_admin, get_current_user_optional
 from ..services.share_parser import clean_share_url, extract_password_from_text
+from ..services.share_checker import share_checker
+from ..services.share_recleaner import share_recleaner
+from ..services.tmdb_service import clear_search_misses
 
 router = APIRouter(tags=["分享管理"])
 
@@ -454,6 +457,10 @@ async def edit_share_title(
             raise HTTPException(status_code=400, detail="share_type 必须是 movie、tv 或 movie_collection")
         share.share_type = request.share_type if request.share_type else share.share_type
 
+    # 手动修正标题或 TMDB ID 后，之前搜索无结果的记录不再适用，下次刮削时重新搜索
+    if request.manual_title or request.manual_tmdb_id:
+        clear_search_misses(db, [share.manual_title, share.clean_title])
+
     db.commit()
 
     return {
@@ -576,21 +583,20 @@ async def reparse_unparsed_shares(
 
 
 async def _batch_parse_shares_concurrent(shares_data: list, max_workers: int = 5):
-    """多线程并发解析分享"""
+    """多线程并发解析分享（每种网盘独立计算并发数，慢网盘不会占满其他网盘的名额）"""
     import asyncio
     from .shares import parse_and_update_share
 
-    semaphore = asyncio.Semaphore(max_workers)
+    semaphores = {}
 
     async def parse_with_semaphore(share_id, share_url, password, drive_type):
+        semaphore = semaphores.setdefault(drive_type, asyncio.Semaphore(max_workers))
         async with semaphore:
             try:
                 await parse_and_update_share(share_id, share_url, password, drive_type)
                 print(f"[OK] Parsed share {share_id}")
             except Exception as e:
                 print(f"[FAIL] Parse share {share_id} error: {e}")
-            # 小延迟避免请求过快
-            await asyncio.sleep(0.2)
 
     # 创建所有任务
     tasks = [
@@ -603,6 +609,40 @@ async def _batch_parse_shares_concurrent(shares_data: list, max_workers: int = 5
     print(f"[DONE] Batch parse completed: {len(shares_data)} shares")
 
 
+@admin_router.post("/check-liveness", summary="检测分享有效性")
+async def check_shares_liveness(
+    background_tasks: BackgroundTasks,
+    limit: int = Query(200, ge=1, le=5000, description="本次最多检测的分享数"),
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    立即执行一轮分享有效性检测（后台执行）
+
+    - 按下次检测时间挑选最久未检测的 active 分享
+    - 只请求分享信息接口，不列举文件；失效的分享标记为 expired
+    """
+    background_tasks.add_task(share_checker.run_once, limit)
+    return {"message": f"已提交有效性检测任务（最多 {limit} 个分享）"}
+
+
+@admin_router.post("/reclean", summary="按新清洗规则重新清洗")
+async def reclean_shares(
+    background_tasks: BackgroundTasks,
+    current_admin: User = Depends(get_current_admin)
+):
+    """
+    清洗规则更新后，用已保存的原始标题和文件名重新清洗（后台执行）
+
+    - 只处理清洗规则版本不是当前版本的分享和文件，不请求网盘
+    - 重新计算 clean_title、share_type、季号、集号、分辨率和编码等字段
+    - 与 reparse-all 不同，不会重新列举文件，也不会重新刮削元数据
+    """
+    if share_recleaner.running:
+        raise HTTPException(status_code=409, detail="重新清洗任务正在执行")
+    background_tasks.add_task(share_recleaner.run)
+    return {"message": "已提交重新清洗任务"}
+
+
 def _share_to_dict(share: ShareLink, include_submitter: bool = False) -> dict:
     """转换分享为字典"""
     result = {
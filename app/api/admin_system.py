@@ -12,7 +12,10 @@ from ..schemas.admin import (
     AnnouncementListResponse, SystemConfigCreate, SystemConfigUpdate,
     SystemConfigResponse, SystemConfigListResponse
 )
+from ..core.config_cache import config_cache
 from ..core.deps import get_current_admin
+from ..services.share_parser import parse_rate_limit_value
+from ..services.title_cleaner import validate_title_cleaner_config
 
 router = APIRouter(tags=["系统管理"])
 
@@ -129,6 +132,22 @@ async def delete_announcement(
 admin_config_router = APIRouter(prefix="/admin/configs")
 
 
+def _validate_config_value(config_key: str, config_value: Optional[str]):
+    """校验需要立即生效的配置值（网盘请求速率必须是非负数字，追加的清洗规则必须是有效的正则）"""
+    if config_key.endswith("_rate_limit"):
+        try:
+            parse_rate_limit_value(config_value)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="请求速率必须是非负数字（每秒请求数，0 表示不限速）"
+            )
+    try:
+        validate_title_cleaner_config(config_key, config_value)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"清洗规则无效: {e}")
+
+
 @admin_config_router.get("", response_model=SystemConfigListResponse, summary="获取配置列表")
 async def list_configs(
     group: Optional[str] = Query(None, description="配置分组"),
@@ -162,6 +181,7 @@ async def create_config(
     """创建系统配置（管理员）"""
     if db.query(SystemConfig).filter(SystemConfig.config_key == data.config_key).first():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="配置键已存在")
+    _validate_config_value(data.config_key, data.config_value)
     
     config = SystemConfig(
         config_key=data.config_key,
@@ -173,6 +193,8 @@ async def create_config(
     db.add(config)
     db.commit()
     db.refresh(config)
+    # 更新系统配置缓存（订阅者立即生效，其他进程重新读取）
+    await config_cache.update(config.config_key, config.config_value)
     return SystemConfigResponse.model_validate(config)
 
 
@@ -189,11 +211,14 @@ async def update_config(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="配置不存在")
     
     update_dict = data.model_dump(exclude_unset=True)
+    if "config_value" in update_dict:
+        _validate_config_value(config_key, update_dict["config_value"])
     for field, value in update_dict.items():
         setattr(config, field, value)
     
     db.commit()
     db.refresh(config)
+    await config_cache.update(config.config_key, config.config_value)
     return SystemConfigResponse.model_validate(config)
 
 
@@ -210,6 +235,7 @@ async def delete_config(
     
     db.delete(config)
     db.commit()
+    await config_cache.update(config_key, None)
     return {"message": "配置已删除"}
 
 
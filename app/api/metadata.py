@@ -104,6 +104,12 @@ def _to_response(metadata: MediaMetadata) -> MetadataResponse:
             genres = json.loads(metadata.genres)
         except:
             pass
+    alternative_titles = []
+    if metadata.alternative_titles:
+        try:
+            alternative_titles = json.loads(metadata.alternative_titles)
+        except:
+            pass
     
     return MetadataResponse(
         tmdb_id=metadata.tmdb_id,
@@ -119,7 +125,9 @@ def _to_response(metadata: MediaMetadata) -> MetadataResponse:
         genres=genres,
         status=metadata.status,
         total_seasons=metadata.total_seasons,
-        total_episodes=metadata.total_episodes
+        total_episodes=metadata.total_episodes,
+        imdb_id=metadata.imdb_id,
+        alternative_titles=alternative_titles
     )
 
 
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -9,7 +10,8 @@ from ..schemas.schemas import (
     ShareLinkCreate, ShareLinkResponse, ShareListResponse,
     ShareFileResponse, SharerResponse, MetadataResponse
 )
-from ..services.share_parser import tianyi_parser, clean_share_url, extract_password_from_text
+from ..services.share_parser import get_parser, clean_share_url, extract_password_from_text
+from ..services.title_cleaner import title_cleaner, file_name_cleaner
 from ..services.tmdb_service import TMDBService
 from ..core.deps import get_current_user, get_current_user_optional, require_permission
 import json
@@ -59,17 +61,73 @@ async def parse_and_update_share(share_id: int, share_url: str, password: str, d
         if not share:
             return
 
+        # 文件列表按批次与已有记录比对（按 file_id 匹配）：
+        # 只插入新增文件、只更新有变化的文件，解析完成后删除远端已不存在的文件。
+        # 未变化的文件保持原样，电影合集中每个文件的刮削结果（media_id/poster_url）得以保留。
+        # 爬取期间只在内存中记录比对结果，不持有数据库事务（SQLite 写事务跨越网络请求会阻塞其他写入）；
+        # 解析完成后在一个短事务中写入，解析失败时不写入，保留旧列表
+        existing_files = {
+            row.file_id: (row.id, _share_file_signature(row))
+            for row in db.query(ShareFile.id, *_SHARE_FILE_DIFF_COLUMNS).filter(
+                ShareFile.share_link_id == share_id
+            )
+        }
+        seen_file_ids = set()
+        inserts: List[dict] = []
+        updates: List[dict] = []
+        # 解析开始时的清洗规则版本（解析期间规则更新时，记录会被离线重新清洗）
+        title_version = title_cleaner.version
+        file_version = file_name_cleaner.version
+
+        async def save_files(batch: List[dict]):
+            for f in batch:
+                values = _share_file_values(share_id, f, file_version)
+                file_id = values["file_id"]
+                if file_id in seen_file_ids:
+                    continue
+                seen_file_ids.add(file_id)
+
+                existing = existing_files.get(file_id)
+                if existing is None:
+                    inserts.append(values)
+                elif existing[1] != _share_file_signature(values):
+                    updates.append({"id": existing[0], **values})
+
         # 根据网盘类型选择解析器
-        result = None
-        if drive_type == "tianyi":
-            result = await tianyi_parser.parse_share(share_url, password)
+        parser = get_parser(drive_type)
+        if parser is None:
+            share.status = "parse_failed"
+            share.reject_reason = f"暂不支持该网盘类型: {drive_type}"
+            db.commit()
+            print(f"Unsupported drive type for share {share_id}: {drive_type}")
+            return
+
+        # 爬取前结束读事务，爬取期间不占用数据库
+        db.commit()
+        result = await parser.parse_share(share_url, password, on_files=save_files)
 
         if result:
+            if inserts:
+                db.execute(insert(ShareFile), inserts)
+            if updates:
+                db.execute(update(ShareFile), updates)
+            # 文件列表不完整（超出爬取预算等）时不删除未见到的文件，避免误删
+            if result.get("complete", True):
+                removed_ids = [
+                    row_id for file_id, (row_id, _) in existing_files.items()
+                    if file_id not in seen_file_ids
+                ]
+                for i in range(0, len(removed_ids), 500):
+                    db.query(ShareFile).filter(
+                        ShareFile.id.in_(removed_ids[i:i + 500])
+                    ).delete(synchronize_session=False)
+
             # 更新分享信息
             share.raw_title = result.get("raw_title", "")
             share.clean_title = result.get("clean_title", "")
             share.share_type = result.get("share_type", "tv")
             share.share_code = result.get("share_code", "")
+            share.cleaner_version = title_version
             share.file_count = result.get("file_count", 0)
             share.status = "active"  # 解析成功，设置为活跃状态
 
@@ -80,26 +138,6 @@ async def parse_and_update_share(share_id: int, share_url: str, password: str, d
                 if sharer:
                     share.sharer_id = sharer.id
 
-            # 保存文件列表（重新解析时先清空旧列表，避免重复）
-            db.query(ShareFile).filter(ShareFile.share_link_id == share_id).delete()
-
-            for f in result.get("files", []):
-                db_file = ShareFile(
-                    share_link_id=share_id,
-                    file_id=f["file_id"],
-                    file_name=f["file_name"],
-                    clean_name=f.get("clean_name"),
-                    file_size=f["file_size"],
-                    is_directory=f["is_directory"],
-                    file_type=f.get("file_type", "other"),
-                    season_number=f.get("season_number"),
-                    episode_number=f.get("episode_number"),
-                    resolution=f.get("resolution"),
-                    video_codec=f.get("video_codec"),
-                    audio_codec=f.get("audio_codec")
-                )
-                db.add(db_file)
-
             db.commit()
 
             # 保存提取的 TMDB ID
@@ -120,7 +158,7 @@ async def parse_and_update_share(share_id: int, share_url: str, password: str, d
                 # 电影合集：刮削每个视频文件
                 await scrape_collection_files(db, share)
         else:
-            # 解析失败，标记状态
+            # 解析失败，保留旧文件列表并标记状态
             share.status = "parse_failed"
             share.reject_reason = "分享链接解析失败，可能是链接已失效、需要访问码或网络问题"
             db.commit()
@@ -129,6 +167,7 @@ async def parse_and_update_share(share_id: int, share_url: str, password: str, d
     except Exception as e:
         # 异常情况也标记为解析失败
         try:
+            db.rollback()
             share = db.query(ShareLink).filter(ShareLink.id == share_id).first()
             if share:
                 share.status = "parse_failed"
@@ -143,6 +182,43 @@ async def parse_and_update_share(share_id: int, share_url: str, password: str, d
         db.close()
 
 
+# 增量比对时参与比较的文件字段
+_SHARE_FILE_DIFF_COLUMNS = (
+    ShareFile.file_id, ShareFile.file_name, ShareFile.clean_name, ShareFile.file_size,
+    ShareFile.file_path, ShareFile.parent_id, ShareFile.is_directory, ShareFile.file_type,
+    ShareFile.season_number, ShareFile.episode_number, ShareFile.resolution,
+    ShareFile.video_codec, ShareFile.audio_codec, ShareFile.cleaner_version
+)
+
+
+def _share_file_signature(row) -> tuple:
+    """文件记录（查询行或行数据字典）中参与比对的字段值"""
+    if isinstance(row, dict):
+        return tuple(row.get(column.key) for column in _SHARE_FILE_DIFF_COLUMNS)
+    return tuple(getattr(row, column.key) for column in _SHARE_FILE_DIFF_COLUMNS)
+
+
+def _share_file_values(share_id: int, f: dict, cleaner_version: Optional[str] = None) -> dict:
+    """解析结果中的单个文件转换为 share_files 行数据"""
+    return {
+        "share_link_id": share_id,
+        "file_id": f["file_id"],
+        "file_name": f["file_name"],
+        "clean_name": f.get("clean_name"),
+        "file_size": f["file_size"],
+        "file_path": f.get("file_path"),
+        "parent_id": f.get("parent_id"),
+        "is_directory": f["is_directory"],
+        "file_type": f.get("file_type", "other"),
+        "season_number": f.get("season_number"),
+        "episode_number": f.get("episode_number"),
+        "resolution": f.get("resolution"),
+        "video_codec": f.get("video_codec"),
+        "audio_codec": f.get("audio_codec"),
+        "cleaner_version": cleaner_version
+    }
+
+
 async def scrape_share_metadata_legacy(db: Session, share: ShareLink, clean_title: str, share_type: str, year: int = None):
     """刮削分享的元数据（TV剧集或单部电影）- 旧版本，用于 parse_and_update_share"""
     try:
@@ -157,6 +233,7 @@ async def scrape_share_metadata_legacy(db: Session, share: ShareLink, clean_titl
             share.poster_url = metadata.poster_url
             db.commit()
             print(f"Scraped metadata for '{clean_title}': {metadata.title}, poster: {metadata.poster_url}")
+            tmdb_service.prefetch_series(metadata)
         else:
             print(f"No metadata found for '{clean_title}'")
     except Exception as e:
@@ -219,6 +296,7 @@ async def scrape_share_metadata(share_id: int):
             share.poster_url = metadata.poster_url
             db.commit()
             print(f"Scraped metadata for share {share_id}: {metadata.title}, poster: {metadata.poster_url}")
+            tmdb_service.prefetch_series(metadata)
         else:
             print(f"No metadata found for share {share_id}")
 
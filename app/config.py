@@ -9,8 +9,84 @@ class Settings(BaseSettings):
 
     # TMDB API 配置 - 从数据库系统配置表读取，不再从环境变量读取
     tmdb_base_url: str = "https://api.themoviedb.org/3"
+    # TMDB 客户端 - 进程级共享的连接池、并发上限和请求速率（所有刮削任务和 API 请求共用）
+    tmdb_timeout: float = 10.0
+    tmdb_max_connections: int = 20
+    tmdb_max_keepalive_connections: int = 10
+    tmdb_keepalive_expiry: float = 30.0
+    tmdb_max_concurrency: int = 16  # 同时进行中的请求数上限
+    tmdb_rate_limit: float = 20.0  # 每秒请求数上限（0 表示不限速），超出时排队等待
+    tmdb_max_retries: int = 2  # 被限流（429）、服务端出错或超时后的重试次数
 
-    # Redis 配置 - 可选，如果不配置则不使用缓存
+    # TMDB 搜索无结果的否定缓存：有效期内不再为同一搜索请求 TMDB，连续无结果时有效期翻倍
+    tmdb_miss_ttl_hours: float = 24.0
+    tmdb_miss_max_ttl_hours: float = 24.0 * 30
+
+    # 分享匹配到电视剧后预取全部季和集信息（剧集详情页不再等待 TMDB）
+    tmdb_prefetch_episodes: bool = True
+
+    # 网盘分享目录树爬取预算（单个分享，所有网盘共用）
+    share_crawl_concurrency: int = 4  # 同层兄弟目录并发列举数
+    share_crawl_max_depth: int = 5  # 最大目录深度（根目录内容为第 0 层）
+    share_crawl_max_files: int = 5000  # 最多收录的文件/目录条目数
+    share_crawl_timeout: float = 60.0  # 爬取总耗时上限（秒）
+
+    # 天翼云盘解析器 - 每个网盘独立的连接池、并发上限和请求速率
+    # api_base 可指向本地桩服务，用于测试和压测
+    tianyi_api_base: str = "https://cloud.189.cn"
+    tianyi_http2: bool = True  # 服务端支持时启用 HTTP/2（需要安装 h2）
+    tianyi_timeout: float = 30.0
+    tianyi_max_connections: int = 20
+    tianyi_max_keepalive_connections: int = 10
+    tianyi_keepalive_expiry: float = 30.0
+    tianyi_max_concurrency: int = 16  # 同时进行中的请求数上限
+    tianyi_rate_limit: float = 10.0  # 每秒请求数上限（0 表示不限速）
+    tianyi_list_page_size: int = 1000  # listShareDir 每页条目数
+
+    # 天翼云盘分享信息 / 访问码验证缓存
+    tianyi_cache_maxsize: int = 2048
+    tianyi_share_info_cache_ttl: float = 300.0  # 成功结果缓存时间（秒）
+    tianyi_negative_cache_ttl: float = 60.0  # 失效、访问码错误等结果缓存时间（秒）
+
+    # 阿里云盘解析器
+    aliyun_api_base: str = "https://api.aliyundrive.com"
+    aliyun_http2: bool = True
+    aliyun_timeout: float = 30.0
+    aliyun_max_connections: int = 10
+    aliyun_max_keepalive_connections: int = 5
+    aliyun_keepalive_expiry: float = 30.0
+    aliyun_max_concurrency: int = 8
+    aliyun_rate_limit: float = 5.0
+
+    # 夸克网盘解析器
+    quark_api_base: str = "https://drive-pc.quark.cn"
+    quark_http2: bool = True
+    quark_timeout: float = 30.0
+    quark_max_connections: int = 10
+    quark_max_keepalive_connections: int = 5
+    quark_keepalive_expiry: float = 30.0
+    quark_max_concurrency: int = 8
+    quark_rate_limit: float = 5.0
+
+    # 分享有效性检测（只请求分享信息接口，不列举文件）
+    share_check_enabled: bool = True  # 是否在后台定时检测
+    share_check_loop_interval: float = 600.0  # 后台检测轮询间隔（秒）
+    share_check_batch_size: int = 200  # 每轮最多检测的分享数
+    share_check_concurrency: int = 8  # 同时检测的分享数
+    share_check_time_budget: float = 300.0  # 每轮检测耗时上限（秒）
+    share_check_min_interval_hours: float = 6.0  # 热门分享的检测间隔
+    share_check_max_interval_hours: float = 24.0 * 14  # 冷门分享的检测间隔
+    share_check_retry_hours: float = 1.0  # 无法判断（网络错误/限流）时的重试间隔
+
+    # 标题/文件名清洗结果缓存（按原始字符串和规则版本记忆，0 表示不缓存）
+    title_cleaner_cache_maxsize: int = 10000
+    file_name_cleaner_cache_maxsize: int = 100000
+
+    # 离线重新清洗（清洗规则更新后按已保存的原始标题/文件名重算，不请求网盘）
+    reclean_file_chunk_size: int = 10000  # 每批重新清洗的文件数
+    reclean_share_chunk_size: int = 500  # 每批重新清洗的分享数（需同时读取这些分享的文件统计）
+
+    # Redis 配置 - 可选，如果不配置则不使用缓存（配置后多进程部署时通过 Redis 通知其他进程系统配置已变更）
     redis_url: str = ""
 
     # JWT配置
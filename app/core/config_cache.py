@@ -0,0 +1,236 @@
+"""系统配置进程内缓存"""
+import asyncio
+import json
+import threading
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.app_version import SystemConfig
+
+settings = get_settings()
+
+# 跨进程失效通知的 Redis 频道
+CONFIG_CHANNEL = "system_config:changed"
+
+ConfigCallback = Callable[[str, Optional[str]], None]
+# 批量订阅的回调参数为所订阅的全部键的当前值 {配置键: 值}
+ConfigGroupCallback = Callable[[Dict[str, Optional[str]]], None]
+
+
+class ConfigCache:
+    """
+    系统配置缓存（进程级单例）
+
+    - 启动时一次性读取 system_configs，之后读取配置不再查询数据库（首次读取时未加载则自动加载）
+    - 按键订阅配置变化：加载和配置变化时调用回调（配置被删除时值为 None），用于让网盘请求速率等立即生效
+    - 批量订阅一组键：一次加载或更新中无论其中几个键变化，只回调一次并传入这组键的全部当前值，
+      用于需要由多个配置共同重建的状态（如追加的清洗规则）
+    - 管理接口写入配置后调用 update 更新本进程缓存；配置了 redis_url 时通过 Redis 发布通知，其他进程收到后从数据库重新读取该配置
+    """
+
+    def __init__(self, redis_url: str = ""):
+        self.redis_url = redis_url
+        self._values: Dict[str, Optional[str]] = {}
+        self._loaded = False
+        self._subscribers: Dict[str, List[ConfigCallback]] = {}
+        self._group_subscribers: List[Tuple[Tuple[str, ...], ConfigGroupCallback]] = []
+        self._lock = threading.Lock()
+        self._instance_id = uuid.uuid4().hex
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    # ---------- 读取 ----------
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """读取配置值，不存在或为空时返回 default"""
+        if not self._loaded:
+            self._load_with_new_session()
+        value = self._values.get(key)
+        return default if value is None or value == "" else value
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        """读取整数配置，不存在或无法解析时返回 default"""
+        try:
+            return int(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        """读取浮点数配置，不存在或无法解析时返回 default"""
+        try:
+            return float(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """读取布尔配置（true/1/yes/on 为真），不存在时返回 default"""
+        value = self.get(key)
+        if value is None:
+            return default
+        return value.strip().lower() in ("true", "1", "yes", "on")
+
+    def get_json(self, key: str, default=None):
+        """读取 JSON 配置，不存在或无法解析时返回 default"""
+        value = self.get(key)
+        if value is None:
+            return default
+        try:
+            return json.loads(value)
+        except ValueError:
+            return default
+
+    # ---------- 订阅 ----------
+
+    def subscribe(self, key: str, callback: ConfigCallback):
+        """订阅配置变化（回调参数为配置键和新值）；订阅时缓存已加载且有值则立即回调一次"""
+        self._subscribers.setdefault(key, []).append(callback)
+        if self._loaded and self._values.get(key) is not None:
+            self._notify(key, self._values[key], [callback])
+
+    def subscribe_many(self, keys: Iterable[str], callback: ConfigGroupCallback):
+        """批量订阅一组配置（每次加载或更新只回调一次）；订阅时缓存已加载且其中有值则立即回调一次"""
+        keys = tuple(keys)
+        self._group_subscribers.append((keys, callback))
+        if self._loaded and any(self._values.get(key) is not None for key in keys):
+            self._call(", ".join(keys), callback, {key: self._values.get(key) for key in keys})
+
+    def _notify(self, key: str, value: Optional[str], callbacks: Optional[List[ConfigCallback]] = None):
+        for callback in callbacks if callbacks is not None else self._subscribers.get(key, []):
+            self._call(key, callback, key, value)
+
+    def _notify_changed(self, changed: Iterable[str]):
+        """通知值有变化的键：先逐键回调，再对每个涉及变化的批量订阅回调一次"""
+        changed = set(changed)
+        for key in changed:
+            self._notify(key, self._values.get(key))
+        for keys, callback in self._group_subscribers:
+            if changed.intersection(keys):
+                self._call(", ".join(keys), callback, {key: self._values.get(key) for key in keys})
+
+    def _call(self, label: str, callback: Callable, *args):
+        try:
+            callback(*args)
+        except ValueError as e:
+            # 不打印配置值（可能是敏感配置）
+            print(f"[ConfigCache] invalid config {label}: {e}")
+        except Exception as e:
+            print(f"[ConfigCache] config callback for {label} failed: {e}")
+            import traceback
+            traceback.print_exc()
+
+    # ---------- 加载和更新 ----------
+
+    def load(self, db: Session):
+        """从数据库读取全部配置（应用启动和批处理脚本开始时调用），值有变化的键通知订阅者"""
+        self._replace({c.config_key: c.config_value for c in db.query(SystemConfig)})
+
+    def _replace(self, values: Dict[str, Optional[str]]):
+        with self._lock:
+            previous, self._values = self._values, values
+            self._loaded = True
+        self._notify_changed(
+            key for key in set(previous) | set(values) if previous.get(key) != values.get(key)
+        )
+
+    def _load_with_new_session(self):
+        self._replace(self._read_all())
+
+    def _read_all(self) -> Dict[str, Optional[str]]:
+        db = SessionLocal()
+        try:
+            return {c.config_key: c.config_value for c in db.query(SystemConfig)}
+        finally:
+            db.close()
+
+    def _read_key(self, key: str) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            config = db.query(SystemConfig).filter(SystemConfig.config_key == key).first()
+            return config.config_value if config else None
+        finally:
+            db.close()
+
+    def set_local(self, key: str, value: Optional[str]):
+        """更新本进程缓存（value 为 None 表示配置已删除），值有变化时通知订阅者"""
+        with self._lock:
+            previous = self._values.get(key)
+            if value is None:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = value
+        if previous != value:
+            self._notify_changed([key])
+
+    async def update(self, key: str, value: Optional[str]):
+        """配置写入数据库后调用：更新本进程缓存，并通知其他进程重新读取"""
+        self.set_local(key, value)
+        await self._publish(key)
+
+    # ---------- 跨进程失效（可选，需配置 redis_url） ----------
+
+    async def start(self):
+        """应用启动时订阅其他进程的配置变更通知（未配置 redis_url 时不做处理）"""
+        if not self.redis_url or self._listener is not None:
+            return
+        import redis.asyncio as aioredis
+        self._redis = aioredis.from_url(self.redis_url)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """应用关闭时停止订阅并关闭 Redis 连接"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _publish(self, key: str):
+        if self._redis is None:
+            return
+        message = json.dumps({"key": key, "origin": self._instance_id})
+        try:
+            await self._redis.publish(CONFIG_CHANNEL, message)
+        except Exception as e:
+            # 通知失败不影响配置写入，其他进程在重新订阅时会全量重新加载
+            print(f"[ConfigCache] publish failed: {e}")
+
+    async def _listen(self):
+        """订阅配置变更通知，连接断开后重连；每次（重新）订阅后全量重新加载，避免漏掉断开期间的变更"""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(CONFIG_CHANNEL)
+                # 数据库读取放到线程中，订阅者回调仍在事件循环线程中执行
+                self._replace(await asyncio.to_thread(self._read_all))
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        data = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    if data.get("origin") == self._instance_id or not data.get("key"):
+                        continue
+                    self.set_local(data["key"], await asyncio.to_thread(self._read_key, data["key"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[ConfigCache] redis subscription error: {e}, reconnecting in 5s")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+config_cache = ConfigCache(settings.redis_url)
@@ -0,0 +1,95 @@
+"""异步限流工具"""
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    自适应异步令牌桶限流器
+
+    - rate: 每秒补充的令牌数（即平均请求速率），<= 0 表示不限速
+    - burst: 桶容量（允许的瞬时突发请求数），默认与 rate 相同
+    - 等待令牌的协程按先来先到顺序获得令牌
+    - 服务端限流或出错时调用 penalize() 将当前速率减半（不低于 min_ratio * rate），
+      之后每次成功请求调用 reward() 按 recovery_ratio * rate 逐步恢复到配置速率
+    - 不限速（rate <= 0）时收到限流信号，先以 probe_rate 作为速率开始降速，
+      恢复到 probe_rate 后重新不限速
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        min_ratio: float = 0.1,
+        recovery_ratio: float = 0.05,
+        probe_rate: float = 10.0
+    ):
+        self.min_ratio = min_ratio
+        self.recovery_ratio = recovery_ratio
+        self.probe_rate = probe_rate
+        self._burst = burst
+        self._lock = asyncio.Lock()
+        self.base_rate = rate
+        self.rate = rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def set_rate(self, rate: float):
+        """修改配置速率（立即生效，并清除之前的降速状态）"""
+        self._refill()
+        self.base_rate = rate
+        self.rate = rate
+
+    @property
+    def _backoff_base(self) -> float:
+        """降速和恢复的基准速率：配置速率，不限速时为 probe_rate"""
+        return self.base_rate if self.base_rate > 0 else self.probe_rate
+
+    @property
+    def capacity(self) -> float:
+        """桶容量，降速期间随当前速率一起收缩"""
+        burst = self._burst if self._burst is not None else max(1.0, self._backoff_base)
+        return min(burst, max(1.0, self.rate))
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def penalize(self, retry_after: float = 0):
+        """服务端限流/出错：速率减半（不限速时从 probe_rate 开始），并清空桶内令牌（retry_after 秒内不再放行请求）"""
+        if self.probe_rate <= 0 and self.base_rate <= 0:
+            return
+        self._refill()
+        base = self._backoff_base
+        if self.rate <= 0:
+            # 不限速期间不计令牌，从空桶开始
+            self._tokens = 0.0
+        current = self.rate if self.rate > 0 else base * 2
+        self.rate = max(base * self.min_ratio, current * 0.5)
+        self._tokens = min(self._tokens, 0.0) - retry_after * self.rate
+
+    def reward(self):
+        """请求成功：逐步恢复到配置速率（不限速时恢复到 probe_rate 后重新不限速）"""
+        if self.rate <= 0 or (self.base_rate > 0 and self.rate >= self.base_rate):
+            return
+        self._refill()
+        base = self._backoff_base
+        self.rate = self.rate + base * self.recovery_ratio
+        if self.rate >= base:
+            self.rate = self.base_rate
+
+    async def acquire(self, tokens: float = 1.0):
+        """获取令牌，令牌不足时等待"""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while self.rate > 0:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -0,0 +1,35 @@
+"""合并并发的相同请求"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    进行中请求合并（single-flight）
+
+    同一个键同时只执行一次：第一个调用方发起请求，其余调用方等待同一个结果（或同一个异常）。
+    只合并进行中的请求，不缓存结果，请求结束后再来的调用会重新执行。
+    请求在独立的任务中执行，某个调用方被取消不会影响其他等待者。
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """执行 func（同一个键已有进行中的请求时等待它的结果）"""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 所有调用方都已取消时也取走异常，避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
@@ -4,10 +4,15 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 import os
 
-from .database import engine, Base
+from .database import engine, Base, SessionLocal
 from .api import metadata, shares
 from .api import auth, admin_users, admin_versions, admin_system, admin_shares, admin_stats
 from .init_db import init_db
+from .core.config_cache import config_cache
+from .services.share_parser import startup_parsers, close_parsers
+from .services.tmdb_client import tmdb_client
+from .services.tmdb_service import wait_prefetches
+from .services.share_checker import share_checker
 from .migrations import run_migrations
 
 # 创建数据库表并初始化数据
@@ -57,6 +62,34 @@ app.include_router(admin_shares.router, prefix="/api")
 app.include_router(admin_stats.router, prefix="/api")
 
 
+@app.on_event("startup")
+async def on_startup():
+    """创建进程级共享的网盘和 TMDB HTTP 客户端（每种网盘一个），并加载系统配置缓存（请求速率、追加的清洗规则等立即生效）"""
+    await startup_parsers()
+    await tmdb_client.startup()
+
+    db = SessionLocal()
+    try:
+        config_cache.load(db)
+    finally:
+        db.close()
+    # 配置了 redis_url 时订阅其他进程的配置变更
+    await config_cache.start()
+
+    # 后台定时检测分享有效性
+    share_checker.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """关闭共享 HTTP 客户端，释放连接池"""
+    await share_checker.stop()
+    await config_cache.stop()
+    await close_parsers()
+    await wait_prefetches(cancel=True)
+    await tmdb_client.close()
+
+
 @app.get("/api")
 async def root():
     return {"message": "Video Share API", "version": "2.0.0"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, BigInteger, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, BigInteger, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -27,6 +27,8 @@ class MediaMetadata(Base):
     status = Column(String(50))
     total_seasons = Column(Integer)
     total_episodes = Column(Integer)
+    imdb_id = Column(String(20), index=True)  # 外部 ID（详情请求时一并获取）
+    alternative_titles = Column(Text)  # JSON array，各地区别名
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -34,6 +36,38 @@ class MediaMetadata(Base):
     seasons = relationship("TvSeason", back_populates="media", cascade="all, delete-orphan")
 
 
+class MetadataQueryCache(Base):
+    """搜索结果缓存表 - 规范化搜索词到已确认元数据的精确映射，本地命中时不再请求 TMDB"""
+    __tablename__ = "metadata_query_cache"
+    __table_args__ = (
+        UniqueConstraint('query', 'year', 'media_type', name='uq_metadata_query'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    query = Column(String(255), nullable=False)  # 规范化后的搜索词（忽略大小写和多余空白）
+    year = Column(Integer, nullable=False, default=0)  # 搜索年份，0 表示不限年份
+    media_type = Column(String(20), nullable=False)  # movie, tv
+    media_id = Column(Integer, ForeignKey("media_metadata.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class TmdbSearchMiss(Base):
+    """TMDB 搜索无结果记录 - 否定缓存，避免反复为同一个无法匹配的标题请求 TMDB"""
+    __tablename__ = "tmdb_search_misses"
+    __table_args__ = (
+        UniqueConstraint('query', 'year', 'media_type', name='uq_tmdb_search_miss'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    query = Column(String(255), nullable=False)  # 规范化后的搜索词（忽略大小写和多余空白）
+    year = Column(Integer, nullable=False, default=0)  # 搜索年份，0 表示不限年份
+    media_type = Column(String(20), nullable=False)  # movie, tv
+    miss_count = Column(Integer, default=1)  # 连续无结果次数
+    last_miss_at = Column(DateTime)
+    expires_at = Column(DateTime, nullable=False)  # 到期前不再请求 TMDB
+    created_at = Column(DateTime, server_default=func.now())
+
+
 class Sharer(Base):
     """分享人表 - 存储网盘分享者信息"""
     __tablename__ = "sharers"
@@ -105,6 +139,7 @@ class ShareLink(Base):
     manual_title = Column(String(255))  # 手动修正的标题（优先级高于clean_title）
     manual_tmdb_id = Column(Integer)  # 手动指定的TMDB ID（优先级高于自动提取）
     extracted_tmdb_id = Column(Integer)  # 从标题中提取的TMDB ID
+    cleaner_version = Column(String(32))  # 清洗标题时的清洗规则版本（为空表示未知，需重新清洗）
 
     # 分享类型: tv(剧集), movie(单部电影), movie_collection(电影合集)
     share_type = Column(String(50), default="tv")
@@ -133,6 +168,7 @@ class ShareLink(Base):
     audited_by = Column(Integer, ForeignKey("users.id"))  # 审核人
 
     last_check_at = Column(DateTime)  # 最后有效性检测时间
+    next_check_at = Column(DateTime, index=True)  # 下次有效性检测时间（为空表示尽快检测）
 
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -148,6 +184,10 @@ class ShareLink(Base):
 class ShareFile(Base):
     """分享文件表"""
     __tablename__ = "share_files"
+    # 同一分享内 file_id 唯一，重新解析时按 file_id 增量比对
+    __table_args__ = (
+        Index('uq_share_files_link_file', 'share_link_id', 'file_id', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     share_link_id = Column(Integer, ForeignKey("share_links.id", ondelete="CASCADE"), nullable=False)
@@ -175,6 +215,8 @@ class ShareFile(Base):
     video_codec = Column(String(20))  # HEVC, AVC, AV1
     audio_codec = Column(String(20))  # DTS, AAC, FLAC
 
+    cleaner_version = Column(String(32))  # 解析文件名时的清洗规则版本
+
     created_at = Column(DateTime, server_default=func.now())
 
     # 关联
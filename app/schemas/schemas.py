@@ -25,6 +25,8 @@ class MetadataResponse(BaseModel):
     status: Optional[str] = None
     total_seasons: Optional[int] = None
     total_episodes: Optional[int] = None
+    imdb_id: Optional[str] = None
+    alternative_titles: Optional[List[str]] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,155 @@
+import re
+import json
+from typing import Optional, List, Dict, AsyncIterator
+from ..config import get_settings
+from .parser_base import BaseShareParser
+
+settings = get_settings()
+
+
+class AliyunShareParser(BaseShareParser):
+    """阿里云盘分享链接解析器（匿名访问分享，无需登录）"""
+
+    drive_type = "aliyun"
+
+    # 每页条目数（list_by_share 最大 100）
+    PAGE_SIZE = 100
+
+    def __init__(self):
+        super().__init__(
+            base_url=settings.aliyun_api_base,
+            timeout=settings.aliyun_timeout,
+            max_connections=settings.aliyun_max_connections,
+            max_keepalive_connections=settings.aliyun_max_keepalive_connections,
+            keepalive_expiry=settings.aliyun_keepalive_expiry,
+            http2=settings.aliyun_http2,
+            max_concurrency=settings.aliyun_max_concurrency,
+            rate_limit=settings.aliyun_rate_limit
+        )
+
+    def _headers(self, share_token: str = None) -> Dict:
+        headers = {
+            "Content-Type": "application/json",
+            "Referer": "https://www.alipan.com/",
+            "x-canary": "client=web,app=share,version=v2.3.1"
+        }
+        if share_token:
+            headers["x-share-token"] = share_token
+        return headers
+
+    def _extract_share_code(self, share_url: str) -> Optional[str]:
+        """从分享链接提取分享ID"""
+        # https://www.aliyundrive.com/s/xxxxx
+        # https://www.alipan.com/s/xxxxx/folder/xxxxx
+        match = re.search(r"(?:aliyundrive|alipan)\.com/s/([a-zA-Z0-9]+)", share_url)
+        if match:
+            return match.group(1)
+        return None
+
+    async def _post_json(self, api_name: str, url: str, body: Dict, share_token: str = None) -> Optional[Dict]:
+        """POST 请求并解析 JSON，失败（非 200 或返回错误码）时返回 None"""
+        resp = await self._request("POST", url, json=body, headers=self._headers(share_token))
+        print(f"{api_name} response: {resp.text[:500]}")
+
+        try:
+            data = resp.json()
+        except json.JSONDecodeError as e:
+            print(f"JSON parse error in {api_name}: {e}")
+            return None
+
+        if resp.status_code != 200 or data.get("code"):
+            print(f"{api_name} failed: {resp.status_code} {data.get('code')} {data.get('message')}")
+            return None
+        return data
+
+    async def check_share(self, share_code: str, password: str = None) -> Optional[bool]:
+        """只请求 get_share_by_anonymous，分享被取消/过期/封禁时返回 ShareLink.* 错误码"""
+        resp = await self._request(
+            "POST",
+            f"{self.base_url}/adrive/v3/share_link/get_share_by_anonymous?share_id={share_code}",
+            json={"share_id": share_code},
+            headers=self._headers()
+        )
+        try:
+            data = resp.json()
+        except json.JSONDecodeError:
+            return None
+
+        if resp.status_code == 200 and not data.get("code"):
+            return True
+        if str(data.get("code", "")).startswith("ShareLink."):
+            print(f"get_share_by_anonymous: share {share_code} is dead ({data.get('code')})")
+            return False
+        return None
+
+    async def _get_share_info(self, share_code: str, password: str = None) -> Optional[Dict]:
+        """获取分享基本信息和 share_token（后续列举目录需要）"""
+        data = await self._post_json(
+            "get_share_by_anonymous",
+            f"{self.base_url}/adrive/v3/share_link/get_share_by_anonymous?share_id={share_code}",
+            {"share_id": share_code}
+        )
+        if not data:
+            return None
+
+        token_data = await self._post_json(
+            "get_share_token",
+            f"{self.base_url}/v2/share_link/get_share_token",
+            {"share_id": share_code, "share_pwd": password or ""}
+        )
+        if not token_data or not token_data.get("share_token"):
+            print("获取 share_token 失败，可能需要提取码或提取码错误")
+            return None
+
+        # 分享根目录只有一个条目时，以该条目作为分享根（与天翼云盘保持一致）
+        file_infos = data.get("file_infos") or []
+        root = file_infos[0] if len(file_infos) == 1 else None
+        if root and root.get("type") == "file":
+            file_id, is_folder, file_size = root.get("file_id", ""), False, root.get("size", 0)
+        elif root:
+            file_id, is_folder, file_size = root.get("file_id", ""), True, 0
+        else:
+            file_id, is_folder, file_size = "root", True, 0
+
+        return {
+            "fileName": data.get("share_name") or (root or {}).get("file_name", ""),
+            "fileId": file_id,
+            "fileSize": file_size,
+            "isFolder": is_folder,
+            "shareId": share_code,
+            "shareToken": token_data["share_token"],
+            "shareUserId": data.get("creator_id", ""),
+            "shareUserNickName": data.get("display_name") or data.get("creator_name", ""),
+            "shareUserHeadUrl": data.get("avatar", ""),
+        }
+
+    async def _iter_file_list(self, share_info: Dict, folder_id: str, password: str = None, parent_path: str = "") -> AsyncIterator[List[Dict]]:
+        """逐页列举分享目录（按 next_marker 翻页），请求失败时抛出异常"""
+        url = f"{self.base_url}/adrive/v2/file/list_by_share"
+        marker = ""
+        while True:
+            body = {
+                "share_id": share_info["shareId"],
+                "parent_file_id": folder_id,
+                "limit": self.PAGE_SIZE,
+                "order_by": "name",
+                "order_direction": "ASC",
+                "marker": marker
+            }
+            data = await self._post_json("list_by_share", url, body, share_info.get("shareToken"))
+            if data is None:
+                raise RuntimeError(f"list_by_share failed: parent_file_id={folder_id}")
+
+            files = [
+                self._make_file_entry(
+                    item.get("file_id", ""), item.get("name", ""), item.get("size", 0),
+                    item.get("type") == "folder", folder_id, parent_path
+                )
+                for item in data.get("items") or []
+            ]
+            if files:
+                yield files
+
+            marker = data.get("next_marker") or ""
+            if not marker:
+                return
@@ -0,0 +1,393 @@
+import asyncio
+import httpx
+from contextlib import aclosing
+from typing import Optional, List, Dict, AsyncIterator, Awaitable, Callable
+from ..config import get_settings
+from ..core.rate_limit import TokenBucket
+from .title_cleaner import title_cleaner, file_name_cleaner
+from .share_classifier import ShareTypeClassifier
+
+settings = get_settings()
+
+# HTTP/2 依赖 h2 包，未安装时自动回退到 HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class BaseShareParser:
+    """
+    网盘分享链接解析器基类
+
+    负责所有网盘共用的部分：
+    - 每个网盘独立的 HTTP 客户端（连接池 + keep-alive）、并发上限和请求速率限制
+    - 分享目录树的广度优先爬取（深度/条目数/耗时预算）
+    - 标题清洗、分享类型判断和解析结果组装
+
+    子类只需实现三个接口：
+    - _extract_share_code: 从分享链接提取分享码
+    - _get_share_info: 获取分享基本信息，返回统一格式的字典
+      {fileName, fileId, fileSize, isFolder, shareId, shareUserId, shareUserNickName, shareUserHeadUrl, ...}
+    - _iter_file_list: 逐页列举某个目录，每页产出一批由 _make_file_entry 生成的文件条目
+    """
+
+    # 网盘类型（与 ShareLink.drive_type 对应）
+    drive_type: str = ""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        max_concurrency: int = 8,
+        rate_limit: float = 0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+        # 同一网盘同时进行中的请求数上限，以及每秒请求数限制
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+        self.default_rate_limit = rate_limit
+        self.rate_limiter = TokenBucket(rate_limit)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """进程级共享的 HTTP 客户端（连接池 + keep-alive），首次使用时创建"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """创建带连接池限制的 HTTP 客户端"""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        return httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=limits,
+            http2=self.http2 and HTTP2_AVAILABLE
+        )
+
+    async def startup(self):
+        """应用启动时预先创建客户端"""
+        _ = self.client
+
+    async def close(self):
+        """应用关闭时释放连接池"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        发送请求（受该网盘的并发上限和请求速率限制）
+
+        服务端限流（HTTP 429/503）或请求超时时自动降低请求速率，请求成功后逐步恢复；
+        响应体中的限流错误码由子类在解析响应时通过 _penalize_for_code 处理
+        """
+        async with self._request_semaphore:
+            await self.rate_limiter.acquire()
+            try:
+                resp = await self.client.request(method, url, **kwargs)
+            except httpx.TimeoutException:
+                self.rate_limiter.penalize()
+                raise
+
+        if self._is_throttled(resp):
+            retry_after = resp.headers.get("Retry-After", "")
+            self.rate_limiter.penalize(float(retry_after) if retry_after.isdigit() else 0)
+            print(f"[{self.drive_type}] throttled ({resp.status_code}), rate -> {self.rate_limiter.rate:.2f}/s")
+        else:
+            self.rate_limiter.reward()
+        return resp
+
+    def _is_throttled(self, resp: httpx.Response) -> bool:
+        """响应是否表示服务端限流或过载（HTTP 429 / 503），其他错误不降速"""
+        return resp.status_code in (429, 503)
+
+    def _penalize_for_code(self, api_name: str, code):
+        """响应体中的错误码表示限流时降低请求速率（由子类在已解析响应体的调用处调用）"""
+        self.rate_limiter.penalize()
+        print(f"[{self.drive_type}] {api_name} throttled ({code}), rate -> {self.rate_limiter.rate:.2f}/s")
+
+    # ---- 子类实现 ----
+
+    def _extract_share_code(self, share_url: str) -> Optional[str]:
+        """从分享链接提取分享码"""
+        raise NotImplementedError
+
+    async def _get_share_info(self, share_code: str, password: str = None) -> Optional[Dict]:
+        """获取分享基本信息（统一格式），分享失效或访问码错误时返回 None"""
+        raise NotImplementedError
+
+    def _iter_file_list(self, share_info: Dict, folder_id: str, password: str = None, parent_path: str = "") -> AsyncIterator[List[Dict]]:
+        """逐页列举目录内容（parent_path 为该目录在分享内的路径），请求失败时抛出异常"""
+        raise NotImplementedError
+
+    async def check_share(self, share_code: str, password: str = None) -> Optional[bool]:
+        """
+        轻量检测分享是否仍然有效（只请求分享信息，不列举文件）
+
+        返回 True 有效、False 已失效（取消/过期/不存在），None 无法判断（网络错误、限流或该网盘不支持检测）
+        """
+        return None
+
+    # ---- 通用流程 ----
+
+    @staticmethod
+    def _make_file_entry(file_id: str, file_name: str, file_size: int, is_directory: bool, parent_id: Optional[str], parent_path: str = "") -> Dict:
+        """生成统一格式的文件条目，文件会解析出集号、分辨率等信息"""
+        entry = {
+            "file_id": file_id,
+            "file_name": file_name,
+            "clean_name": file_name,
+            "file_size": file_size or 0,
+            "file_path": f"{parent_path}/{file_name}",
+            "parent_id": parent_id,
+            "is_directory": is_directory,
+            "file_type": "other",
+            "season_number": None,
+            "episode_number": None,
+            "resolution": None,
+            "video_codec": None,
+            "audio_codec": None
+        }
+        if not is_directory:
+            file_info = file_name_cleaner.parse(file_name)
+            entry.update({
+                "clean_name": file_info["clean_name"],
+                "file_type": file_info["file_type"],
+                "season_number": file_info["season_number"],
+                "episode_number": file_info["episode_number"],
+                "resolution": file_info["resolution"],
+                "video_codec": file_info["video_codec"],
+                "audio_codec": file_info["audio_codec"]
+            })
+        return entry
+
+    async def parse_share(
+        self,
+        share_url: str,
+        password: str = None,
+        on_files: Optional[Callable[[List[Dict]], Awaitable[None]]] = None,
+        classify_only: bool = False
+    ) -> Optional[Dict]:
+        """
+        解析分享链接
+        返回: {
+            raw_title: 原始标题,
+            clean_title: 清洗后标题,
+            share_type: 分享类型,
+            share_code: 分享码,
+            sharer_info: {sharer_id, nickname, avatar_url},
+            files: [{file_id, file_name, clean_name, file_size, is_directory, file_type, ...}]
+        }
+
+        传入 on_files 时以流式方式处理文件列表：每爬取到一批文件就交给 on_files 处理，
+        不在内存中保留完整列表，返回结果中的 files 为空列表（file_count 仍为总数）。
+
+        classify_only=True 时只用于判断分享类型（例如批量重新判定旧分享的类型）：
+        只爬取根目录和第一层子目录，类型确定后立即停止爬取，返回的文件列表不完整（complete 为 False）。
+        """
+        # 提取分享码
+        share_code = self._extract_share_code(share_url)
+        if not share_code:
+            return None
+
+        try:
+            # 1. 获取分享信息
+            share_info = await self._get_share_info(share_code, password)
+            if not share_info:
+                return None
+
+            file_id = share_info.get("fileId", "")
+            is_folder = share_info.get("isFolder", False)
+
+            # 2. 处理标题（标题类型是分享类型判断的依据）
+            raw_title = share_info.get("fileName", "未知分享")
+            clean_result = title_cleaner.clean(raw_title)
+
+            # 3. 获取文件列表
+
+            files: List[Dict] = []
+            # 分享类型随爬取增量判断，只保留计数
+            classifier = ShareTypeClassifier(clean_result.share_type, is_folder)
+            file_count = 0
+
+            async def handle_batch(batch: List[Dict]):
+                nonlocal file_count
+                file_count += len(batch)
+                classifier.add(batch)
+                if on_files:
+                    await on_files(batch)
+                else:
+                    files.extend(batch)
+
+            crawl_state = {"truncated": False}
+            if is_folder and classify_only and classifier.decided:
+                # 仅凭标题即可确定类型（电影合集），无需列举
+                crawl_state["truncated"] = True
+            elif is_folder:
+                crawl = self._crawl_share_tree(
+                    share_info, file_id, password, crawl_state,
+                    max_depth=1 if classify_only else None
+                )
+                async with aclosing(crawl):
+                    async for batch in crawl:
+                        await handle_batch(batch)
+                        if classify_only and classifier.decided:
+                            break
+                if classify_only:
+                    # 只爬取了前两层（或提前停止），文件列表不完整
+                    crawl_state["truncated"] = True
+            else:
+                # 单文件分享
+                entry = self._make_file_entry(
+                    file_id, share_info.get("fileName", ""), share_info.get("fileSize", 0), False, None
+                )
+                entry["depth"] = 0
+                await handle_batch([entry])
+
+            # 4. 根据文件列表智能判断分享类型
+            # 注意：有些分享根目录只有子文件夹（例如按季/按集分文件夹），
+            # 此时根目录可能没有 video 文件，需结合第一层子目录内容判断，避免误判为 movie。
+            classifier.finish()
+            share_type = classifier.result()
+
+            # 5. 获取分享人信息
+            sharer_info = {
+                "sharer_id": share_info.get("shareUserId", ""),
+                "nickname": share_info.get("shareUserNickName", ""),
+                "avatar_url": share_info.get("shareUserHeadUrl", "")
+            }
+
+            return {
+                "raw_title": raw_title,
+                "clean_title": clean_result.clean_title,
+                "share_type": share_type,
+                "year": clean_result.year,
+                "season_number": clean_result.season_number,
+                "resolution": clean_result.resolution,
+                "share_code": share_code,
+                "share_id": share_info.get("shareId", ""),
+                "sharer_info": sharer_info,
+                "file_count": file_count,
+                # 文件列表是否完整（爬取超出预算或部分目录列举失败时为 False）
+                "complete": not crawl_state["truncated"],
+                "files": files
+            }
+        except Exception as e:
+            print(f"Parse share failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+
+    async def _crawl_share_tree(
+        self,
+        share_info: Dict,
+        root_file_id: str,
+        password: str = None,
+        crawl_state: Optional[Dict] = None,
+        max_depth: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        广度优先爬取整个分享目录树，按批次产出文件列表
+
+        - 同一层的兄弟目录并发列举，并发数受 share_crawl_concurrency 限制
+        - 每个目录按页列举，每页作为一批产出，避免整棵树驻留内存
+        - 受最大深度、最大条目数、总耗时三项预算约束，超出预算时停止爬取（max_depth 可进一步限制深度），
+          达到最大深度的目录只产出目录条目本身、不再列举
+        - 每个条目都带 file_path（分享内完整路径）、parent_id（所在目录ID）和 depth（根目录为 0）
+        - 结果不完整时在 crawl_state["truncated"] 中标记
+        """
+        if crawl_state is None:
+            crawl_state = {}
+        crawl_state["truncated"] = False
+        share_id = share_info.get("shareId", "")
+        semaphore = asyncio.Semaphore(settings.share_crawl_concurrency)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.share_crawl_timeout
+        if max_depth is None or max_depth > settings.share_crawl_max_depth:
+            max_depth = settings.share_crawl_max_depth
+        max_files = settings.share_crawl_max_files
+        folder_done = object()
+
+        async def list_folder(queue: asyncio.Queue, folder_id: str, folder_path: str):
+            try:
+                async with semaphore:
+                    async for page in self._iter_file_list(share_info, folder_id, password, folder_path):
+                        await queue.put(page)
+            except Exception as e:
+                await queue.put(e)
+            await queue.put(folder_done)
+
+        file_count = 0
+        level = [(root_file_id, "")]
+        depth = 0
+        while level:
+            # 有界队列：消费方处理不过来时，列举任务会暂停翻页
+            queue: asyncio.Queue = asyncio.Queue(maxsize=settings.share_crawl_concurrency * 2)
+            tasks = [asyncio.ensure_future(list_folder(queue, folder_id, folder_path)) for folder_id, folder_path in level]
+            running = len(tasks)
+            next_level = []
+            try:
+                while running:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        print(f"[{self.drive_type}] crawl timeout: shareId={share_id}, depth={depth}")
+                        crawl_state["truncated"] = True
+                        return
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        print(f"[{self.drive_type}] crawl timeout: shareId={share_id}, depth={depth}")
+                        crawl_state["truncated"] = True
+                        return
+
+                    if item is folder_done:
+                        running -= 1
+                        continue
+                    if isinstance(item, Exception):
+                        # 根目录列举失败视为解析失败，子目录失败只跳过该目录
+                        if depth == 0:
+                            raise item
+                        print(f"[{self.drive_type}] list folder failed at depth {depth}: {item}")
+                        crawl_state["truncated"] = True
+                        continue
+
+                    batch = item[:max_files - file_count]
+                    for f in batch:
+                        f["depth"] = depth
+                        if not f["is_directory"]:
+                            continue
+                        if depth < max_depth:
+                            next_level.append((f["file_id"], f["file_path"]))
+                        else:
+                            # 已达最大深度，该目录不再列举，文件列表不完整
+                            crawl_state["truncated"] = True
+                    file_count += len(batch)
+                    if batch:
+                        yield batch
+
+                    if file_count >= max_files:
+                        print(f"[{self.drive_type}] crawl reached max files ({max_files}): shareId={share_id}")
+                        crawl_state["truncated"] = True
+                        return
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            level = next_level
+            depth += 1
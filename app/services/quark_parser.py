@@ -0,0 +1,199 @@
+import re
+import json
+from typing import Optional, List, Dict, AsyncIterator
+from ..config import get_settings
+from .parser_base import BaseShareParser
+
+settings = get_settings()
+
+
+class QuarkShareParser(BaseShareParser):
+    """夸克网盘分享链接解析器（匿名访问分享，无需登录）"""
+
+    drive_type = "quark"
+
+    # 每页条目数
+    PAGE_SIZE = 100
+
+    # 所有接口共用的查询参数
+    COMMON_PARAMS = {"pr": "ucpro", "fr": "pc"}
+
+    # 表示分享本身已失效的错误码（不存在、已取消、已过期、已删除、被封禁），
+    # 提取码错误、限流等其他错误码不能说明分享失效
+    DEAD_SHARE_CODES = frozenset({41004, 41006, 41010, 41011, 41012})
+
+    def __init__(self):
+        super().__init__(
+            base_url=settings.quark_api_base,
+            timeout=settings.quark_timeout,
+            max_connections=settings.quark_max_connections,
+            max_keepalive_connections=settings.quark_max_keepalive_connections,
+            keepalive_expiry=settings.quark_keepalive_expiry,
+            http2=settings.quark_http2,
+            max_concurrency=settings.quark_max_concurrency,
+            rate_limit=settings.quark_rate_limit
+        )
+
+    def _headers(self) -> Dict:
+        return {
+            "Accept": "application/json, text/plain, */*",
+            "Referer": "https://pan.quark.cn/",
+            "Origin": "https://pan.quark.cn"
+        }
+
+    def _extract_share_code(self, share_url: str) -> Optional[str]:
+        """从分享链接提取分享ID（pwd_id）"""
+        # https://pan.quark.cn/s/xxxxx
+        match = re.search(r"pan\.quark\.cn/s/([a-zA-Z0-9]+)", share_url)
+        if match:
+            return match.group(1)
+        return None
+
+    def _parse_response(self, api_name: str, resp) -> Optional[Dict]:
+        """解析 JSON 响应，失败（非 200 或返回错误码）时返回 None"""
+        print(f"{api_name} response: {resp.text[:500]}")
+
+        try:
+            data = resp.json()
+        except json.JSONDecodeError as e:
+            print(f"JSON parse error in {api_name}: {e}")
+            return None
+
+        if resp.status_code != 200 or data.get("code"):
+            print(f"{api_name} failed: {resp.status_code} {data.get('code')} {data.get('message')}")
+            return None
+        return data
+
+    async def _request_detail_page(self, share_code: str, stoken: str, folder_id: str, page: int, size: int = None):
+        """请求分享目录的一页内容，返回原始响应"""
+        params = {
+            **self.COMMON_PARAMS,
+            "pwd_id": share_code,
+            "stoken": stoken,
+            "pdir_fid": folder_id,
+            "force": 0,
+            "_page": page,
+            "_size": size or self.PAGE_SIZE,
+            "_fetch_total": 1,
+            "_sort": "file_type:asc,file_name:asc"
+        }
+        return await self._request(
+            "GET", f"{self.base_url}/1/clouddrive/share/sharepage/detail",
+            params=params, headers=self._headers()
+        )
+
+    async def _get_detail_page(self, share_code: str, stoken: str, folder_id: str, page: int) -> Optional[Dict]:
+        """获取分享目录的一页内容"""
+        resp = await self._request_detail_page(share_code, stoken, folder_id, page)
+        return self._parse_response("sharepage/detail", resp)
+
+    async def _request_token(self, share_code: str, password: str = None):
+        """请求分享 stoken，返回原始响应"""
+        return await self._request(
+            "POST", f"{self.base_url}/1/clouddrive/share/sharepage/token",
+            params=self.COMMON_PARAMS,
+            json={"pwd_id": share_code, "passcode": password or ""},
+            headers=self._headers()
+        )
+
+    def _probe_result(self, api_name: str, share_code: str, resp) -> Optional[bool]:
+        """检测接口的响应 -> True 正常、False 分享已失效、None 无法判断"""
+        try:
+            data = resp.json()
+        except json.JSONDecodeError:
+            return None
+        if resp.status_code == 200 and not data.get("code"):
+            return True
+        if data.get("code") in self.DEAD_SHARE_CODES:
+            print(f"{api_name}: share {share_code} is dead ({data.get('code')} {data.get('message')})")
+            return False
+        return None
+
+    async def check_share(self, share_code: str, password: str = None) -> Optional[bool]:
+        """
+        请求 sharepage/token，再用 stoken 请求根目录第一页（只取 1 条）
+
+        分享被取消/过期/删除时这两个接口返回 DEAD_SHARE_CODES 中的错误码，不列举整个目录
+        """
+        token_resp = await self._request_token(share_code, password)
+        alive = self._probe_result("sharepage/token", share_code, token_resp)
+        if not alive:
+            return alive
+
+        stoken = ((token_resp.json().get("data") or {}).get("stoken"))
+        if not stoken:
+            return None
+        detail_resp = await self._request_detail_page(share_code, stoken, "0", 1, size=1)
+        return self._probe_result("sharepage/detail", share_code, detail_resp)
+
+    async def _get_share_info(self, share_code: str, password: str = None) -> Optional[Dict]:
+        """获取分享 stoken 和基本信息"""
+        resp = await self._request_token(share_code, password)
+        data = self._parse_response("sharepage/token", resp)
+        if not data or not (data.get("data") or {}).get("stoken"):
+            print("获取 stoken 失败，可能是分享已失效、需要提取码或提取码错误")
+            return None
+
+        token_data = data["data"]
+        stoken = token_data["stoken"]
+        author = token_data.get("author") or {}
+
+        # 分享根目录只有一个条目时，以该条目作为分享根（与天翼云盘保持一致）
+        root_page = await self._get_detail_page(share_code, stoken, "0", 1)
+        if root_page is None:
+            return None
+        root_items = (root_page.get("data") or {}).get("list") or []
+        root = root_items[0] if len(root_items) == 1 else None
+        if root and not root.get("dir"):
+            file_id, is_folder, file_size = root.get("fid", ""), False, root.get("size", 0)
+        elif root:
+            file_id, is_folder, file_size = root.get("fid", ""), True, 0
+        else:
+            file_id, is_folder, file_size = "0", True, 0
+
+        share_info = {
+            "fileName": token_data.get("title") or (root or {}).get("file_name", ""),
+            "fileId": file_id,
+            "fileSize": file_size,
+            "isFolder": is_folder,
+            "shareId": share_code,
+            "stoken": stoken,
+            # 夸克分享接口不返回稳定的分享人ID，不关联分享人
+            "shareUserId": "",
+            "shareUserNickName": author.get("nick_name", ""),
+            "shareUserHeadUrl": author.get("avatar_url", ""),
+        }
+        if root is None:
+            # 从根目录开始爬取时直接使用已获取的第一页，不再重复请求
+            share_info["rootPage"] = root_page
+        return share_info
+
+    async def _iter_file_list(self, share_info: Dict, folder_id: str, password: str = None, parent_path: str = "") -> AsyncIterator[List[Dict]]:
+        """逐页列举分享目录（按 _page 翻页），请求失败时抛出异常"""
+        page = 1
+        fetched = 0
+        while True:
+            if folder_id == "0" and page == 1 and share_info.get("rootPage") is not None:
+                data = share_info.pop("rootPage")
+            else:
+                data = await self._get_detail_page(share_info["shareId"], share_info["stoken"], folder_id, page)
+            if data is None:
+                raise RuntimeError(f"sharepage/detail failed: pdir_fid={folder_id}")
+
+            items = (data.get("data") or {}).get("list") or []
+            files = [
+                self._make_file_entry(
+                    item.get("fid", ""), item.get("file_name", ""), item.get("size", 0),
+                    bool(item.get("dir")), folder_id, parent_path
+                )
+                for item in items
+            ]
+            if files:
+                yield files
+
+            # 返回条目不足一页，或已达到目录总数时结束翻页
+            fetched += len(items)
+            total = (data.get("metadata") or {}).get("_total")
+            if len(items) < self.PAGE_SIZE or (total is not None and fetched >= total):
+                return
+            page += 1
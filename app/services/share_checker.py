@@ -0,0 +1,214 @@
+"""分享有效性检测 - 定时挑选最久未检测的分享，只请求分享信息接口判断是否失效"""
+import asyncio
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import update
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.models import ShareLink
+from .share_parser import get_parser
+
+settings = get_settings()
+
+
+def next_check_interval(created_at: Optional[datetime], view_count: int, save_count: int, now: datetime) -> timedelta:
+    """
+    根据分享的热度计算下次检测间隔
+
+    热度 = 日均(浏览数 + 3 × 转存数)，以分享存在天数折算：
+    新分享和热门分享检测频繁（最短 share_check_min_interval_hours），
+    长期无人访问的分享很少检测（最长 share_check_max_interval_hours）。
+    加 ±10% 随机抖动，避免同一批分享总在同一时间到期。
+    """
+    age_days = max((now - created_at).total_seconds() / 86400, 1.0) if created_at else 1.0
+    popularity = (view_count or 0) + 3 * (save_count or 0)
+    hotness = popularity / age_days
+
+    min_hours = settings.share_check_min_interval_hours
+    max_hours = settings.share_check_max_interval_hours
+    # 分享最初一周无论热度都至少每天检测一次
+    if age_days <= 7:
+        max_hours = min(max_hours, 24.0)
+
+    hours = max_hours / (1 + math.log1p(hotness) * 8)
+    hours = min(max(hours, min_hours), max_hours)
+    return timedelta(hours=hours * random.uniform(0.9, 1.1))
+
+
+class ShareChecker:
+    """分享有效性检测任务（后台定时执行，也可由管理员手动触发）"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def _check_one(self, share: Dict) -> Optional[bool]:
+        """检测单个分享：True 有效、False 已失效、None 无法判断"""
+        parser = get_parser(share["drive_type"])
+        if parser is None:
+            return None
+
+        share_code = share["share_code"] or parser._extract_share_code(share["share_url"] or "")
+        if not share_code:
+            return None
+
+        try:
+            return await parser.check_share(share_code, share["password"])
+        except Exception as e:
+            print(f"Check share {share['id']} error: {e}")
+            return None
+
+    def _claim_due_shares(self, now: datetime, limit: int) -> List[Dict]:
+        """
+        挑选到期的分享并认领：把 next_check_at 条件更新为租约到期时间
+
+        多个 worker 进程各自运行检测任务，只有条件 UPDATE 仍命中（未被其他进程抢先认领）
+        的行才由本进程检测；进程中途退出时，租约到期后这些分享会被重新挑选
+        """
+        lease_until = now + timedelta(seconds=settings.share_check_time_budget * 2)
+
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                ShareLink.id, ShareLink.drive_type, ShareLink.share_code, ShareLink.share_url,
+                ShareLink.password, ShareLink.created_at, ShareLink.view_count, ShareLink.save_count,
+                ShareLink.next_check_at
+            ).filter(
+                ShareLink.status == "active",
+                (ShareLink.next_check_at == None) | (ShareLink.next_check_at <= now)
+            ).order_by(
+                ShareLink.next_check_at.is_(None).desc(),
+                ShareLink.next_check_at,
+                ShareLink.last_check_at
+            ).limit(limit).all()
+
+            claimed = []
+            for row in rows:
+                due = (ShareLink.next_check_at == None) if row.next_check_at is None \
+                    else (ShareLink.next_check_at == row.next_check_at)
+                result = db.execute(
+                    update(ShareLink)
+                    .where(ShareLink.id == row.id, ShareLink.status == "active", due)
+                    .values(next_check_at=lease_until)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    claimed.append(dict(row._mapping))
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+    async def run_once(self, limit: Optional[int] = None) -> Dict:
+        """
+        执行一轮检测
+
+        - 挑选 active 状态中下次检测时间最早（或从未检测）的分享，认领后只检测本进程认领的分享
+        - 并发检测，受并发数和本轮耗时预算限制，超时未完成的分享恢复原检测时间，留到下一轮
+        - 失效的分享标记为 expired；所有已得出结果的分享更新 last_check_at 和 next_check_at
+        """
+        async with self._lock:
+            now = datetime.utcnow()
+            limit = limit or settings.share_check_batch_size
+
+            shares = self._claim_due_shares(now, limit)
+            stats = {"total": len(shares), "alive": 0, "expired": 0, "unknown": 0, "skipped": 0}
+            if not shares:
+                return stats
+
+            semaphore = asyncio.Semaphore(settings.share_check_concurrency)
+
+            async def check_with_semaphore(share: Dict):
+                async with semaphore:
+                    return share, await self._check_one(share)
+
+            tasks = [asyncio.ensure_future(check_with_semaphore(share)) for share in shares]
+            done, pending = await asyncio.wait(tasks, timeout=settings.share_check_time_budget)
+            for task in pending:
+                task.cancel()
+            stats["skipped"] = len(pending)
+
+            checked_at = datetime.utcnow()
+            # 未完成的分享释放认领，恢复原来的下次检测时间
+            done_ids = {task.result()[0]["id"] for task in done}
+            values: List[Dict] = [
+                {"id": share["id"], "next_check_at": share["next_check_at"]}
+                for share in shares if share["id"] not in done_ids
+            ]
+            for task in done:
+                share, alive = task.result()
+                if alive is None:
+                    stats["unknown"] += 1
+                    values.append({
+                        "id": share["id"],
+                        "next_check_at": checked_at + timedelta(hours=settings.share_check_retry_hours)
+                    })
+                elif alive:
+                    stats["alive"] += 1
+                    values.append({
+                        "id": share["id"],
+                        "last_check_at": checked_at,
+                        "next_check_at": checked_at + next_check_interval(
+                            share["created_at"], share["view_count"], share["save_count"], checked_at
+                        )
+                    })
+                else:
+                    stats["expired"] += 1
+                    values.append({
+                        "id": share["id"],
+                        "status": "expired",
+                        "reject_reason": "分享链接已失效（取消、过期或不存在）",
+                        "last_check_at": checked_at,
+                        "next_check_at": None
+                    })
+
+            # 按更新的字段分组批量写入（executemany 要求同一批参数字段一致）
+            db = SessionLocal()
+            try:
+                groups: Dict[tuple, List[Dict]] = {}
+                for item in values:
+                    groups.setdefault(tuple(sorted(item)), []).append(item)
+                for group in groups.values():
+                    db.execute(update(ShareLink), group)
+                db.commit()
+            finally:
+                db.close()
+
+            print(
+                f"[ShareChecker] checked {stats['total'] - stats['skipped']}/{stats['total']}: "
+                f"alive={stats['alive']}, expired={stats['expired']}, unknown={stats['unknown']}"
+            )
+            return stats
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[ShareChecker] run failed: {e}")
+                import traceback
+                traceback.print_exc()
+            await asyncio.sleep(settings.share_check_loop_interval)
+
+    def start(self):
+        """应用启动时开始后台定时检测"""
+        if settings.share_check_enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """应用关闭时停止后台检测"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+share_checker = ShareChecker()
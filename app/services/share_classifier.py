@@ -0,0 +1,115 @@
+"""分享类型判断 - 随目录爬取增量统计，结果确定后可提前停止爬取"""
+from typing import Dict, List
+
+
+def detect_share_type(video_count: int, episode_count: int, folder_count: int, title_type: str) -> str:
+    """
+    根据文件统计判断分享类型
+
+    规则:
+    1. 如果标题已识别为 movie_collection，保持不变
+    2. 如果有多个视频文件且包含集号信息，判定为 tv
+    3. 如果只有1个视频文件，判定为 movie
+    4. 其他情况使用标题判断的结果
+    """
+    # 如果标题已识别为合集，保持不变
+    if title_type == "movie_collection":
+        return "movie_collection"
+
+    # 如果有多个视频文件且有集号信息，判定为 tv
+    if video_count > 1 and episode_count > 0:
+        return "tv"
+
+    # 如果只有1个视频文件，判定为 movie
+    if video_count == 1:
+        return "movie"
+
+    # 多视频但没有集号：
+    # - 如果来源于子文件夹（folder_count > 0），更可能是剧集（按季/按集分目录）
+    # - 如果全在根目录且数量很多，才更像电影合集
+    if video_count > 1 and episode_count == 0 and folder_count > 0:
+        return "tv"
+
+    # 如果有多个视频文件但没有集号，可能是电影合集或多版本
+    if video_count > 3 and episode_count == 0:
+        return "movie_collection"
+
+    # 如果没有视频文件，但有多个文件夹：更可能是剧集/番剧（按季/按集分文件夹）
+    if video_count == 0 and folder_count >= 2:
+        # 标题如果明确是 movie_collection 则前面已返回
+        # 这里优先判 tv，避免默认 movie
+        return "tv"
+
+    # 其他情况使用标题判断的结果
+    return title_type
+
+
+class ShareTypeClassifier:
+    """
+    增量分享类型判断
+
+    按批次接收爬取到的文件（每个条目带 depth，根目录为 0），只维护计数：
+    - 根目录有视频文件（或根目录没有子文件夹）时只看根目录
+    - 根目录只有子文件夹时（例如按季/按集分文件夹），结合第一层子目录内容判断，避免误判为 movie
+
+    目录树按层广度优先爬取，收到更深一层的条目即说明上一层已列举完毕，
+    据此判断结果是否已经确定（decided），确定后不必再继续爬取。
+    """
+
+    def __init__(self, title_type: str, is_folder: bool = True):
+        self.title_type = title_type
+        self.is_folder = is_folder
+        # depth -> [视频数, 有集号的视频数, 文件夹数]，只统计根目录和第一层
+        self._counts = {0: [0, 0, 0], 1: [0, 0, 0]}
+        self._max_depth = 0
+        self._finished = False
+
+    def add(self, batch: List[Dict]):
+        """统计一批文件"""
+        for f in batch:
+            depth = f.get("depth", 0)
+            if depth > self._max_depth:
+                self._max_depth = depth
+            counts = self._counts.get(depth)
+            if counts is None:
+                continue
+            if f.get("is_directory"):
+                counts[2] += 1
+            elif f.get("file_type") == "video":
+                counts[0] += 1
+                if f.get("episode_number") is not None:
+                    counts[1] += 1
+
+    def finish(self):
+        """爬取结束（所有已爬取的层都完整）"""
+        self._finished = True
+
+    def _level_done(self, depth: int) -> bool:
+        return self._finished or self._max_depth > depth
+
+    def _use_first_level(self) -> bool:
+        root_videos, _, root_folders = self._counts[0]
+        return self.is_folder and not root_videos and root_folders > 0
+
+    @property
+    def decided(self) -> bool:
+        """分享类型是否已经确定（继续爬取也不会改变结果）"""
+        if self.title_type == "movie_collection":
+            return True
+        if not self._level_done(0):
+            return False
+        if not self._use_first_level():
+            return True
+        # 根目录只有子文件夹：出现 2 个以上视频后，无论有无集号都判定为 tv
+        if self._counts[1][0] >= 2:
+            return True
+        return self._level_done(1)
+
+    def result(self) -> str:
+        """按当前统计给出分享类型"""
+        video_count, episode_count, folder_count = self._counts[0]
+        if self._use_first_level():
+            video_count += self._counts[1][0]
+            episode_count += self._counts[1][1]
+            folder_count += self._counts[1][2]
+        return detect_share_type(video_count, episode_count, folder_count, self.title_type)
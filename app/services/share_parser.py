@@ -1,10 +1,14 @@
-import httpx
 import re
 import json
-from typing import Optional, List, Dict
-from ..models.models import ShareLink, ShareFile, Sharer
-from sqlalchemy.orm import Session
-from .title_cleaner import title_cleaner, file_name_cleaner
+from typing import Optional, List, Dict, AsyncIterator
+from ..config import get_settings
+from ..core.cache import TTLCache, MISSING
+from ..core.config_cache import config_cache
+from .parser_base import BaseShareParser
+from .aliyun_parser import AliyunShareParser
+from .quark_parser import QuarkShareParser
+
+settings = get_settings()
 
 
 def clean_share_url(raw_url: str) -> str:
@@ -21,10 +25,14 @@ def clean_share_url(raw_url: str) -> str:
     # 尝试提取 URL - 只匹配到分享码结束
     # 格式1: https://cloud.189.cn/t/xxxxx
     # 格式2: https://cloud.189.cn/web/share?code=xxxxx
+    # 阿里云盘: https://www.aliyundrive.com/s/xxxxx 或 https://www.alipan.com/s/xxxxx
+    # 夸克网盘: https://pan.quark.cn/s/xxxxx
     url_patterns = [
         r'https?://cloud\.189\.cn/t/([a-zA-Z0-9]+)',
         r'https?://cloud\.189\.cn/web/share\?code=([a-zA-Z0-9]+)',
         r'https?://h5\.cloud\.189\.cn/share\.html#/t/([a-zA-Z0-9]+)',
+        r'https?://(?:www\.)?(?:aliyundrive|alipan)\.com/s/([a-zA-Z0-9]+)(?:/folder/[a-zA-Z0-9]+)?',
+        r'https?://pan\.quark\.cn/s/([a-zA-Z0-9]+)',
     ]
 
     for pattern in url_patterns:
@@ -63,169 +71,58 @@ def extract_password_from_text(raw_text: str) -> str:
     return ""
 
 
-class TianYiShareParser:
+class TianYiShareParser(BaseShareParser):
     """天翼云盘分享链接解析器"""
 
-    BASE_URL = "https://cloud.189.cn"
-
-    async def parse_share(self, share_url: str, password: str = None) -> Optional[Dict]:
-        """
-        解析天翼云盘分享链接
-        返回: {
-            raw_title: 原始标题,
-            clean_title: 清洗后标题,
-            share_type: 分享类型,
-            share_code: 分享码,
-            sharer_info: {sharer_id, nickname, avatar_url},
-            files: [{file_id, file_name, clean_name, file_size, is_directory, file_type, ...}]
-        }
-        """
-        # 清理URL
-        clean_url = clean_share_url(share_url)
-
-        # 提取分享码
-        share_code = self._extract_share_code(clean_url)
-        if not share_code:
-            return None
-
-        try:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=30.0) as client:
-                # 1. 获取分享信息 (使用 V2 API)
-                share_info = await self._get_share_info_v2(client, share_code, password)
-                if not share_info:
-                    return None
-
-                # 2. 获取文件列表
-                share_id = share_info.get("shareId", "")
-                file_id = share_info.get("fileId", "-11")
-                is_folder = share_info.get("isFolder", False)
-                share_mode = share_info.get("shareMode", 0)
-
-                files = []
-                if is_folder:
-                    files = await self._get_file_list_v2(client, share_id, file_id, share_mode, password)
-                else:
-                    # 单文件分享
-                    file_name = share_info.get("fileName", "")
-                    file_info = file_name_cleaner.parse(file_name)
-                    files = [{
-                        "file_id": file_id,
-                        "file_name": file_name,
-                        "clean_name": file_info["clean_name"],
-                        "file_size": share_info.get("fileSize", 0),
-                        "is_directory": False,
-                        "file_type": file_info["file_type"],
-                        "season_number": file_info["season_number"],
-                        "episode_number": file_info["episode_number"],
-                        "resolution": file_info["resolution"],
-                        "video_codec": file_info["video_codec"],
-                        "audio_codec": file_info["audio_codec"]
-                    }]
-
-                # 3. 处理标题
-                raw_title = share_info.get("fileName", "未知分享")
-                clean_result = title_cleaner.clean(raw_title)
-
-                # 4. 根据文件列表智能判断分享类型
-                # 注意：有些分享根目录只有子文件夹（例如按季/按集分文件夹），
-                # 此时根目录可能没有 video 文件，需做浅层探测避免误判为 movie。
-                files_for_type = files
-                if is_folder:
-                    root_video_files = [f for f in files if f.get("file_type") == "video"]
-                    root_folders = [f for f in files if f.get("is_directory")]
-
-                    if not root_video_files and root_folders:
-                        sampled_files: List[Dict] = []
-                        # 只做浅层扫描，避免请求过多
-                        for folder in root_folders[:10]:
-                            folder_id = folder.get("file_id")
-                            if not folder_id:
-                                continue
-                            sampled_files.extend(
-                                await self._get_file_list_v2(client, share_id, folder_id, share_mode, password)
-                            )
-                            # 发现足够多的视频后提前结束
-                            if len([f for f in sampled_files if f.get("file_type") == "video"]) >= 4:
-                                break
-
-                        files_for_type = files + sampled_files
-
-                share_type = self._detect_share_type_by_files(files_for_type, clean_result.share_type)
-
-                # 5. 获取分享人信息
-                sharer_info = {
-                    "sharer_id": share_info.get("shareUserId", ""),
-                    "nickname": share_info.get("shareUserNickName", ""),
-                    "avatar_url": share_info.get("shareUserHeadUrl", "")
-                }
-
-                return {
-                    "raw_title": raw_title,
-                    "clean_title": clean_result.clean_title,
-                    "share_type": share_type,
-                    "year": clean_result.year,
-                    "season_number": clean_result.season_number,
-                    "resolution": clean_result.resolution,
-                    "share_code": share_code,
-                    "share_id": share_id,
-                    "sharer_info": sharer_info,
-                    "file_count": len(files),
-                    "files": files
-                }
-        except Exception as e:
-            print(f"Parse share failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-
-    def _detect_share_type_by_files(self, files: list, title_type: str) -> str:
-        """
-        根据文件列表智能判断分享类型
-
-        规则:
-        1. 如果标题已识别为 movie_collection，保持不变
-        2. 如果有多个视频文件且包含集号信息，判定为 tv
-        3. 如果只有1个视频文件，判定为 movie
-        4. 其他情况使用标题判断的结果
-        """
-        # 如果标题已识别为合集，保持不变
-        if title_type == "movie_collection":
-            return "movie_collection"
-
-        # 统计视频文件和有集号的文件
-        video_files = [f for f in files if f.get("file_type") == "video"]
-        files_with_episode = [f for f in video_files if f.get("episode_number") is not None]
-
-        # 根目录(或浅层采样)只有子文件夹时，仍然可能是 TV
-        # 只要存在多个文件夹且没有明显的“多电影合集”信号，就更倾向 tv
-        folder_count = len([f for f in files if f.get("is_directory")])
-
-        # 如果有多个视频文件且有集号信息，判定为 tv
-        if len(video_files) > 1 and len(files_with_episode) > 0:
-            return "tv"
-
-        # 如果只有1个视频文件，判定为 movie
-        if len(video_files) == 1:
-            return "movie"
-
-        # 多视频但没有集号：
-        # - 如果来源于子文件夹（folder_count > 0），更可能是剧集（按季/按集分目录）
-        # - 如果全在根目录且数量很多，才更像电影合集
-        if len(video_files) > 1 and len(files_with_episode) == 0 and folder_count > 0:
-            return "tv"
-
-        # 如果有多个视频文件但没有集号，可能是电影合集或多版本
-        if len(video_files) > 3 and len(files_with_episode) == 0:
-            return "movie_collection"
-
-        # 如果没有视频文件，但有多个文件夹：更可能是剧集/番剧（按季/按集分文件夹）
-        if len(video_files) == 0 and folder_count >= 2:
-            # 标题如果明确是 movie_collection 则前面已返回
-            # 这里优先判 tv，避免默认 movie
-            return "tv"
-
-        # 其他情况使用标题判断的结果
-        return title_type
+    drive_type = "tianyi"
+
+    # 描述分享本身状态的错误码前缀（如 ShareNotFound、ShareExpiredError、FileNotFound），不代表服务端限流
+    SHARE_STATE_CODE_PREFIXES = ("Share", "File")
+    # 表示请求过于频繁的错误码（HTTP 200 + res_code），收到时降低请求速率；其他错误码不降速
+    RATE_LIMIT_CODES = frozenset({"ServiceBusy", "TooManyRequests", "RequestTooFrequently", "ErrorAccessTooFrequently"})
+
+    def __init__(self):
+        super().__init__(
+            base_url=settings.tianyi_api_base,
+            timeout=settings.tianyi_timeout,
+            max_connections=settings.tianyi_max_connections,
+            max_keepalive_connections=settings.tianyi_max_keepalive_connections,
+            keepalive_expiry=settings.tianyi_keepalive_expiry,
+            http2=settings.tianyi_http2,
+            max_concurrency=settings.tianyi_max_concurrency,
+            rate_limit=settings.tianyi_rate_limit
+        )
+        # 分享信息 / 访问码验证结果缓存，避免重复提交和重新解析时反复请求
+        self._share_info_cache = TTLCache(
+            maxsize=settings.tianyi_cache_maxsize,
+            ttl=settings.tianyi_share_info_cache_ttl
+        )
+        self._access_code_cache = TTLCache(
+            maxsize=settings.tianyi_cache_maxsize,
+            ttl=settings.tianyi_share_info_cache_ttl
+        )
+
+    def _is_share_state_code(self, res_code) -> bool:
+        """错误码是否描述分享本身的状态（分享失效、访问码错误等）"""
+        return str(res_code).startswith(self.SHARE_STATE_CODE_PREFIXES) or "AccessCode" in str(res_code)
+
+    def _check_res_code(self, api_name: str, data: Dict) -> bool:
+        """检查已解析响应体中的 res_code，返回是否成功；限流类错误码降低请求速率"""
+        res_code = data.get("res_code")
+        if not res_code:
+            return True
+        if str(res_code) in self.RATE_LIMIT_CODES:
+            self._penalize_for_code(api_name, res_code)
+        return False
+
+    async def check_share(self, share_code: str, password: str = None) -> Optional[bool]:
+        """只请求 getShareInfoByCodeV2（跳过缓存读取），分享失效时该接口返回 Share*/File* 错误码"""
+        if await self._fetch_share_info(share_code, use_cache=False):
+            return True
+        # _fetch_share_info 只对分享状态类错误码写入否定缓存
+        if self._share_info_cache.get(share_code) is None:
+            return False
+        return None
 
     def _extract_share_code(self, share_url: str) -> Optional[str]:
         """从分享链接提取分享码"""
@@ -241,17 +138,75 @@ class TianYiShareParser:
                 return match.group(1)
         return None
     
-    async def _get_share_info_v2(self, client: httpx.AsyncClient, share_code: str, password: str = None) -> Optional[Dict]:
+    async def _get_share_info(self, share_code: str, password: str = None) -> Optional[Dict]:
+        return await self._get_share_info_v2(share_code, password)
+
+    def _iter_file_list(self, share_info: Dict, folder_id: str, password: str = None, parent_path: str = "") -> AsyncIterator[List[Dict]]:
+        return self._iter_file_list_v2(
+            share_info.get("shareId", ""), folder_id, share_info.get("shareMode", 0), password, parent_path
+        )
+
+    async def _get_share_info_v2(self, share_code: str, password: str = None) -> Optional[Dict]:
         """获取分享基本信息 - 使用 V2 API (返回 JSON)"""
-        url = f"{self.BASE_URL}/api/open/share/getShareInfoByCodeV2.action"
+        data = await self._fetch_share_info(share_code)
+        if not data:
+            return None
+
+        # 获取分享人信息 (在 creator 对象中)
+        creator = data.get("creator", {})
+        share_mode = data.get("shareMode", 0)
+        share_id = str(data.get("shareId", ""))
+
+        # 如果是加密分享 (shareMode == 1)，需要验证访问码
+        if share_mode == 1:
+            if not password:
+                print("加密分享需要访问码")
+                return None
+            # 验证访问码并获取正确的 shareId
+            check_result = await self._check_access_code(share_code, password)
+            if not check_result:
+                print("访问码验证失败")
+                return None
+            share_id = check_result.get("shareId", share_id)
+            print(f"加密分享验证成功，shareId: {share_id}")
+
+        return {
+            "fileName": data.get("fileName", ""),
+            "fileId": str(data.get("fileId", "")),
+            "fileSize": data.get("fileSize", 0),
+            "isFolder": data.get("isFolder") == 1,
+            "shareId": share_id,
+            "shareMode": share_mode,
+            # 分享人信息 (从 creator 对象提取)
+            "shareUserId": str(creator.get("ownerAccount", "")),
+            "shareUserNickName": creator.get("nickName", ""),
+            "shareUserHeadUrl": creator.get("iconURL", ""),
+        }
+
+    async def _fetch_share_info(self, share_code: str, use_cache: bool = True) -> Optional[Dict]:
+        """
+        请求 getShareInfoByCodeV2 原始数据（按 share_code 缓存）
+
+        分享失效/不存在等明确的错误结果也会缓存（时间较短），
+        网络错误、非 200 响应、限流等临时失败不缓存；
+        use_cache=False 时跳过缓存读取直接请求（结果仍会写入缓存）
+        """
+        if use_cache:
+            cached = self._share_info_cache.get(share_code)
+            if cached is not MISSING:
+                return cached
+        else:
+            self._share_info_cache.pop(share_code)
+
+        url = f"{self.base_url}/api/open/share/getShareInfoByCodeV2.action"
         params = {"shareCode": share_code}
 
         headers = {
             "Accept": "application/json;charset=UTF-8",
-            "Referer": f"{self.BASE_URL}/"
+            "Referer": f"{self.base_url}/"
         }
 
-        resp = await client.get(url, params=params, headers=headers)
+        resp = await self._request("GET", url, params=params, headers=headers)
         print(f"getShareInfoByCodeV2 response: {resp.text[:500]}")
 
         if resp.status_code != 200:
@@ -260,48 +215,28 @@ class TianYiShareParser:
 
         try:
             data = resp.json()
-            if data.get("res_code") and data.get("res_code") != 0:
-                print(f"getShareInfoByCodeV2 error: {data.get('res_message')}")
-                return None
-
-            # 获取分享人信息 (在 creator 对象中)
-            creator = data.get("creator", {})
-            share_mode = data.get("shareMode", 0)
-            share_id = str(data.get("shareId", ""))
-
-            # 如果是加密分享 (shareMode == 1)，需要验证访问码
-            if share_mode == 1:
-                if not password:
-                    print("加密分享需要访问码")
-                    return None
-                # 验证访问码并获取正确的 shareId
-                check_result = await self._check_access_code(client, share_code, password)
-                if not check_result:
-                    print("访问码验证失败")
-                    return None
-                share_id = check_result.get("shareId", share_id)
-                print(f"加密分享验证成功，shareId: {share_id}")
-
-            return {
-                "fileName": data.get("fileName", ""),
-                "fileId": str(data.get("fileId", "")),
-                "fileSize": data.get("fileSize", 0),
-                "isFolder": data.get("isFolder") == 1,
-                "shareId": share_id,
-                "shareMode": share_mode,
-                # 分享人信息 (从 creator 对象提取)
-                "shareUserId": str(creator.get("ownerAccount", "")),
-                "shareUserNickName": creator.get("nickName", ""),
-                "shareUserHeadUrl": creator.get("iconURL", ""),
-            }
         except json.JSONDecodeError as e:
             print(f"JSON parse error: {e}")
             return None
 
-    async def _check_access_code(self, client: httpx.AsyncClient, share_code: str, access_code: str) -> Optional[Dict]:
-        """验证分享链接访问码"""
+        if not self._check_res_code("getShareInfoByCodeV2", data):
+            print(f"getShareInfoByCodeV2 error: {data.get('res_message')}")
+            if self._is_share_state_code(data.get("res_code")):
+                self._share_info_cache.set(share_code, None, ttl=settings.tianyi_negative_cache_ttl)
+            return None
+
+        self._share_info_cache.set(share_code, data)
+        return data
+
+    async def _check_access_code(self, share_code: str, access_code: str) -> Optional[Dict]:
+        """验证分享链接访问码（按 share_code + 访问码缓存，访问码错误的结果缓存较短时间）"""
+        cache_key = (share_code, access_code)
+        cached = self._access_code_cache.get(cache_key)
+        if cached is not MISSING:
+            return cached
+
         import uuid
-        url = f"{self.BASE_URL}/api/open/share/checkAccessCode.action"
+        url = f"{self.base_url}/api/open/share/checkAccessCode.action"
         params = {
             "shareCode": share_code,
             "accessCode": access_code,
@@ -310,10 +245,10 @@ class TianYiShareParser:
 
         headers = {
             "Accept": "application/json;charset=UTF-8",
-            "Referer": f"{self.BASE_URL}/"
+            "Referer": f"{self.base_url}/"
         }
 
-        resp = await client.get(url, params=params, headers=headers)
+        resp = await self._request("GET", url, params=params, headers=headers)
         print(f"checkAccessCode response: {resp.text[:500]}")
 
         if resp.status_code != 200:
@@ -322,88 +257,166 @@ class TianYiShareParser:
 
         try:
             data = resp.json()
-            if data.get("res_code") and data.get("res_code") != 0:
+            if not self._check_res_code("checkAccessCode", data):
                 print(f"checkAccessCode error: {data.get('res_message')}")
+                # 限流不代表访问码错误，不缓存
+                if str(data.get("res_code")) not in self.RATE_LIMIT_CODES:
+                    self._access_code_cache.set(cache_key, None, ttl=settings.tianyi_negative_cache_ttl)
                 return None
 
-            return {
+            result = {
                 "shareId": str(data.get("shareId", ""))
             }
+            self._access_code_cache.set(cache_key, result)
+            return result
         except json.JSONDecodeError as e:
             print(f"JSON parse error in checkAccessCode: {e}")
             return None
     
-    async def _get_file_list_v2(self, client: httpx.AsyncClient, share_id: str, file_id: str, share_mode: int = 0, password: str = None) -> List[Dict]:
-        """获取分享文件列表 - 使用新 API"""
-        url = f"{self.BASE_URL}/api/open/share/listShareDir.action"
-        params = {
-            "shareId": share_id,
-            "fileId": file_id,
-            "isFolder": "true",
-            "orderBy": "lastOpTime",
-            "descending": "true",
-            "shareMode": share_mode,
-            "pageNum": 1,
-            "pageSize": 1000
-        }
-        if password:
-            params["accessCode"] = password
+    async def _get_file_list_v2(self, share_id: str, file_id: str, share_mode: int = 0, password: str = None, parent_path: str = "") -> List[Dict]:
+        """获取分享目录下的完整文件列表（自动翻页）"""
+        files = []
+        async for page in self._iter_file_list_v2(share_id, file_id, share_mode, password, parent_path):
+            files.extend(page)
+        return files
 
+    async def _iter_file_list_v2(self, share_id: str, file_id: str, share_mode: int = 0, password: str = None, parent_path: str = "") -> AsyncIterator[List[Dict]]:
+        """
+        逐页获取分享文件列表 - 使用新 API（parent_path 为该目录在分享内的路径）
+
+        每页产出一批文件，直到取完该目录下的所有条目；
+        请求失败时抛出异常，避免把不完整的列表当作完整结果
+        """
+        url = f"{self.base_url}/api/open/share/listShareDir.action"
+        page_size = settings.tianyi_list_page_size
         headers = {
             "Accept": "application/json;charset=UTF-8",
-            "Referer": f"{self.BASE_URL}/"
+            "Referer": f"{self.base_url}/"
         }
 
-        resp = await client.get(url, params=params, headers=headers)
-        print(f"listShareDir response: {resp.text[:500]}")
+        page_num = 1
+        fetched = 0
+        while True:
+            params = {
+                "shareId": share_id,
+                "fileId": file_id,
+                "isFolder": "true",
+                "orderBy": "lastOpTime",
+                "descending": "true",
+                "shareMode": share_mode,
+                "pageNum": page_num,
+                "pageSize": page_size
+            }
+            if password:
+                params["accessCode"] = password
 
-        if resp.status_code != 200:
-            print(f"listShareDir failed: {resp.status_code}")
-            return []
+            resp = await self._request("GET", url, params=params, headers=headers)
+            print(f"listShareDir response: {resp.text[:500]}")
+
+            if resp.status_code != 200:
+                print(f"listShareDir failed: {resp.status_code}")
+                raise RuntimeError(f"listShareDir failed: HTTP {resp.status_code}")
+
+            try:
+                data = resp.json()
+            except json.JSONDecodeError as e:
+                print(f"JSON parse error in listShareDir: {e}")
+                raise RuntimeError(f"listShareDir returned invalid JSON: {e}")
+            if not self._check_res_code("listShareDir", data):
+                # 出错的页不能当作空目录，否则列表会被误认为完整
+                raise RuntimeError(f"listShareDir error: {data.get('res_code')} {data.get('res_message')}")
 
-        files = []
-        try:
-            data = resp.json()
             file_list_ao = data.get("fileListAO", {})
+            folder_list = file_list_ao.get("folderList", [])
+            file_list = file_list_ao.get("fileList", [])
+            files = []
 
             # 解析文件夹
-            for item in file_list_ao.get("folderList", []):
-                files.append({
-                    "file_id": str(item.get("id", "")),
-                    "file_name": item.get("name", ""),
-                    "clean_name": item.get("name", ""),
-                    "file_size": 0,
-                    "is_directory": True,
-                    "file_type": "other",
-                    "season_number": None,
-                    "episode_number": None,
-                    "resolution": None,
-                    "video_codec": None,
-                    "audio_codec": None
-                })
+            for item in folder_list:
+                files.append(self._make_file_entry(
+                    str(item.get("id", "")), item.get("name", ""), 0, True, file_id, parent_path
+                ))
 
             # 解析文件
-            for item in file_list_ao.get("fileList", []):
-                file_name = item.get("name", "")
-                file_info = file_name_cleaner.parse(file_name)
-                files.append({
-                    "file_id": str(item.get("id", "")),
-                    "file_name": file_name,
-                    "clean_name": file_info["clean_name"],
-                    "file_size": item.get("size", 0),
-                    "is_directory": False,
-                    "file_type": file_info["file_type"],
-                    "season_number": file_info["season_number"],
-                    "episode_number": file_info["episode_number"],
-                    "resolution": file_info["resolution"],
-                    "video_codec": file_info["video_codec"],
-                    "audio_codec": file_info["audio_codec"]
-                })
+            for item in file_list:
+                files.append(self._make_file_entry(
+                    str(item.get("id", "")), item.get("name", ""), item.get("size", 0), False, file_id, parent_path
+                ))
 
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error in listShareDir: {e}")
+            if files:
+                yield files
 
-        return files
+            # 返回条目不足一页，或已达到目录总数时结束翻页
+            page_items = len(folder_list) + len(file_list)
+            fetched += page_items
+            total = file_list_ao.get("count")
+            if page_items < page_size or (total is not None and fetched >= total):
+                return
+            page_num += 1
 
 
 tianyi_parser = TianYiShareParser()
+aliyun_parser = AliyunShareParser()
+quark_parser = QuarkShareParser()
+
+# 网盘类型 -> 解析器
+PARSERS: Dict[str, BaseShareParser] = {}
+
+
+def register_parser(parser: BaseShareParser):
+    """注册网盘解析器（按 drive_type 索引），系统配置中的请求速率加载或变化时立即应用到该解析器"""
+    PARSERS[parser.drive_type] = parser
+    config_cache.subscribe(rate_limit_config_key(parser.drive_type), apply_rate_limit_config)
+
+
+def get_parser(drive_type: str) -> Optional[BaseShareParser]:
+    """获取网盘解析器，不支持的网盘类型返回 None"""
+    return PARSERS.get(drive_type)
+
+
+def rate_limit_config_key(drive_type: str) -> str:
+    """网盘请求速率在系统配置表中的键名，例如 tianyi_rate_limit（分组 cloud_drive）"""
+    return f"{drive_type}_rate_limit"
+
+
+def parse_rate_limit_value(value: Optional[str]) -> Optional[float]:
+    """解析请求速率配置值（每秒请求数，0 表示不限速），空值返回 None，非法值抛出 ValueError"""
+    if value is None or not str(value).strip():
+        return None
+    rate = float(value)
+    if rate < 0:
+        raise ValueError("请求速率不能为负数")
+    return rate
+
+
+def apply_rate_limit_config(config_key: str, config_value: Optional[str]) -> bool:
+    """
+    将系统配置中的请求速率应用到对应网盘的解析器（立即生效）
+
+    配置值为空或配置被删除时恢复为环境配置中的默认速率；
+    config_key 不是请求速率配置时返回 False
+    """
+    for parser in PARSERS.values():
+        if config_key == rate_limit_config_key(parser.drive_type):
+            rate = parse_rate_limit_value(config_value)
+            parser.rate_limiter.set_rate(parser.default_rate_limit if rate is None else rate)
+            print(f"[{parser.drive_type}] rate limit -> {parser.rate_limiter.rate}/s")
+            return True
+    return False
+
+
+async def startup_parsers():
+    """应用启动时为所有解析器创建客户端"""
+    for parser in PARSERS.values():
+        await parser.startup()
+
+
+async def close_parsers():
+    """应用关闭时释放所有解析器的连接池"""
+    for parser in PARSERS.values():
+        await parser.close()
+
+
+register_parser(tianyi_parser)
+register_parser(aliyun_parser)
+register_parser(quark_parser)
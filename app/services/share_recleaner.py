@@ -0,0 +1,167 @@
+"""离线重新清洗 - 清洗规则更新后，用已保存的原始标题和文件名重算清洗结果，不请求网盘"""
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional
+from sqlalchemy import update
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models.models import ShareLink, ShareFile
+from .share_classifier import ShareTypeClassifier
+from .title_cleaner import title_cleaner, file_name_cleaner
+
+settings = get_settings()
+
+# 重新清洗的文件字段（FileNameCleaner.parse 的结果）
+FILE_INFO_FIELDS = (
+    "clean_name", "file_type", "season_number", "episode_number",
+    "resolution", "video_codec", "audio_codec"
+)
+
+
+def _file_depth(file_path: Optional[str]) -> int:
+    """由分享内路径（/目录/文件名）推算所在目录深度，根目录为 0"""
+    return max((file_path or "/").count("/") - 1, 0)
+
+
+class ShareRecleaner:
+    """
+    离线重新清洗任务（管理员手动触发，或由脚本执行）
+
+    挑选 cleaner_version 不是对应清洗器当前版本的记录，按 id 分批读取所需的列，批量写回：
+    - 文件：按 file_name 重算 clean_name、file_type、季号、集号、分辨率和编码
+    - 分享：按 raw_title 重算 clean_title、extracted_tmdb_id，
+      并结合已保存的文件列表（根目录和第一层）重新判断 share_type（与重新解析一样会覆盖手动修改的类型）
+    不加载 ORM 对象，也不请求网盘；中途中断后再次执行会从未更新的记录继续
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, workers: int = 1) -> Optional[Dict]:
+        """
+        执行一次重新清洗（先文件后分享，分享类型依赖文件的解析结果）
+
+        只修改管理员追加的标题清洗规则时，文件名清洗器版本不变，只重新清洗分享标题
+
+        workers > 1 时使用多进程清洗；已有任务在执行时直接返回 None
+        """
+        if not self._lock.acquire(blocking=False):
+            print("[ShareRecleaner] already running")
+            return None
+
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        db = SessionLocal()
+        try:
+            stats = {
+                "file_version": file_name_cleaner.version,
+                "title_version": title_cleaner.version,
+                "files": self._reclean_files(db, file_name_cleaner.version, executor),
+                "shares": self._reclean_shares(db, title_cleaner.version, executor)
+            }
+            print(
+                f"[ShareRecleaner] files={stats['files']} (version {stats['file_version']}), "
+                f"shares={stats['shares']} (version {stats['title_version']})"
+            )
+            return stats
+        finally:
+            db.close()
+            if executor is not None:
+                executor.shutdown()
+            self._lock.release()
+
+    def _reclean_files(self, db, version: str, executor: Optional[Executor]) -> int:
+        """重新解析旧版本的文件（目录没有解析字段，跳过）"""
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.query(ShareFile.id, ShareFile.file_name).filter(
+                ShareFile.id > last_id,
+                ShareFile.is_directory == False,
+                (ShareFile.cleaner_version == None) | (ShareFile.cleaner_version != version)
+            ).order_by(ShareFile.id).limit(settings.reclean_file_chunk_size).all()
+            if not rows:
+                break
+
+            file_infos = file_name_cleaner.parse_many([row.file_name for row in rows], executor=executor)
+            values = [
+                {
+                    "id": row.id,
+                    **{field: file_info[field] for field in FILE_INFO_FIELDS},
+                    "cleaner_version": version
+                }
+                for row, file_info in zip(rows, file_infos)
+            ]
+            db.execute(update(ShareFile), values)
+            db.commit()
+
+            total += len(rows)
+            last_id = rows[-1].id
+            print(f"[ShareRecleaner] 已重新清洗 {total} 个文件")
+        return total
+
+    def _reclean_shares(self, db, version: str, executor: Optional[Executor]) -> int:
+        """重新清洗旧版本分享的标题（未解析过的分享没有原始标题，跳过）"""
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.query(ShareLink.id, ShareLink.raw_title, ShareLink.extracted_tmdb_id).filter(
+                ShareLink.id > last_id,
+                ShareLink.status != "deleted",
+                ShareLink.raw_title != None,
+                ShareLink.raw_title != "",
+                (ShareLink.cleaner_version == None) | (ShareLink.cleaner_version != version)
+            ).order_by(ShareLink.id).limit(settings.reclean_share_chunk_size).all()
+            if not rows:
+                break
+
+            results = title_cleaner.clean_many([row.raw_title for row in rows], executor=executor)
+            share_types = self._classify(db, {row.id: result.share_type for row, result in zip(rows, results)})
+            values = [
+                {
+                    "id": row.id,
+                    "clean_title": result.clean_title,
+                    "share_type": share_types[row.id],
+                    "extracted_tmdb_id": result.tmdb_id or row.extracted_tmdb_id,
+                    "cleaner_version": version
+                }
+                for row, result in zip(rows, results)
+            ]
+            db.execute(update(ShareLink), values)
+            db.commit()
+
+            total += len(rows)
+            last_id = rows[-1].id
+            print(f"[ShareRecleaner] 已重新清洗 {total} 个分享")
+        return total
+
+    @staticmethod
+    def _classify(db, title_types: Dict[int, str]) -> Dict[int, str]:
+        """按已保存的文件列表判断分享类型（share_id -> 标题判断的类型 => share_id -> 分享类型）"""
+        batches: Dict[int, List[Dict]] = {share_id: [] for share_id in title_types}
+        rows = db.query(
+            ShareFile.share_link_id, ShareFile.file_path, ShareFile.is_directory,
+            ShareFile.file_type, ShareFile.episode_number
+        ).filter(ShareFile.share_link_id.in_(list(title_types)))
+        for row in rows:
+            batches[row.share_link_id].append({
+                "depth": _file_depth(row.file_path),
+                "is_directory": row.is_directory,
+                "file_type": row.file_type,
+                "episode_number": row.episode_number
+            })
+
+        share_types = {}
+        for share_id, title_type in title_types.items():
+            classifier = ShareTypeClassifier(title_type)
+            classifier.add(batches[share_id])
+            classifier.finish()
+            share_types[share_id] = classifier.result()
+        return share_types
+
+
+share_recleaner = ShareRecleaner()
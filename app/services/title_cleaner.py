@@ -1,14 +1,60 @@
 """
 标题清洗器 - 从网盘分享标题中提取干净的影视名称
 """
+import hashlib
+import json
 import re
-from typing import Tuple, Optional, Dict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from types import MappingProxyType
+from typing import Callable, Iterable, List, Mapping, Tuple, Optional, Dict
 from dataclasses import dataclass
-
-
-@dataclass
+from ..config import get_settings
+from ..core.cache import LRUCache, MISSING
+from ..core.config_cache import config_cache
+from ..core.keyword_matcher import KeywordMatcher
+
+settings = get_settings()
+
+# 内置清洗规则版本：修改任何内置清洗规则（模式、关键词、处理步骤）时递增。
+# 清洗器的 version 由它和管理员追加的规则共同决定：清洗结果缓存按 (原始字符串, version) 记忆，
+# 并写入 share_links / share_files 的 cleaner_version，离线重新清洗（share_recleaner）据此挑选旧记录
+RULES_VERSION = 1
+
+
+def _map_chunks(func: Callable[[List[str]], list], items: Iterable[str], chunk_size: int,
+                workers: Optional[int] = None, executor: Optional[Executor] = None) -> list:
+    """
+    分块处理列表，结果保持输入顺序
+
+    - 默认在当前进程逐块处理
+    - workers > 1 时创建进程池并行处理（用完即关闭）
+    - 传入 executor 时复用调用方的进程池（适合分页处理大量数据时多次调用）
+    """
+    items = list(items)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results = []
+    if executor is not None:
+        for chunk_result in executor.map(func, chunks):
+            results.extend(chunk_result)
+    elif workers and workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_result in pool.map(func, chunks):
+                results.extend(chunk_result)
+    else:
+        for chunk in chunks:
+            results.extend(func(chunk))
+    return results
+
+
+def _compile_remove_rule(pattern: str) -> Tuple[re.Pattern, Optional[str]]:
+    """干扰模式 -> (正则, 字面量)：不含正则元字符和大小写字母的规则（如 完结、高码）是纯字面量，直接按字符串移除"""
+    literal = pattern if re.escape(pattern) == pattern and pattern.lower() == pattern.upper() else None
+    return re.compile(pattern, re.IGNORECASE), literal
+
+
+@dataclass(frozen=True)
 class CleanResult:
-    """清洗结果"""
+    """清洗结果（不可变，同一标题的结果会被缓存共用）"""
     clean_title: str  # 清洗后的标题
     share_type: str  # tv, movie, movie_collection
     year: Optional[int] = None  # 提取的年份
@@ -120,8 +166,104 @@ class TitleCleaner:
     TV_KEYWORDS = ['第一季', '第二季', '第三季', '第四季', '第五季',
                    'Season', 'S01', 'S02', 'S03',
                    '连续剧', '电视剧', '番剧']
-    
+
+    # 类加载时预编译所有规则，清洗时不再逐条查找 re 模块缓存
+    # 注意：各条规则（包括字面量干扰词）按顺序逐条替换，前一条移除内容后拼接出的文本可能被后一条匹配，
+    # 因此不能合并成一个交替模式或多关键词匹配一次替换，否则结果会变化
+    _REMOVE_RULES = [_compile_remove_rule(p) for p in REMOVE_PATTERNS]
+    _PREFIX_RES = [re.compile(p) for p in PREFIX_PATTERNS]
+    _SEASON_RES = [re.compile(p, re.IGNORECASE) for p in SEASON_PATTERNS]
+    _YEAR_RES = [re.compile(p) for p in YEAR_PATTERNS]
+    _TMDB_ID_RES = [re.compile(p, re.IGNORECASE) for p in TMDB_ID_PATTERNS]
+
+    _RESOLUTION_4K_RE = re.compile(r'4[kK]|2160[pP]')
+    _RESOLUTION_1080_RE = re.compile(r'1080[pP]|FHD', re.IGNORECASE)
+    _RESOLUTION_720_RE = re.compile(r'720[pP]|HD', re.IGNORECASE)
+    _YEAR_RANGE_RE = re.compile(r'\d{4}-\d{4}')
+    _BRACKET_YEAR_RE = re.compile(r'[（\(]\d{4}[）\)]')
+    _DOTTED_YEAR_RE = re.compile(r'[\.\s]\d{4}[\.\s]')
+    _CHINESE_PREFIX_RE = re.compile(r'^([A-Z]?[\u4e00-\u9fa5]+[\d\u4e00-\u9fa5]*)')
+    _CHINESE_ENGLISH_RE = re.compile(r'^[A-Z]?[\u4e00-\u9fa5]+[\d\u4e00-\u9fa5]*[\[\[【\.]')
+    _ENGLISH_SUFFIX_RE = re.compile(r'\.[A-Za-z][A-Za-z0-9\.\-\']+$')
+    _SEPARATORS_RE = re.compile(r'[\s_\-\.·]+')
+    _EDGE_SYMBOLS_RE = re.compile(r'^[\s\-_\.·&]+|[\s\-_\.·&]+$')
+    _CHINESE_WORD_RE = re.compile(r'[\u4e00-\u9fa5]{2,}')
+
+    # 分享类型关键词合并为一个多关键词匹配器，标题只扫描一遍，关键词列表变长时耗时基本不变
+    _KEYWORD_MATCHER = KeywordMatcher(COLLECTION_KEYWORDS + TV_KEYWORDS)
+    _COLLECTION_KEYWORD_SET = frozenset(COLLECTION_KEYWORDS)
+    _TV_KEYWORD_SET = frozenset(TV_KEYWORDS)
+
+    # 管理员可追加的规则类型（排在内置规则之后，见 TITLE_CLEANER_CONFIG_KEYS）
+    EXTRA_RULE_KINDS = ("remove", "prefix", "collection_keyword", "tv_keyword")
+
+    def __init__(self, cache_maxsize: int = None):
+        self._memo = LRUCache(settings.title_cleaner_cache_maxsize if cache_maxsize is None else cache_maxsize)
+        self.version = str(RULES_VERSION)
+        self._extra_rules: Dict[str, Tuple[str, ...]] = {kind: () for kind in self.EXTRA_RULE_KINDS}
+
+    @classmethod
+    def compile_extra_rules(cls, kind: str, rules: Iterable[str]) -> list:
+        """编译追加的规则（正则规则编译，关键词原样返回），规则无效时抛出 ValueError"""
+        if kind not in cls.EXTRA_RULE_KINDS:
+            raise ValueError(f"未知的规则类型: {kind}")
+        if kind not in ("remove", "prefix"):
+            return list(rules)
+
+        compiled = []
+        for rule in rules:
+            try:
+                compiled.append(_compile_remove_rule(rule) if kind == "remove" else re.compile(rule))
+            except re.error as e:
+                raise ValueError(f"无效的正则表达式 {rule!r}: {e}")
+        return compiled
+
+    def set_extra_rules(self, rules: Dict[str, Iterable[str]]):
+        """
+        替换追加规则（{规则类型: 规则列表}，未给出的类型保持不变），与内置规则合并后一次重新编译，并清空清洗结果缓存
+
+        只在规则配置变化时调用，清洗时直接使用编译好的规则；
+        规则无效时抛出 ValueError，当前规则保持不变
+        """
+        extra = dict(self._extra_rules)
+        for kind, kind_rules in rules.items():
+            if kind not in self.EXTRA_RULE_KINDS:
+                raise ValueError(f"未知的规则类型: {kind}")
+            extra[kind] = tuple(kind_rules)
+        compiled = {k: self.compile_extra_rules(k, v) for k, v in extra.items()}
+
+        cls = type(self)
+        collection_keywords = cls.COLLECTION_KEYWORDS + compiled["collection_keyword"]
+        tv_keywords = cls.TV_KEYWORDS + compiled["tv_keyword"]
+        # 实例属性覆盖类属性，多进程批量清洗时随实例一起传给子进程
+        self._REMOVE_RULES = cls._REMOVE_RULES + compiled["remove"]
+        self._PREFIX_RES = cls._PREFIX_RES + compiled["prefix"]
+        self._KEYWORD_MATCHER = KeywordMatcher(collection_keywords + tv_keywords)
+        self._COLLECTION_KEYWORD_SET = frozenset(collection_keywords)
+        self._TV_KEYWORD_SET = frozenset(tv_keywords)
+        self._extra_rules = extra
+
+        if any(extra.values()):
+            digest = hashlib.sha1(json.dumps(extra, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+            self.version = f"{RULES_VERSION}-{digest[:8]}"
+        else:
+            self.version = str(RULES_VERSION)
+        self._memo.clear()
+
+    def cache_stats(self) -> Dict:
+        """清洗结果缓存的命中统计"""
+        return self._memo.stats()
+
     def clean(self, raw_title: str) -> CleanResult:
+        """清洗标题（结果按原始标题和规则版本缓存）"""
+        key = (raw_title, self.version)
+        result = self._memo.get(key)
+        if result is MISSING:
+            result = self._clean(raw_title)
+            self._memo.set(key, result)
+        return result
+
+    def _clean(self, raw_title: str) -> CleanResult:
         """
         清洗标题
 
@@ -138,6 +280,7 @@ class TitleCleaner:
 
         title = raw_title.strip()
 
+
         # 1. 提取 TMDB ID（在清洗前提取）
         tmdb_id = self._extract_tmdb_id(title)
 
@@ -176,25 +319,38 @@ class TitleCleaner:
             tmdb_id=tmdb_id
         )
     
+    def clean_many(self, titles: Iterable[str], chunk_size: int = 1000,
+                   workers: Optional[int] = None, executor: Optional[Executor] = None) -> List[CleanResult]:
+        """
+        批量清洗标题，返回与输入顺序一致的结果列表
+
+        离线回填大量数据时可传 workers=os.cpu_count() 使用多进程，
+        或传入已创建的 ProcessPoolExecutor 在多次调用间复用
+        """
+        return _map_chunks(self._clean_chunk, titles, chunk_size, workers, executor)
+
+    def _clean_chunk(self, titles: List[str]) -> List[CleanResult]:
+        return [self.clean(title) for title in titles]
+
     def _detect_share_type(self, title: str) -> str:
         """检测分享类型"""
+        hits = self._KEYWORD_MATCHER.find_set(title)
+
         # 检查是否为电影合集
-        for keyword in self.COLLECTION_KEYWORDS:
-            if keyword in title:
-                return "movie_collection"
+        if hits & self._COLLECTION_KEYWORD_SET:
+            return "movie_collection"
         
         # 检查是否为 TV 剧集
-        for keyword in self.TV_KEYWORDS:
-            if keyword in title:
-                return "tv"
+        if hits & self._TV_KEYWORD_SET:
+            return "tv"
         
         # 默认为电影
         return "movie"
     
     def _extract_year(self, title: str) -> Optional[int]:
         """提取年份"""
-        for pattern in self.YEAR_PATTERNS:
-            match = re.search(pattern, title)
+        for pattern in self._YEAR_RES:
+            match = pattern.search(title)
             if match:
                 year = int(match.group(1))
                 if 1900 <= year <= 2100:
@@ -203,16 +359,16 @@ class TitleCleaner:
 
     def _extract_tmdb_id(self, title: str) -> Optional[int]:
         """提取 TMDB ID"""
-        for pattern in self.TMDB_ID_PATTERNS:
-            match = re.search(pattern, title, re.IGNORECASE)
+        for pattern in self._TMDB_ID_RES:
+            match = pattern.search(title)
             if match:
                 return int(match.group(1))
         return None
     
     def _extract_season_number(self, title: str) -> Optional[int]:
         """提取季号"""
-        for pattern in self.SEASON_PATTERNS:
-            match = re.search(pattern, title, re.IGNORECASE)
+        for pattern in self._SEASON_RES:
+            match = pattern.search(title)
             if match:
                 season_str = match.group(1)
                 return self._chinese_to_number(season_str)
@@ -220,32 +376,46 @@ class TitleCleaner:
     
     def _extract_resolution(self, title: str) -> Optional[str]:
         """提取分辨率"""
-        if re.search(r'4[kK]|2160[pP]', title):
+        if self._RESOLUTION_4K_RE.search(title):
             return "4K"
-        if re.search(r'1080[pP]|FHD', title, re.IGNORECASE):
+        if self._RESOLUTION_1080_RE.search(title):
             return "1080P"
-        if re.search(r'720[pP]|HD', title, re.IGNORECASE):
+        if self._RESOLUTION_720_RE.search(title):
             return "720P"
         return None
     
+    def _remove_noise(self, result: str) -> str:
+        """
+        按顺序移除所有干扰模式
+
+        大部分规则在单个标题中不会命中，先 search 再 sub（sub 不命中时也要完整扫描并构造结果，慢得多）；
+        字面量干扰词直接用字符串查找和替换
+        """
+        for pattern, literal in self._REMOVE_RULES:
+            if literal is not None:
+                if literal in result:
+                    result = result.replace(literal, '')
+            elif pattern.search(result):
+                result = pattern.sub('', result)
+        return result
+
     def _basic_clean(self, title: str) -> str:
         """基本清理（用于电影合集）"""
         # 移除所有技术信息和年份信息
         result = title
 
         # 移除所有干扰模式
-        for pattern in self.REMOVE_PATTERNS:
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE)
+        result = self._remove_noise(result)
 
         # 移除年份范围（如 1972-1990）
-        result = re.sub(r'\d{4}-\d{4}', '', result)
+        result = self._YEAR_RANGE_RE.sub('', result)
 
         # 移除点号分隔的单个年份
-        result = re.sub(r'[\.\s]\d{4}[\.\s]', ' ', result)
+        result = self._DOTTED_YEAR_RE.sub(' ', result)
 
         # 清理多余空格和符号
-        result = re.sub(r'[\s_\-\.·]+', ' ', result)
-        result = re.sub(r'^[\s\-_\.·&]+|[\s\-_\.·&]+$', '', result)
+        result = self._SEPARATORS_RE.sub(' ', result)
+        result = self._EDGE_SYMBOLS_RE.sub('', result)
 
         return result.strip()
     
@@ -254,47 +424,46 @@ class TitleCleaner:
         result = title
 
         # 0. 先移除 TMDB ID 标签（在其他清洗前）
-        for pattern in self.TMDB_ID_PATTERNS:
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE)
+        for pattern in self._TMDB_ID_RES:
+            result = pattern.sub('', result)
 
         # 1. 处理特殊格式：如果标题包含中文名和英文名，优先提取中文名
         # 例如: "民国惊魂录[4K·高码·60帧].Chronicles.of..." -> "民国惊魂录"
-        chinese_match = re.match(r'^([A-Z]?[\u4e00-\u9fa5]+[\d\u4e00-\u9fa5]*)', result)
+        chinese_match = self._CHINESE_PREFIX_RE.match(result)
         if chinese_match:
             chinese_part = chinese_match.group(1)
             # 如果中文部分后面紧跟着方括号或点号+英文，说明是中英文混合标题
-            if re.search(r'^[A-Z]?[\u4e00-\u9fa5]+[\d\u4e00-\u9fa5]*[\[\[【\.]', result):
+            if self._CHINESE_ENGLISH_RE.search(result):
                 # 提取纯中文标题部分
                 result = chinese_part
 
         # 2. 移除序号前缀
-        for pattern in self.PREFIX_PATTERNS:
-            result = re.sub(pattern, '', result)
+        for pattern in self._PREFIX_RES:
+            result = pattern.sub('', result)
 
         # 3. 移除所有干扰模式
-        for pattern in self.REMOVE_PATTERNS:
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE)
+        result = self._remove_noise(result)
 
         # 4. 移除季号信息
-        for pattern in self.SEASON_PATTERNS:
-            result = re.sub(pattern, '', result, flags=re.IGNORECASE)
+        for pattern in self._SEASON_RES:
+            result = pattern.sub('', result)
 
         # 5. 移除年份（括号格式和点号分隔格式）
-        result = re.sub(r'[（\(]\d{4}[）\)]', '', result)  # 移除 (2026) 或 （2026）
-        result = re.sub(r'[\.\s]\d{4}[\.\s]', ' ', result)  # 移除 .1980. 或 空格1980空格
+        result = self._BRACKET_YEAR_RE.sub('', result)  # 移除 (2026) 或 （2026）
+        result = self._DOTTED_YEAR_RE.sub(' ', result)  # 移除 .1980. 或 空格1980空格
 
         # 6. 移除英文技术后缀（点号分隔的英文单词）
         # 例如: "民国惊魂录.Chronicles.of.the.Republic" -> "民国惊魂录"
-        result = re.sub(r'\.[A-Za-z][A-Za-z0-9\.\-\']+$', '', result)
+        result = self._ENGLISH_SUFFIX_RE.sub('', result)
 
         # 7. 清理多余空格和符号
-        result = re.sub(r'[\s_\-\.·]+', ' ', result)
-        result = re.sub(r'^[\s\-_\.·&]+|[\s\-_\.·&]+$', '', result)
+        result = self._SEPARATORS_RE.sub(' ', result)
+        result = self._EDGE_SYMBOLS_RE.sub('', result)
 
         # 8. 如果结果为空或太短，尝试从原标题提取
         if len(result.strip()) < 2:
             # 尝试提取第一个中文词组
-            match = re.search(r'[\u4e00-\u9fa5]{2,}', title)
+            match = self._CHINESE_WORD_RE.search(title)
             if match:
                 result = match.group(0)
 
@@ -353,8 +522,71 @@ class FileNameCleaner:
     
     # 音频文件扩展名
     AUDIO_EXTENSIONS = {'.mp3', '.flac', '.wav', '.aac', '.m4a', '.ogg', '.wma'}
-    
-    def parse(self, file_name: str) -> Dict:
+
+    # 单次扫描：文件名只转一次大写，每条规则附带一个 hint —— 规则命中时，大写文件名必定能匹配的简单模式
+    # （区分大小写，多为字面量，比原规则快得多）。先用 hint 判断规则是否可能命中，只对可能命中的规则执行原规则，
+    # 结果与逐条执行原规则完全一致。修改规则时需同步修改 hint，保证它是原规则的必要条件（None 表示总是执行）
+
+    # 剧集模式的 hint（与 EPISODE_PATTERNS 一一对应）
+    EPISODE_HINTS = [r'S\d+E\d', r'S\d', r'第\d', r'EP?\.?\d', r'第\d', r'[\[\(]\d', None]
+
+    # 质量标记 (模式, hint, 字段, 值)，同一字段按优先级排列，取第一个命中的
+    QUALITY_TOKENS = [
+        (r'4[kK]|2160[pP]', r'4K|2160P', "resolution", "4K"),
+        (r'1080[pP]', r'1080P', "resolution", "1080P"),
+        (r'720[pP]', r'720P', "resolution", "720P"),
+        (r'HEVC|H\.?265|x265', r'HEVC|265', "video_codec", "HEVC"),
+        (r'AVC|H\.?264|x264', r'AVC|264', "video_codec", "AVC"),
+        (r'AV1', r'AV1', "video_codec", "AV1"),
+        (r'DTS', r'DTS', "audio_codec", "DTS"),
+        (r'AAC', r'AAC', "audio_codec", "AAC"),
+        (r'FLAC', r'FLAC', "audio_codec", "FLAC"),
+        (r'TrueHD|Atmos', r'TRUEHD|ATMOS', "audio_codec", "TrueHD"),
+    ]
+
+    # 清洗文件名的替换规则 (模式, hint)，按顺序执行：移除压制组标签、技术信息
+    CLEAN_PATTERNS = [
+        (r'\[[\w\s&@\-\.]+\]', r'\['),
+        (r'【[\w\s&@\-\.]+】', r'【'),
+        (r'(?:Ma)?10p[_\-]?\d{3,4}p?', r'10P'),
+        (r'\d{3,4}[pP]', r'\dP'),
+        (r'4[kK]', r'4K'),
+    ]
+
+    # 预编译规则（每个文件都会解析一次）
+    _EPISODE_RULES = [
+        (re.compile(p, re.IGNORECASE), re.compile(p).groups, hint and re.compile(hint))
+        for p, hint in zip(EPISODE_PATTERNS, EPISODE_HINTS)
+    ]
+    _QUALITY_RULES = [
+        (re.compile(p, re.IGNORECASE), re.compile(hint), field, value) for p, hint, field, value in QUALITY_TOKENS
+    ]
+    # 所有质量标记 hint 的合并模式，文件名一个都不含时跳过全部质量规则
+    _QUALITY_HINT_RE = re.compile('|'.join(hint for _, hint, _, _ in QUALITY_TOKENS))
+    _CLEAN_RULES = [
+        (re.compile(p, re.IGNORECASE if p.startswith('(?:Ma)') else 0), re.compile(hint)) for p, hint in CLEAN_PATTERNS
+    ]
+
+    def __init__(self, cache_maxsize: int = None):
+        self._memo = LRUCache(settings.file_name_cleaner_cache_maxsize if cache_maxsize is None else cache_maxsize)
+        self.version = str(RULES_VERSION)
+
+    def cache_stats(self) -> Dict:
+        """解析结果缓存的命中统计"""
+        return self._memo.stats()
+
+    def parse(self, file_name: str) -> Mapping:
+        """
+        解析文件名（结果按文件名和规则版本缓存，返回只读映射，需要修改时先 dict() 复制）
+        """
+        key = (file_name, self.version)
+        result = self._memo.get(key)
+        if result is MISSING:
+            result = MappingProxyType(self._parse(file_name))
+            self._memo.set(key, result)
+        return result
+
+    def _parse(self, file_name: str) -> Dict:
         """
         解析文件名
         
@@ -379,21 +611,37 @@ class FileNameCleaner:
             "audio_codec": None
         }
         
+        # 文件名只转一次大写，各规则先按 hint 判断是否可能命中
+        upper = file_name.upper()
+
         # 提取剧集信息
-        season, episode = self._extract_episode_info(file_name)
+        season, episode = self._extract_episode_info(file_name, upper)
         result["season_number"] = season
         result["episode_number"] = episode
         
-        # 提取质量信息
-        result["resolution"] = self._extract_resolution(file_name)
-        result["video_codec"] = self._extract_video_codec(file_name)
-        result["audio_codec"] = self._extract_audio_codec(file_name)
+        # 提取质量信息（分辨率、视频编码、音频编码）
+        if self._QUALITY_HINT_RE.search(upper):
+            for pattern, hint_re, field, value in self._QUALITY_RULES:
+                if result[field] is None and hint_re.search(upper) and pattern.search(file_name):
+                    result[field] = value
         
         # 清洗文件名
         result["clean_name"] = self._clean_file_name(file_name)
         
         return result
     
+    def parse_many(self, file_names: Iterable[str], chunk_size: int = 1000,
+                   workers: Optional[int] = None, executor: Optional[Executor] = None) -> List[Dict]:
+        """
+        批量解析文件名，返回与输入顺序一致的结果列表（多进程用法同 TitleCleaner.clean_many）
+
+        返回的是普通 dict（只读映射无法在进程间传递），调用方可以自由修改
+        """
+        return _map_chunks(self._parse_chunk, file_names, chunk_size, workers, executor)
+
+    def _parse_chunk(self, file_names: List[str]) -> List[Dict]:
+        return [dict(self.parse(file_name)) for file_name in file_names]
+
     def _detect_file_type(self, file_name: str) -> str:
         """检测文件类型"""
         ext = '.' + file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
@@ -408,63 +656,33 @@ class FileNameCleaner:
             return "image"
         return "other"
     
-    def _extract_episode_info(self, file_name: str) -> Tuple[Optional[int], Optional[int]]:
+    def _extract_episode_info(self, file_name: str, upper: str) -> Tuple[Optional[int], Optional[int]]:
         """提取季号和集号"""
-        for pattern in self.EPISODE_PATTERNS:
-            match = re.search(pattern, file_name, re.IGNORECASE)
+        for pattern, group_count, hint_re in self._EPISODE_RULES:
+            if hint_re is not None and not hint_re.search(upper):
+                continue
+            match = pattern.search(file_name)
             if match:
-                groups = match.groups()
-                if len(groups) == 2:
-                    return int(groups[0]), int(groups[1])
-                elif len(groups) == 1:
-                    return None, int(groups[0])
+                if group_count == 2:
+                    return int(match.group(1)), int(match.group(2))
+                elif group_count == 1:
+                    return None, int(match.group(1))
         return None, None
     
-    def _extract_resolution(self, file_name: str) -> Optional[str]:
-        """提取分辨率"""
-        if re.search(r'4[kK]|2160[pP]', file_name):
-            return "4K"
-        if re.search(r'1080[pP]', file_name, re.IGNORECASE):
-            return "1080P"
-        if re.search(r'720[pP]', file_name, re.IGNORECASE):
-            return "720P"
-        return None
-    
-    def _extract_video_codec(self, file_name: str) -> Optional[str]:
-        """提取视频编码"""
-        if re.search(r'HEVC|H\.?265|x265', file_name, re.IGNORECASE):
-            return "HEVC"
-        if re.search(r'AVC|H\.?264|x264', file_name, re.IGNORECASE):
-            return "AVC"
-        if re.search(r'AV1', file_name, re.IGNORECASE):
-            return "AV1"
-        return None
-    
-    def _extract_audio_codec(self, file_name: str) -> Optional[str]:
-        """提取音频编码"""
-        if re.search(r'DTS', file_name, re.IGNORECASE):
-            return "DTS"
-        if re.search(r'AAC', file_name, re.IGNORECASE):
-            return "AAC"
-        if re.search(r'FLAC', file_name, re.IGNORECASE):
-            return "FLAC"
-        if re.search(r'TrueHD|Atmos', file_name, re.IGNORECASE):
-            return "TrueHD"
-        return None
-    
     def _clean_file_name(self, file_name: str) -> str:
         """清洗文件名（移除技术信息，保留核心名称）"""
         # 移除扩展名
         name = file_name.rsplit('.', 1)[0] if '.' in file_name else file_name
-        
-        # 移除压制组标签
-        name = re.sub(r'\[[\w\s&@\-\.]+\]', '', name)
-        name = re.sub(r'【[\w\s&@\-\.]+】', '', name)
-        
-        # 移除技术信息
-        name = re.sub(r'(?:Ma)?10p[_\-]?\d{3,4}p?', '', name, flags=re.IGNORECASE)
-        name = re.sub(r'\d{3,4}[pP]', '', name)
-        name = re.sub(r'4[kK]', '', name)
+        # 不能截取整个文件名的大写结果：部分字符转大写后长度会变化（如 ß -> SS）
+        name_upper = name.upper()
+
+        # 从第一条可能命中的规则开始按顺序替换：之前的规则在原文中没有匹配，可以跳过；
+        # 之后的规则可能匹配前面替换后拼接出的文本，必须照常执行
+        for i, (_, hint_re) in enumerate(self._CLEAN_RULES):
+            if hint_re.search(name_upper):
+                for pattern, _ in self._CLEAN_RULES[i:]:
+                    name = pattern.sub('', name)
+                break
         
         return name.strip()
 
@@ -473,3 +691,51 @@ class FileNameCleaner:
 title_cleaner = TitleCleaner()
 file_name_cleaner = FileNameCleaner()
 
+
+# 管理员追加的标题清洗规则：系统配置键（分组 title_cleaner）-> 规则类型，配置值每行一条
+TITLE_CLEANER_CONFIG_KEYS = {
+    "title_cleaner_remove_patterns": "remove",  # 需要移除的干扰模式（正则，如新的发布组标签、网站水印）
+    "title_cleaner_prefix_patterns": "prefix",  # 序号前缀（正则，应以 ^ 开头）
+    "title_cleaner_collection_keywords": "collection_keyword",  # 电影合集关键词
+    "title_cleaner_tv_keywords": "tv_keyword",  # 剧集关键词
+}
+
+
+def parse_rule_lines(value: Optional[str]) -> List[str]:
+    """解析清洗规则配置值（每行一条，忽略空行和首尾空白）"""
+    if value is None:
+        return []
+    return [line.strip() for line in str(value).splitlines() if line.strip()]
+
+
+def validate_title_cleaner_config(config_key: str, config_value: Optional[str]):
+    """校验追加的清洗规则，正则无效时抛出 ValueError（不是清洗规则配置时不做检查）"""
+    kind = TITLE_CLEANER_CONFIG_KEYS.get(config_key)
+    if kind is not None:
+        TitleCleaner.compile_extra_rules(kind, parse_rule_lines(config_value))
+
+
+def apply_title_cleaner_config(values: Dict[str, Optional[str]]):
+    """
+    将系统配置中追加的清洗规则（{配置键: 配置值}，包含全部清洗规则配置）一次应用到标题清洗器（立即生效）
+
+    配置值为空或配置被删除时移除该类追加规则；
+    某个配置的规则无效时该类保留当前规则，其余配置照常生效
+    """
+    rules = {}
+    for config_key, kind in TITLE_CLEANER_CONFIG_KEYS.items():
+        kind_rules = parse_rule_lines(values.get(config_key))
+        try:
+            TitleCleaner.compile_extra_rules(kind, kind_rules)
+        except ValueError as e:
+            print(f"[TitleCleaner] invalid config {config_key}: {e}")
+            continue
+        rules[kind] = kind_rules
+    title_cleaner.set_extra_rules(rules)
+    counts = ", ".join(f"{kind}={len(kind_rules)}" for kind, kind_rules in rules.items())
+    print(f"[TitleCleaner] extra rules: {counts}, version -> {title_cleaner.version}")
+
+
+# 系统配置缓存加载或配置变化时立即应用追加的清洗规则（多个配置同时变化时只重建一次）
+config_cache.subscribe_many(TITLE_CLEANER_CONFIG_KEYS, apply_title_cleaner_config)
+
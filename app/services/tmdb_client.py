@@ -0,0 +1,129 @@
+"""TMDB API 客户端 - 进程级共享的连接池和请求预算"""
+import asyncio
+import httpx
+from typing import Optional, Dict
+from ..config import get_settings
+from ..core.rate_limit import TokenBucket
+
+settings = get_settings()
+
+
+class TMDBClient:
+    """
+    TMDB API 客户端（进程级单例，解析任务、批量刮削和 API 请求共用）
+
+    - 共享 HTTP 客户端（连接池 + keep-alive），不再每次请求新建连接
+    - 所有调用方共用同一个并发上限和令牌桶：超出请求速率时排队等待，而不是请求失败
+    - 被限流（429）、服务端出错或超时时降低请求速率，按 Retry-After 等待后重试，请求成功后逐步恢复
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        max_concurrency: int = 16,
+        rate_limit: float = 0,
+        max_retries: int = 2
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_retries = max_retries
+        self._client: Optional[httpx.AsyncClient] = None
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = TokenBucket(rate_limit)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """共享的 HTTP 客户端，首次使用时创建"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        """创建带连接池限制的 HTTP 客户端"""
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits)
+
+    async def startup(self):
+        """应用启动时预先创建客户端"""
+        _ = self.client
+
+    async def close(self):
+        """应用关闭时释放连接池"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def get(self, path: str, params: Dict) -> Optional[Dict]:
+        """
+        请求 TMDB 接口（path 如 /movie/550），返回 JSON
+
+        被限流、服务端出错或超时时重试（重试前令牌桶已降速，会等待到允许的时间）；
+        其他非 200 响应或请求失败时返回 None
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                resp = await self._request(path, params)
+            except httpx.TimeoutException:
+                if attempt < self.max_retries:
+                    continue
+                print(f"[TMDB] {path} timeout")
+                return None
+            except httpx.HTTPError as e:
+                # 不打印请求 URL（包含 api_key）
+                print(f"[TMDB] {path} request failed: {type(e).__name__}")
+                return None
+
+            if self._is_throttled(resp) and attempt < self.max_retries:
+                continue
+            if resp.status_code != 200:
+                return None
+            try:
+                return resp.json()
+            except ValueError:
+                return None
+        return None
+
+    async def _request(self, path: str, params: Dict) -> httpx.Response:
+        """发送请求（受并发上限和请求速率限制），根据响应调整请求速率"""
+        async with self._request_semaphore:
+            await self.rate_limiter.acquire()
+            try:
+                resp = await self.client.get(f"{self.base_url}{path}", params=params)
+            except httpx.TimeoutException:
+                self.rate_limiter.penalize()
+                raise
+
+        if self._is_throttled(resp):
+            retry_after = resp.headers.get("Retry-After", "")
+            self.rate_limiter.penalize(float(retry_after) if retry_after.isdigit() else 0)
+            print(f"[TMDB] throttled ({resp.status_code}), rate -> {self.rate_limiter.rate:.2f}/s")
+        else:
+            self.rate_limiter.reward()
+        return resp
+
+    def _is_throttled(self, resp: httpx.Response) -> bool:
+        """响应是否表示服务端限流或过载（HTTP 429 / 5xx）"""
+        return resp.status_code == 429 or resp.status_code >= 500
+
+
+tmdb_client = TMDBClient(
+    settings.tmdb_base_url,
+    timeout=settings.tmdb_timeout,
+    max_connections=settings.tmdb_max_connections,
+    max_keepalive_connections=settings.tmdb_max_keepalive_connections,
+    keepalive_expiry=settings.tmdb_keepalive_expiry,
+    max_concurrency=settings.tmdb_max_concurrency,
+    rate_limit=settings.tmdb_rate_limit,
+    max_retries=settings.tmdb_max_retries
+)
@@ -1,9 +1,15 @@
-import httpx
-from typing import Optional, List
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, List, Tuple
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from ..config import get_settings
-from ..models.models import MediaMetadata, TvSeason, TvEpisode
-from ..models.app_version import SystemConfig
+from ..database import SessionLocal
+from ..models.models import MediaMetadata, MetadataQueryCache, TvSeason, TvEpisode, TmdbSearchMiss
+from ..core.config_cache import config_cache
+from ..core.singleflight import SingleFlight
+from .tmdb_client import tmdb_client
 import json
 
 settings = get_settings()
@@ -12,22 +18,42 @@ TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w500"
 TMDB_BACKDROP_BASE = "https://image.tmdb.org/t/p/w1280"
 TMDB_STILL_BASE = "https://image.tmdb.org/t/p/w300"  # 剧照尺寸
 
+# 详情请求通过 append_to_response 一并获取的子资源（TMDB 单次请求最多附加 20 个）
+TMDB_APPEND_LIMIT = 20
+TMDB_DETAIL_APPENDS = ("alternative_titles", "external_ids")
+
+# 进程内合并并发的相同 TMDB 请求（例如同一部新剧的多个分享同时解析）：
+# 搜索按 (规范化标题, 年份, 类型)，详情按 (tmdb_id, 类型)，只请求一次并共享结果
+_search_flights = SingleFlight()
+_details_flights = SingleFlight()
+# 后台预取全部集信息的任务（按 media_id，同一部剧同时只预取一次）
+_prefetch_tasks: Dict[int, asyncio.Task] = {}
+
+
+def normalize_query(title: str) -> str:
+    """规范化搜索词（忽略大小写和多余空白），用作搜索请求合并和搜索缓存的键"""
+    return " ".join(title.split()).casefold()[:255]
+
+
+def _search_key(title: str, year: Optional[int], media_type: str) -> Tuple[str, int, str]:
+    """搜索键：(规范化搜索词, 年份（0 表示不限）, 类型)"""
+    return normalize_query(title), year or 0, media_type
+
+
+def clear_search_misses(db: Session, titles: Iterable[Optional[str]]):
+    """删除这些标题的搜索无结果记录（所有年份和类型），下次刮削时重新请求 TMDB，由调用方提交"""
+    queries = {normalize_query(title) for title in titles if title}
+    if queries:
+        db.query(TmdbSearchMiss).filter(TmdbSearchMiss.query.in_(queries)).delete(synchronize_session=False)
+
 
 class TMDBService:
     """TMDB 刮削服务 - 带本地缓存"""
 
     def __init__(self, db: Session):
         self.db = db
-        self.base_url = settings.tmdb_base_url
-        # 从数据库读取 TMDB API Key
-        self.api_key = self._get_tmdb_api_key()
-
-    def _get_tmdb_api_key(self) -> str:
-        """从数据库系统配置表读取 TMDB API Key"""
-        config = self.db.query(SystemConfig).filter(
-            SystemConfig.config_key == "tmdb_api_key"
-        ).first()
-        return config.config_value if config else ""
+        # TMDB API Key 从系统配置缓存读取（不再每次查询数据库）
+        self.api_key = config_cache.get("tmdb_api_key", "")
     
     async def search_and_cache(
         self, 
@@ -36,23 +62,24 @@ class TMDBService:
         media_type: str = "movie"
     ) -> Optional[MediaMetadata]:
         """搜索影视并缓存结果"""
-        # 1. 先查本地缓存
-        cached = self._search_local(title, year, media_type)
+        # 1. 先查本地缓存（按搜索键精确匹配）
+        key = _search_key(title, year, media_type)
+        cached = self._search_local(key)
         if cached:
             return cached
         
-        # 2. 调用 TMDB API
-        tmdb_result = await self._search_tmdb(title, year, media_type)
-        if not tmdb_result:
+        # 2. 近期确认过 TMDB 没有结果的搜索，有效期内不再请求
+        if self._is_recent_miss(key):
             return None
-        
-        # 3. 获取详情
-        details = await self._get_tmdb_details(tmdb_result["id"], media_type)
+
+        # 3. 调用 TMDB API 搜索并获取详情（并发的相同搜索只请求一次）
+        details = await _search_flights.do(key, lambda: self._search_details(key, title, year, media_type))
         if not details:
             return None
         
-        # 4. 存入数据库
+        # 4. 存入数据库（并发的调用方中第一个写入，其余读到已有记录），记录搜索键到结果的映射
         metadata = self._save_to_db(details, media_type)
+        self._save_query(key, metadata)
         return metadata
     
     def get_by_tmdb_id(self, tmdb_id: int, media_type: str = None) -> Optional[MediaMetadata]:
@@ -79,22 +106,96 @@ class TMDBService:
 
         return self._save_to_db(details, media_type)
     
-    def _search_local(self, title: str, year: Optional[int], media_type: str) -> Optional[MediaMetadata]:
-        """本地搜索"""
-        query = self.db.query(MediaMetadata).filter(
-            MediaMetadata.media_type == media_type,
-            MediaMetadata.title.ilike(f"%{title}%")
+    async def _search_details(self, key: tuple, title: str, year: Optional[int], media_type: str) -> Optional[dict]:
+        """搜索 TMDB，返回第一个结果的详情；确认没有结果时记录到否定缓存（请求失败不记录）"""
+        results = await self._search_tmdb(title, year, media_type)
+        if results is None:
+            return None
+        if not results:
+            self._record_miss(key)
+            return None
+        self._clear_miss(key)
+        return await self._get_tmdb_details(results[0]["id"], media_type)
+
+    def _is_recent_miss(self, key: tuple) -> bool:
+        """该搜索是否在否定缓存有效期内"""
+        query, year, media_type = key
+        return self.db.query(TmdbSearchMiss.id).filter(
+            TmdbSearchMiss.query == query,
+            TmdbSearchMiss.year == year,
+            TmdbSearchMiss.media_type == media_type,
+            TmdbSearchMiss.expires_at > datetime.utcnow()
+        ).first() is not None
+
+    def _record_miss(self, key: tuple):
+        """记录一次搜索无结果：连续无结果次数 +1，有效期随次数翻倍（不超过上限）"""
+        query, year, media_type = key
+        now = datetime.utcnow()
+        miss = self.db.query(TmdbSearchMiss).filter(
+            TmdbSearchMiss.query == query,
+            TmdbSearchMiss.year == year,
+            TmdbSearchMiss.media_type == media_type
+        ).first()
+        if miss is None:
+            miss = TmdbSearchMiss(query=query, year=year, media_type=media_type, miss_count=0)
+            self.db.add(miss)
+        miss.miss_count += 1
+        miss.last_miss_at = now
+        ttl_hours = min(
+            settings.tmdb_miss_ttl_hours * 2 ** min(miss.miss_count - 1, 16),
+            settings.tmdb_miss_max_ttl_hours
         )
-        if year:
-            query = query.filter(MediaMetadata.year == year)
-        return query.first()
+        miss.expires_at = now + timedelta(hours=ttl_hours)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # 其他进程同时记录了同一个搜索
+            self.db.rollback()
+
+    def _clear_miss(self, key: tuple):
+        """搜索有结果时删除之前的无结果记录（重新开始计数）"""
+        query, year, media_type = key
+        deleted = self.db.query(TmdbSearchMiss).filter(
+            TmdbSearchMiss.query == query,
+            TmdbSearchMiss.year == year,
+            TmdbSearchMiss.media_type == media_type
+        ).delete(synchronize_session=False)
+        if deleted:
+            self.db.commit()
+
+    def _search_local(self, key: tuple) -> Optional[MediaMetadata]:
+        """本地搜索：按搜索键在搜索结果缓存中精确查找（走唯一索引）"""
+        query, year, media_type = key
+        return self.db.query(MediaMetadata).join(
+            MetadataQueryCache, MetadataQueryCache.media_id == MediaMetadata.id
+        ).filter(
+            MetadataQueryCache.query == query,
+            MetadataQueryCache.year == year,
+            MetadataQueryCache.media_type == media_type
+        ).first()
+
+    def _save_query(self, key: tuple, metadata: MediaMetadata):
+        """记录搜索键到元数据的映射（已有映射时不覆盖）"""
+        query, year, media_type = key
+        exists = self.db.query(MetadataQueryCache.id).filter(
+            MetadataQueryCache.query == query,
+            MetadataQueryCache.year == year,
+            MetadataQueryCache.media_type == media_type
+        ).first()
+        if exists:
+            return
+        self.db.add(MetadataQueryCache(query=query, year=year, media_type=media_type, media_id=metadata.id))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # 并发的调用方（或其他进程）已记录同一个搜索
+            self.db.rollback()
     
-    async def _search_tmdb(self, title: str, year: Optional[int], media_type: str) -> Optional[dict]:
-        """调用 TMDB 搜索 API"""
+    async def _search_tmdb(self, title: str, year: Optional[int], media_type: str) -> Optional[List[dict]]:
+        """调用 TMDB 搜索 API，返回搜索结果列表（没有结果时为空列表，请求失败时为 None）"""
         if not self.api_key:
             return None
         
-        endpoint = f"{self.base_url}/search/{media_type}"
         params = {
             "api_key": self.api_key,
             "query": title,
@@ -103,33 +204,29 @@ class TMDBService:
         if year:
             params["year" if media_type == "movie" else "first_air_date_year"] = year
         
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(endpoint, params=params)
-                if resp.status_code != 200:
-                    return None
-                data = resp.json()
-                results = data.get("results", [])
-                return results[0] if results else None
-        except Exception:
+        # 共享客户端统一排队限速，请求失败时返回 None
+        data = await tmdb_client.get(f"/search/{media_type}", params)
+        if not data:
             return None
+        return data.get("results", [])
     
     async def _get_tmdb_details(self, tmdb_id: int, media_type: str) -> Optional[dict]:
-        """获取 TMDB 详情"""
+        """获取 TMDB 详情（并发的相同请求只请求一次，调用方共享结果，不要修改返回的字典）"""
         if not self.api_key:
             return None
-        
-        endpoint = f"{self.base_url}/{media_type}/{tmdb_id}"
-        params = {"api_key": self.api_key, "language": "zh-CN"}
-        
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(endpoint, params=params)
-                if resp.status_code != 200:
-                    return None
-                return resp.json()
-        except Exception:
-            return None
+        return await _details_flights.do(
+            (tmdb_id, media_type),
+            lambda: self._fetch_tmdb_details(tmdb_id, media_type)
+        )
+
+    async def _fetch_tmdb_details(self, tmdb_id: int, media_type: str) -> Optional[dict]:
+        """请求 TMDB 详情接口（同时获取别名和外部 ID，电视剧详情中已包含季列表）"""
+        params = {
+            "api_key": self.api_key,
+            "language": "zh-CN",
+            "append_to_response": ",".join(TMDB_DETAIL_APPENDS)
+        }
+        return await tmdb_client.get(f"/{media_type}/{tmdb_id}", params)
     
     def _save_to_db(self, details: dict, media_type: str) -> MediaMetadata:
         """保存到数据库"""
@@ -154,6 +251,12 @@ class TMDBService:
             runtime = details.get("episode_run_time", [None])[0] if details.get("episode_run_time") else None
 
         genres = [g["name"] for g in details.get("genres", [])]
+        # 电影的别名在 titles 中，电视剧在 results 中
+        alt = details.get("alternative_titles") or {}
+        alternative_titles = list(dict.fromkeys(
+            t["title"] for t in alt.get("titles", alt.get("results", [])) if t.get("title")
+        ))
+        imdb_id = details.get("imdb_id") or (details.get("external_ids") or {}).get("imdb_id")
 
         metadata = MediaMetadata(
             tmdb_id=details["id"],
@@ -169,11 +272,24 @@ class TMDBService:
             genres=json.dumps(genres, ensure_ascii=False),
             status=details.get("status"),
             total_seasons=details.get("number_of_seasons"),
-            total_episodes=details.get("number_of_episodes")
+            total_episodes=details.get("number_of_episodes"),
+            imdb_id=imdb_id,
+            alternative_titles=json.dumps(alternative_titles, ensure_ascii=False)
         )
+        # 电视剧详情中已包含季列表，一并保存，之后获取季信息不再请求 TMDB
+        if media_type == "tv":
+            metadata.seasons = [self._season_from_summary(s) for s in details.get("seasons", [])]
 
         self.db.add(metadata)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # 其他会话（其他进程的刮削任务等）已写入同一条记录，改用已有记录
+            self.db.rollback()
+            existing = self.get_by_tmdb_id(details["id"], media_type)
+            if existing:
+                return existing
+            raise
         self.db.refresh(metadata)
         return metadata
     
@@ -181,99 +297,206 @@ class TMDBService:
         """获取电视剧的所有季信息"""
         if media.media_type != "tv":
             return []
-        
-        # 检查是否已有季信息
+
+        seasons, is_new = await self._get_seasons(media)
+        if is_new:
+            seasons = self._save_new_seasons(media, seasons)
+            self.db.commit()
+        return seasons
+
+    async def _get_seasons(self, media: MediaMetadata) -> Tuple[List[TvSeason], bool]:
+        """返回 (季列表, 是否为新构建)：本地已有的季，或根据 TMDB 详情构建、尚未写入数据库的季"""
         existing_seasons = self.db.query(TvSeason).filter(
             TvSeason.media_id == media.id
         ).all()
         if existing_seasons:
-            return existing_seasons
-        
-        # 从 TMDB 获取详情（包含季列表）
+            return existing_seasons, False
+
+        # 从 TMDB 获取详情（包含季列表，本地没有该剧的元数据时才会走到这里）
         details = await self._get_tmdb_details(media.tmdb_id, "tv")
         if not details or "seasons" not in details:
-            return []
-        
-        seasons = []
-        for s in details.get("seasons", []):
-            season = TvSeason(
-                media_id=media.id,
-                tmdb_season_id=s.get("id"),
-                season_number=s.get("season_number", 0),
-                name=s.get("name"),
-                overview=s.get("overview"),
-                poster_url=f"{TMDB_IMAGE_BASE}{s['poster_path']}" if s.get("poster_path") else None,
-                air_date=s.get("air_date"),
-                episode_count=s.get("episode_count", 0)
-            )
-            self.db.add(season)
-            seasons.append(season)
-        
-        self.db.commit()
+            return [], False
+
+        seasons = [self._season_from_summary(s) for s in details.get("seasons", [])]
+        for season in seasons:
+            season.media_id = media.id
+        return seasons, True
+
+    def _save_new_seasons(self, media: MediaMetadata, seasons: List[TvSeason]) -> List[TvSeason]:
+        """写入新构建的季（flush 取得 ID，由调用方提交）；请求期间其他会话已写入季信息时改用已有的季"""
+        existing_seasons = self.db.query(TvSeason).filter(
+            TvSeason.media_id == media.id
+        ).all()
+        if existing_seasons:
+            return existing_seasons
+        self.db.add_all(seasons)
+        self.db.flush()
         return seasons
-    
+
     async def fetch_season_episodes(self, media: MediaMetadata, season_number: int) -> List[TvEpisode]:
         """获取某一季的所有集信息"""
-        # 先找到季
-        season = self.db.query(TvSeason).filter(
-            TvSeason.media_id == media.id,
-            TvSeason.season_number == season_number
-        ).first()
-        
-        if not season:
-            # 先获取季信息
-            await self.fetch_tv_seasons(media)
-            season = self.db.query(TvSeason).filter(
-                TvSeason.media_id == media.id,
-                TvSeason.season_number == season_number
-            ).first()
-            if not season:
-                return []
-        
-        # 检查是否已有集信息
-        existing_episodes = self.db.query(TvEpisode).filter(
-            TvEpisode.season_id == season.id
-        ).all()
-        if existing_episodes:
-            return existing_episodes
-        
-        # 从 TMDB 获取季详情
-        season_details = await self._get_season_details(media.tmdb_id, season_number)
-        if not season_details or "episodes" not in season_details:
-            return []
-        
-        episodes = []
-        for e in season_details.get("episodes", []):
-            episode = TvEpisode(
-                season_id=season.id,
-                tmdb_episode_id=e.get("id"),
-                episode_number=e.get("episode_number", 0),
-                name=e.get("name"),
-                overview=e.get("overview"),
-                still_url=f"{TMDB_STILL_BASE}{e['still_path']}" if e.get("still_path") else None,
-                air_date=e.get("air_date"),
-                runtime=e.get("runtime"),
-                vote_average=e.get("vote_average")
-            )
-            self.db.add(episode)
-            episodes.append(episode)
-        
-        self.db.commit()
+        episodes = await self.hydrate_series(media, [season_number])
+        return episodes.get(season_number, [])
+
+    async def hydrate_series(
+        self,
+        media: MediaMetadata,
+        season_numbers: Optional[List[int]] = None
+    ) -> Dict[int, List[TvEpisode]]:
+        """
+        获取电视剧各季的集信息（season_numbers 为空时获取所有季），返回 {季号: 集列表}
+
+        本地已有集信息的季不再请求；其余的季通过 append_to_response 合并请求，
+        每次请求最多附加 TMDB_APPEND_LIMIT 个季，多个批次并发请求（由共享的 TMDB 客户端排队限速）。
+        所有请求完成后再写库：本地还没有季信息时，季和获取到的集信息在同一个事务中写入
+        """
+        if media.media_type != "tv":
+            return {}
+
+        def select(all_seasons: List[TvSeason]) -> List[TvSeason]:
+            if season_numbers is None:
+                return all_seasons
+            return [s for s in all_seasons if s.season_number in season_numbers]
+
+        all_seasons, is_new = await self._get_seasons(media)
+        seasons = select(all_seasons)
+        if not seasons:
+            return {}
+
+        # 新构建的季还没有 ID，全部需要请求
+        filled = set() if is_new else self._seasons_with_episodes({s.id: s for s in seasons})
+        numbers = sorted(s.season_number for s in seasons if s.id not in filled)
+        batches = [numbers[i:i + TMDB_APPEND_LIMIT] for i in range(0, len(numbers), TMDB_APPEND_LIMIT)]
+        results = await asyncio.gather(*(self._get_season_batch(media.tmdb_id, batch) for batch in batches))
+        season_details = {number: details for result in results for number, details in result.items()}
+
+        if is_new:
+            seasons = select(self._save_new_seasons(media, all_seasons))
+        season_by_id = {s.id: s for s in seasons}
+
+        # 请求期间其他会话可能已写入部分季的集信息，写入前再检查一次
+        filled = self._seasons_with_episodes(season_by_id)
+        rows = [
+            self._episode_values(season.id, e)
+            for season in seasons
+            if season.id not in filled and season_details.get(season.season_number)
+            for e in season_details[season.season_number].get("episodes", [])
+        ]
+        if rows:
+            self.db.execute(insert(TvEpisode), rows)
+        if rows or is_new:
+            self.db.commit()
+
+        episodes: Dict[int, List[TvEpisode]] = {}
+        for episode in self.db.query(TvEpisode).filter(
+            TvEpisode.season_id.in_(list(season_by_id))
+        ).order_by(TvEpisode.season_id, TvEpisode.episode_number):
+            episodes.setdefault(season_by_id[episode.season_id].season_number, []).append(episode)
         return episodes
+
+    def prefetch_series(self, media: MediaMetadata) -> Optional[asyncio.Task]:
+        """
+        分享匹配到电视剧后在后台预取全部季和集信息，之后查看剧集详情不再等待 TMDB
+
+        预取任务使用独立的数据库会话，不阻塞解析/刮削的响应；同一部剧同时只预取一次，
+        预取失败只打印日志，不影响分享匹配
+        """
+        if media.media_type != "tv" or not settings.tmdb_prefetch_episodes:
+            return None
+
+        task = _prefetch_tasks.get(media.id)
+        if task is None or task.done():
+            task = asyncio.create_task(_prefetch_series(media.id))
+            _prefetch_tasks[media.id] = task
+            task.add_done_callback(lambda t, media_id=media.id: _forget_prefetch(media_id, t))
+        return task
+
+    def _seasons_with_episodes(self, season_by_id: Dict[int, TvSeason]) -> set:
+        """这些季中本地已有集信息的季 ID"""
+        return {
+            season_id for (season_id,) in self.db.query(TvEpisode.season_id).filter(
+                TvEpisode.season_id.in_(list(season_by_id))
+            ).distinct()
+        }
+
+    async def _get_season_batch(self, tmdb_id: int, season_numbers: List[int]) -> Dict[int, dict]:
+        """获取多个季的详情（单季直接请求季详情接口，多季通过 append_to_response 合并为一次请求），返回 {季号: 季详情}"""
+        if len(season_numbers) == 1:
+            details = await self._get_season_details(tmdb_id, season_numbers[0])
+            return {season_numbers[0]: details} if details else {}
+
+        if not self.api_key:
+            return {}
+        params = {
+            "api_key": self.api_key,
+            "language": "zh-CN",
+            "append_to_response": ",".join(f"season/{n}" for n in season_numbers)
+        }
+        data = await tmdb_client.get(f"/tv/{tmdb_id}", params)
+        if not data:
+            return {}
+        return {n: data[f"season/{n}"] for n in season_numbers if data.get(f"season/{n}")}
+
+    def _season_from_summary(self, s: dict) -> TvSeason:
+        """由详情中的季列表项创建季记录（由调用方设置 media_id）"""
+        return TvSeason(
+            tmdb_season_id=s.get("id"),
+            season_number=s.get("season_number", 0),
+            name=s.get("name"),
+            overview=s.get("overview"),
+            poster_url=f"{TMDB_IMAGE_BASE}{s['poster_path']}" if s.get("poster_path") else None,
+            air_date=s.get("air_date"),
+            episode_count=s.get("episode_count", 0)
+        )
+
+    def _episode_values(self, season_id: int, e: dict) -> dict:
+        """季详情中的单集转换为 tv_episodes 行数据（批量写入）"""
+        return {
+            "season_id": season_id,
+            "tmdb_episode_id": e.get("id"),
+            "episode_number": e.get("episode_number", 0),
+            "name": e.get("name"),
+            "overview": e.get("overview"),
+            "still_url": f"{TMDB_STILL_BASE}{e['still_path']}" if e.get("still_path") else None,
+            "air_date": e.get("air_date"),
+            "runtime": e.get("runtime"),
+            "vote_average": e.get("vote_average")
+        }
     
     async def _get_season_details(self, tmdb_id: int, season_number: int) -> Optional[dict]:
         """获取 TMDB 季详情"""
         if not self.api_key:
             return None
         
-        endpoint = f"{self.base_url}/tv/{tmdb_id}/season/{season_number}"
         params = {"api_key": self.api_key, "language": "zh-CN"}
-        
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(endpoint, params=params)
-                if resp.status_code != 200:
-                    return None
-                return resp.json()
-        except Exception:
-            return None
+        return await tmdb_client.get(f"/tv/{tmdb_id}/season/{season_number}", params)
+
+
+async def _prefetch_series(media_id: int):
+    """后台预取一部剧的全部集信息（使用独立的数据库会话）"""
+    db = SessionLocal()
+    try:
+        media = db.query(MediaMetadata).filter(MediaMetadata.id == media_id).first()
+        if media:
+            await TMDBService(db).hydrate_series(media)
+    except Exception as e:
+        print(f"[TMDB] prefetch episodes failed for media {media_id}: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        db.close()
+
+
+def _forget_prefetch(media_id: int, task: asyncio.Task):
+    if _prefetch_tasks.get(media_id) is task:
+        del _prefetch_tasks[media_id]
+
+
+async def wait_prefetches(cancel: bool = False):
+    """等待（cancel=True 时取消）进行中的后台预取，需在关闭 TMDB 客户端之前调用"""
+    tasks = list(_prefetch_tasks.values())
+    if cancel:
+        for task in tasks:
+            task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -34,8 +34,16 @@ CREATE TABLE IF NOT EXISTS media_metadata_new (
 );
 
 -- 2. 复制数据（保持 id 不变以维护外键关系）
-INSERT OR IGNORE INTO media_metadata_new
-SELECT * FROM media_metadata;
+-- 显式列出列名：新建数据库时 create_all 已按当前模型建表，列数多于这里重建的表，
+-- 之后新增的列由后续迁移重新添加
+INSERT OR IGNORE INTO media_metadata_new (
+    id, tmdb_id, media_type, title, original_title, year, poster_url, backdrop_url,
+    plot, rating, runtime, genres, status, total_seasons, total_episodes, created_at, updated_at
+)
+SELECT
+    id, tmdb_id, media_type, title, original_title, year, poster_url, backdrop_url,
+    plot, rating, runtime, genres, status, total_seasons, total_episodes, created_at, updated_at
+FROM media_metadata;
 
 -- 3. 删除旧表
 DROP TABLE IF EXISTS media_metadata;
@@ -0,0 +1,15 @@
+-- =====================================================
+-- 数据库迁移脚本 - share_files 增加 (share_link_id, file_id) 唯一索引
+-- 版本: 004
+-- 说明: 重新解析分享时按 file_id 增量比对文件列表（只插入新增、更新变化、删除缺失）
+-- 数据库: SQLite
+-- =====================================================
+
+-- 1. 清理同一分享内重复的文件记录（保留最早的一条）
+DELETE FROM share_files
+WHERE id NOT IN (
+    SELECT MIN(id) FROM share_files GROUP BY share_link_id, file_id
+);
+
+-- 2. 创建唯一索引
+CREATE UNIQUE INDEX IF NOT EXISTS uq_share_files_link_file ON share_files(share_link_id, file_id);
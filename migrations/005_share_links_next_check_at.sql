@@ -0,0 +1,13 @@
+-- =====================================================
+-- 数据库迁移脚本 - 分享有效性检测调度
+-- 版本: 005
+-- 日期: 2026-10-17
+-- 说明: 添加 next_check_at 字段，检测任务按该字段挑选最久未检测的分享
+-- 数据库: SQLite
+-- =====================================================
+
+-- 1. 为 share_links 表添加下次检测时间（为空表示尽快检测）
+ALTER TABLE share_links ADD COLUMN next_check_at DATETIME;
+
+-- 2. 添加索引，按到期时间挑选待检测分享
+CREATE INDEX IF NOT EXISTS ix_share_links_next_check_at ON share_links(next_check_at);
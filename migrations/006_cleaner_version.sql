@@ -0,0 +1,13 @@
+-- =====================================================
+-- 数据库迁移脚本 - 清洗规则版本
+-- 版本: 006
+-- 日期: 2026-10-17
+-- 说明: 记录清洗标题/文件名时使用的清洗规则版本，规则更新后离线重新清洗旧版本的记录
+-- 数据库: SQLite
+-- =====================================================
+
+-- 1. share_links 清洗标题时的规则版本（为空表示未知，首次离线清洗时全部重算）
+ALTER TABLE share_links ADD COLUMN cleaner_version VARCHAR(32);
+
+-- 2. share_files 解析文件名时的规则版本
+ALTER TABLE share_files ADD COLUMN cleaner_version VARCHAR(32);
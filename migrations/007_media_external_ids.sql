@@ -0,0 +1,14 @@
+-- =====================================================
+-- 数据库迁移脚本 - 元数据外部 ID 和别名
+-- 版本: 007
+-- 日期: 2026-10-17
+-- 说明: TMDB 详情请求通过 append_to_response 一并获取 IMDb ID 和各地区别名
+-- 数据库: SQLite
+-- =====================================================
+
+-- 1. IMDb ID
+ALTER TABLE media_metadata ADD COLUMN imdb_id VARCHAR(20);
+CREATE INDEX IF NOT EXISTS ix_media_metadata_imdb_id ON media_metadata(imdb_id);
+
+-- 2. 各地区别名（JSON 数组）
+ALTER TABLE media_metadata ADD COLUMN alternative_titles TEXT;
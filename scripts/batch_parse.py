@@ -8,8 +8,10 @@ sys.path.insert(0, '.')
 
 import asyncio
 from app.database import SessionLocal
+from app.core.config_cache import config_cache
 from app.models.models import ShareLink
 from app.api.shares import parse_and_update_share
+from app.services.tmdb_service import wait_prefetches
 
 
 async def main():
@@ -23,6 +25,8 @@ async def main():
     
     total = len(shares)
     print(f'Shares to parse: {total}', flush=True)
+    # 请求速率由解析器的令牌桶控制（系统配置 *_rate_limit）
+    config_cache.load(db)
     db.close()
     
     success = 0
@@ -46,10 +50,9 @@ async def main():
         
         if (i + 1) % 50 == 0:
             print(f'Progress: {i+1}/{total} (success: {success}, failed: {failed})', flush=True)
-        
-        # Small delay
-        if (i + 1) % 5 == 0:
-            await asyncio.sleep(0.3)
+
+    # 等待后台预取的剧集信息写入完成（asyncio.run 退出时会取消未完成的任务）
+    await wait_prefetches()
     
     print(f'\n=== Parse Complete ===', flush=True)
     print(f'Total: {total}', flush=True)
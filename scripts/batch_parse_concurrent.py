@@ -10,8 +10,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import asyncio
 from datetime import datetime
 from app.database import SessionLocal
+from app.core.config_cache import config_cache
 from app.models.models import ShareLink
 from app.api.shares import parse_and_update_share
+from app.services.tmdb_service import wait_prefetches
 
 
 async def batch_parse_concurrent(max_workers: int = 5):
@@ -26,6 +28,8 @@ async def batch_parse_concurrent(max_workers: int = 5):
     
     total = len(shares)
     print(f'[{datetime.now()}] Starting batch parse: {total} shares ({max_workers} threads)', flush=True)
+    # 请求速率由解析器的令牌桶控制（系统配置 *_rate_limit）
+    config_cache.load(db)
     db.close()
     
     if total == 0:
@@ -48,7 +52,6 @@ async def batch_parse_concurrent(max_workers: int = 5):
                 failed += 1
                 err = str(e)[:50]
                 print(f'[{datetime.now()}] Error share {share_id}: {err}', flush=True)
-            await asyncio.sleep(0.2)
     
     # 创建所有任务
     tasks = [
@@ -58,6 +61,8 @@ async def batch_parse_concurrent(max_workers: int = 5):
     
     # 并发执行
     await asyncio.gather(*tasks)
+    # 等待后台预取的剧集信息写入完成（asyncio.run 退出时会取消未完成的任务）
+    await wait_prefetches()
     
     print(f'[{datetime.now()}] Batch parse completed!', flush=True)
     print(f'Total: {total}, Success: {success}, Failed: {failed}', flush=True)
@@ -0,0 +1,197 @@
+"""
+标题/文件名清洗 回归校验 + 微基准
+
+语料 scripts/cleaner_corpus.json 保存分享标题、文件名、分享链接文本及各自的期望输出：
+  titles          -> TitleCleaner.clean 的结果（CleanResult 各字段）
+  file_names      -> FileNameCleaner.parse 的结果
+  share_urls      -> clean_share_url 的结果
+  password_texts  -> extract_password_from_text 的结果
+
+用法:
+  # 校验语料并压测（任一结果与期望不一致时退出码为 1）
+  python scripts/cleaner_bench.py
+
+  # 修改清洗规则后重新生成期望输出（逐条确认 diff 无误后再提交语料）
+  #   新增语料时只需在对应列表追加 {"input": "..."}，再运行 --update 补全期望输出
+  python scripts/cleaner_bench.py --update
+
+  # 保存当前吞吐量为基线；之后与基线比较，任一项吞吐量下降超过阈值时退出码为 1
+  python scripts/cleaner_bench.py --save-baseline bench_baseline.json
+  python scripts/cleaner_bench.py --baseline bench_baseline.json --threshold 0.15
+
+压测不使用清洗结果缓存，测量的是规则本身的耗时；基线与机器相关，只在同一台机器上比较。
+机器繁忙时单次结果波动较大，保存和比较基线时可适当增加 --rounds / --min-time。
+"""
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.stdout.reconfigure(encoding='utf-8')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.title_cleaner import TitleCleaner, FileNameCleaner, RULES_VERSION
+from app.services.share_parser import clean_share_url, extract_password_from_text
+
+DEFAULT_CORPUS = Path(__file__).with_name("cleaner_corpus.json")
+
+
+def build_targets() -> Dict[str, tuple]:
+    """语料分组 -> (压测名称, 被测函数, 结果序列化函数)，清洗器不使用缓存"""
+    title_cleaner = TitleCleaner(cache_maxsize=0)
+    file_name_cleaner = FileNameCleaner(cache_maxsize=0)
+    return {
+        "titles": ("TitleCleaner.clean", title_cleaner.clean, dataclasses.asdict),
+        "file_names": ("FileNameCleaner.parse", file_name_cleaner.parse, dict),
+        "share_urls": ("clean_share_url", clean_share_url, str),
+        "password_texts": ("extract_password_from_text", extract_password_from_text, str),
+    }
+
+
+def load_json(path: Path) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: Path, data: Dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+# ========== 校验 ==========
+
+def check(corpus: Dict, targets: Dict[str, tuple]) -> int:
+    """逐条比对期望输出，返回不一致的条数"""
+    failures = 0
+    for group, (name, func, serialize) in targets.items():
+        cases = corpus.get(group, [])
+        group_failures = 0
+        for case in cases:
+            actual = serialize(func(case["input"]))
+            if "expected" not in case:
+                print(f"  [缺少期望] {name}({case['input']!r})，请运行 --update")
+                group_failures += 1
+            elif actual != case["expected"]:
+                print(f"  [不一致] {name}({case['input']!r})")
+                print(f"      期望: {case['expected']}")
+                print(f"      实际: {actual}")
+                group_failures += 1
+        status = "OK" if not group_failures else f"{group_failures} 条不一致"
+        print(f"{name:<28} {len(cases):>5} 条  {status}")
+        failures += group_failures
+
+    if failures and corpus.get("rules_version") == RULES_VERSION:
+        print(f"清洗结果有变化但 RULES_VERSION 仍为 {RULES_VERSION}：确认变化符合预期后请递增 RULES_VERSION 并运行 --update")
+    return failures
+
+
+def update(corpus: Dict, targets: Dict[str, tuple]) -> int:
+    """用当前实现重新生成期望输出，返回变化的条数"""
+    changed = 0
+    for group, (name, func, serialize) in targets.items():
+        for case in corpus.get(group, []):
+            actual = serialize(func(case["input"]))
+            if case.get("expected") != actual:
+                print(f"  [更新] {name}({case['input']!r})")
+                print(f"      原来: {case.get('expected')}")
+                print(f"      现在: {actual}")
+                case["expected"] = actual
+                changed += 1
+    corpus["rules_version"] = RULES_VERSION
+    return changed
+
+
+# ========== 压测 ==========
+
+def measure(func: Callable, inputs: List[str], rounds: int, min_time: float) -> float:
+    """吞吐量（条/秒），每轮至少运行 min_time 秒，取最快的一轮"""
+    if not inputs:
+        return 0.0
+    best = 0.0
+    for _ in range(rounds):
+        count = 0
+        started = time.perf_counter()
+        while True:
+            for item in inputs:
+                func(item)
+            count += len(inputs)
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = max(best, count / elapsed)
+    return best
+
+
+def bench(corpus: Dict, targets: Dict[str, tuple], rounds: int, min_time: float) -> Dict[str, float]:
+    results = {}
+    for group, (name, func, _) in targets.items():
+        inputs = [case["input"] for case in corpus.get(group, [])]
+        results[name] = measure(func, inputs, rounds, min_time)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> int:
+    """与基线比较，返回吞吐量下降超过阈值的项数"""
+    regressions = 0
+    print(f"{'函数':<28} {'条/秒':>12} {'基线':>12} {'变化':>8}")
+    for name, rate in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<28} {rate:>12,.0f} {'-':>12} {'-':>8}")
+            continue
+        change = rate / base - 1
+        mark = ""
+        if change < -threshold:
+            mark = "  [变慢]"
+            regressions += 1
+        print(f"{name:<28} {rate:>12,.0f} {base:>12,.0f} {change:>+8.1%}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="标题/文件名清洗 回归校验 + 微基准")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="语料文件")
+    parser.add_argument("--update", action="store_true", help="用当前实现重新生成期望输出")
+    parser.add_argument("--no-bench", action="store_true", help="只校验，不压测")
+    parser.add_argument("--rounds", type=int, default=5, help="压测轮数（取最快的一轮）")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮最短运行时间（秒）")
+    parser.add_argument("--baseline", default="", help="与该基线文件比较吞吐量")
+    parser.add_argument("--threshold", type=float, default=0.15, help="吞吐量允许下降的比例")
+    parser.add_argument("--save-baseline", default="", help="把本次吞吐量保存为基线文件")
+    args = parser.parse_args()
+
+    corpus_path = Path(args.corpus)
+    corpus = load_json(corpus_path)
+    targets = build_targets()
+
+    if args.update:
+        changed = update(corpus, targets)
+        save_json(corpus_path, corpus)
+        print(f"已更新 {changed} 条期望输出 -> {corpus_path}（RULES_VERSION={RULES_VERSION}）")
+        return
+
+    failed = check(corpus, targets) > 0
+    if args.no_bench:
+        sys.exit(1 if failed else 0)
+
+    print(f"\n压测（不使用缓存，{args.rounds} 轮取最快）")
+    results = bench(corpus, targets, args.rounds, args.min_time)
+    baseline = load_json(Path(args.baseline)) if args.baseline else {}
+    if compare(results, baseline, args.threshold):
+        print(f"吞吐量下降超过 {args.threshold:.0%}")
+        failed = True
+
+    if args.save_baseline:
+        save_json(Path(args.save_baseline), results)
+        print(f"基线已保存 -> {args.save_baseline}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,10 @@ sys.stderr.reconfigure(encoding='utf-8')
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
+from app.core.config_cache import config_cache
 from app.models.models import ShareLink
 from app.api.shares import parse_and_update_share
+from app.services.tmdb_service import wait_prefetches
 
 
 def extract_shares_from_file(file_path: str) -> list:
@@ -133,6 +135,8 @@ async def main():
     expired = 0
     
     db = SessionLocal()
+    # 请求速率由解析器的令牌桶控制（系统配置 *_rate_limit）
+    config_cache.load(db)
     
     try:
         for i, share in enumerate(shares):
@@ -154,14 +158,11 @@ async def main():
             else:
                 failed += 1
                 print(f"  [FAIL] Error: {result['message']}")
-            
-            # 每处理50个暂停一下，避免请求过快
-            if (i + 1) % 50 == 0:
-                print(f"\n--- 已处理 {i+1} 个，暂停2秒 ---")
-                await asyncio.sleep(2)
     
     finally:
         db.close()
+    # 等待后台预取的剧集信息写入完成（asyncio.run 退出时会取消未完成的任务）
+    await wait_prefetches()
     
     print(f"\n{'='*50}")
     print(f"导入完成!")
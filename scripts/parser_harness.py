@@ -0,0 +1,307 @@
+"""
+天翼云盘分享解析 录制/回放/压测 工具
+
+用法:
+  # 1. 录制：真实解析一批分享，把 getShareInfoByCodeV2 / checkAccessCode / listShareDir 的响应保存为夹具
+  python scripts/parser_harness.py record --urls shares.txt --fixtures data/parser_fixtures
+
+  # 2. 回放：启动本地桩服务，按夹具返回响应（可模拟延迟和错误率）
+  python scripts/parser_harness.py serve --fixtures data/parser_fixtures --port 8900 --latency 0.05 --error-rate 0.01
+  #    应用或脚本设置 TIANYI_API_BASE=http://127.0.0.1:8900 即可改为请求桩服务
+
+  # 3. 压测：在不同并发数下解析夹具中的全部分享，统计吞吐量（分享/秒）和 p50/p99 耗时
+  python scripts/parser_harness.py bench --fixtures data/parser_fixtures --concurrency 1,4,16 --repeat 3
+  #    未指定 --base-url 时在进程内回放（ASGI），不经过网络；指定时请求已启动的桩服务
+
+shares.txt 每行一个分享，格式与用户提交时相同，例如：
+  https://cloud.189.cn/t/xxxx（访问码：abcd）
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.stdout.reconfigure(encoding='utf-8')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.services.share_parser import tianyi_parser, clean_share_url, extract_password_from_text
+
+# 录制/回放的接口，以及用于匹配响应的请求参数
+RECORDED_APIS = {
+    "getShareInfoByCodeV2.action": ("shareCode",),
+    "checkAccessCode.action": ("shareCode", "accessCode"),
+    "listShareDir.action": ("shareId", "fileId", "pageNum", "pageSize"),
+}
+
+
+def fixture_key(path: str, params) -> Optional[str]:
+    """请求 -> 夹具键（接口名 + 关键参数），不需要录制的接口返回 None"""
+    api = path.rsplit("/", 1)[-1]
+    key_params = RECORDED_APIS.get(api)
+    if key_params is None:
+        return None
+    return api + "?" + "&".join(f"{name}={params.get(name, '')}" for name in key_params)
+
+
+def load_fixtures(fixtures_dir: Path) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """读取夹具目录，返回 (分享列表, 夹具键 -> 响应)"""
+    shares = []
+    responses = {}
+    for fixture_file in sorted(fixtures_dir.glob("*.json")):
+        with open(fixture_file, "r", encoding="utf-8") as f:
+            fixture = json.load(f)
+        shares.append({"share_url": fixture["share_url"], "password": fixture.get("password")})
+        responses.update(fixture["responses"])
+    return shares, responses
+
+
+def read_share_lines(urls_file: str) -> List[Dict]:
+    """读取分享列表文件（每行一个分享，可带访问码）"""
+    shares = []
+    with open(urls_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            shares.append({
+                "share_url": clean_share_url(line),
+                "password": extract_password_from_text(line) or None
+            })
+    return shares
+
+
+# ========== record ==========
+
+async def record(args):
+    """真实解析分享，按分享保存接口响应"""
+    fixtures_dir = Path(args.fixtures)
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    shares = read_share_lines(args.urls)
+    print(f"录制 {len(shares)} 个分享 -> {fixtures_dir}")
+
+    captured: Dict[str, Dict] = {}
+
+    async def on_response(response: httpx.Response):
+        key = fixture_key(response.request.url.path, response.request.url.params)
+        if key is None:
+            return
+        await response.aread()
+        captured[key] = {
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json"),
+            "body": response.text
+        }
+
+    client = tianyi_parser.client
+    client.event_hooks = {"request": [], "response": [*client.event_hooks["response"], on_response]}
+    try:
+        for i, share in enumerate(shares):
+            captured.clear()
+            result = await tianyi_parser.parse_share(share["share_url"], share["password"])
+            status = "OK" if result else "FAIL"
+            print(f"[{i + 1}/{len(shares)}] {status} {share['share_url']} ({len(captured)} responses)")
+
+            share_code = tianyi_parser._extract_share_code(share["share_url"]) or f"share{i}"
+            with open(fixtures_dir / f"{share_code}.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "share_url": share["share_url"],
+                    "password": share["password"],
+                    "parsed": bool(result),
+                    "file_count": result.get("file_count") if result else None,
+                    "responses": dict(captured)
+                }, f, ensure_ascii=False, indent=2)
+    finally:
+        await tianyi_parser.close()
+
+
+# ========== serve ==========
+
+def create_replay_app(responses: Dict[str, Dict], latency: float = 0.0, jitter: float = 0.0,
+                      error_rate: float = 0.0, error_status: int = 500):
+    """
+    创建回放桩服务（ASGI 应用）
+
+    - latency/jitter: 每个请求的固定延迟和随机附加延迟（秒）
+    - error_rate: 按该概率返回 error_status（模拟限流或服务端故障）
+    - 夹具中没有的请求返回 404
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import Response
+
+    app = FastAPI(title="cloud.189.cn replay")
+    stats = {"requests": 0, "errors": 0, "misses": 0}
+    app.state.stats = stats
+
+    @app.api_route("/api/open/share/{api}", methods=["GET", "POST"])
+    async def replay(api: str, request: Request):
+        stats["requests"] += 1
+        delay = latency + (random.uniform(0, jitter) if jitter else 0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if error_rate and random.random() < error_rate:
+            stats["errors"] += 1
+            return Response(status_code=error_status)
+
+        fixture = responses.get(fixture_key(f"/{api}", request.query_params) or "")
+        if fixture is None:
+            stats["misses"] += 1
+            return Response(status_code=404)
+        return Response(
+            content=fixture["body"],
+            status_code=fixture["status"],
+            media_type=fixture.get("content_type", "application/json")
+        )
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+def serve(args):
+    """启动回放桩服务"""
+    import uvicorn
+
+    shares, responses = load_fixtures(Path(args.fixtures))
+    print(f"加载 {len(shares)} 个分享 / {len(responses)} 个响应，监听 http://{args.host}:{args.port}")
+    app = create_replay_app(responses, args.latency, args.jitter, args.error_rate, args.error_status)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+# ========== bench ==========
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算分位数（最近秩法）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def bench_level(shares: List[Dict], concurrency: int, repeat: int, keep_cache: bool) -> Dict:
+    """在指定并发数下解析所有分享 repeat 遍"""
+    if not keep_cache:
+        tianyi_parser._share_info_cache.clear()
+        tianyi_parser._access_code_cache.clear()
+
+    jobs = [share for _ in range(repeat) for share in shares]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failed = 0
+
+    async def run(share: Dict):
+        nonlocal failed
+        async with semaphore:
+            started = time.perf_counter()
+            result = await tianyi_parser.parse_share(share["share_url"], share["password"])
+            latencies.append(time.perf_counter() - started)
+            if not result:
+                failed += 1
+
+    started = time.perf_counter()
+    # 解析器逐条打印接口响应和错误堆栈，压测时丢弃这些输出
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        await asyncio.gather(*(run(share) for share in jobs))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "shares": len(jobs),
+        "failed": failed,
+        "elapsed": elapsed,
+        "throughput": len(jobs) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+    }
+
+
+async def bench(args):
+    """压测解析器"""
+    shares, responses = load_fixtures(Path(args.fixtures))
+    if not shares:
+        print("夹具目录为空，请先运行 record")
+        return
+
+    if args.base_url:
+        tianyi_parser.base_url = args.base_url.rstrip("/")
+        target = args.base_url
+    else:
+        # 进程内回放：客户端直接调用 ASGI 应用，测量结果不含网络开销
+        app = create_replay_app(responses, args.latency, args.jitter, args.error_rate, args.error_status)
+        tianyi_parser._client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url=tianyi_parser.base_url
+        )
+        target = "in-process replay"
+
+    # 默认不限速，测量解析器本身的吞吐量
+    tianyi_parser.rate_limiter.set_rate(args.rate_limit)
+
+    print(f"压测 {len(shares)} 个分享 × {args.repeat} 遍，目标: {target}，限速: {args.rate_limit or '无'}")
+    print(f"{'并发':>6} {'分享数':>8} {'失败':>6} {'耗时(s)':>10} {'分享/秒':>10} {'p50(ms)':>10} {'p99(ms)':>10}")
+    try:
+        for concurrency in args.concurrency:
+            r = await bench_level(shares, concurrency, args.repeat, args.keep_cache)
+            print(
+                f"{r['concurrency']:>6} {r['shares']:>8} {r['failed']:>6} {r['elapsed']:>10.2f} "
+                f"{r['throughput']:>10.1f} {r['p50'] * 1000:>10.1f} {r['p99'] * 1000:>10.1f}"
+            )
+    finally:
+        await tianyi_parser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="天翼云盘分享解析 录制/回放/压测 工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_replay_options(p):
+        p.add_argument("--fixtures", default="data/parser_fixtures", help="夹具目录")
+        p.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟（秒）")
+        p.add_argument("--jitter", type=float, default=0.0, help="每个请求的随机附加延迟上限（秒）")
+        p.add_argument("--error-rate", type=float, default=0.0, help="返回错误响应的概率 (0~1)")
+        p.add_argument("--error-status", type=int, default=500, help="错误响应的状态码（如 429/500/503）")
+
+    p_record = sub.add_parser("record", help="录制真实接口响应")
+    p_record.add_argument("--urls", required=True, help="分享列表文件（每行一个分享）")
+    p_record.add_argument("--fixtures", default="data/parser_fixtures", help="夹具目录")
+
+    p_serve = sub.add_parser("serve", help="启动回放桩服务")
+    add_replay_options(p_serve)
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8900)
+
+    p_bench = sub.add_parser("bench", help="压测解析吞吐量和耗时")
+    add_replay_options(p_bench)
+    p_bench.add_argument("--base-url", default="", help="已启动的桩服务地址（为空时进程内回放）")
+    p_bench.add_argument(
+        "--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 16],
+        help="并发数列表，逗号分隔"
+    )
+    p_bench.add_argument("--repeat", type=int, default=3, help="每个并发数下解析全部分享的遍数")
+    p_bench.add_argument("--rate-limit", type=float, default=0.0, help="请求速率上限（0 表示不限速）")
+    p_bench.add_argument("--keep-cache", action="store_true", help="各轮之间保留分享信息缓存")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(record(args))
+    elif args.command == "serve":
+        serve(args)
+    else:
+        asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+按当前清洗规则离线重新清洗分享标题和文件信息（不请求网盘）
+
+清洗规则更新（递增 RULES_VERSION 或修改系统配置中追加的标题清洗规则）后执行，只处理用旧版本规则清洗的记录:
+  python scripts/reclean_shares.py [清洗进程数，默认 CPU 核数]
+"""
+import os
+import sys
+import time
+sys.stdout.reconfigure(encoding='utf-8')
+sys.path.insert(0, '.')
+
+from app.database import SessionLocal
+from app.core.config_cache import config_cache
+from app.services.share_recleaner import share_recleaner
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    db = SessionLocal()
+    try:
+        config_cache.load(db)
+    finally:
+        db.close()
+
+    print(f"重新清洗（{workers} 个进程）...")
+    started = time.perf_counter()
+    stats = share_recleaner.run(workers)
+    print(f"{'='*50}")
+    print(f"清洗完成: {stats['files']} 个文件, {stats['shares']} 个分享, "
+          f"耗时 {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,16 @@
 重新解析现有分享链接，填充 clean_title、sharer 等新字段
 """
 import asyncio
+import os
 import sys
 sys.path.insert(0, '.')
 
 from app.database import SessionLocal
-from app.models.models import ShareLink, ShareFile, Sharer
-from app.services.share_parser import tianyi_parser
-from app.services.title_cleaner import title_cleaner, file_name_cleaner
+from app.core.config_cache import config_cache
+from app.models.models import ShareLink, Sharer
+from app.services.share_parser import get_parser
+from app.services.share_recleaner import share_recleaner
+from app.services.title_cleaner import title_cleaner
 
 
 async def reparse_share(db, share: ShareLink):
@@ -16,8 +19,14 @@ async def reparse_share(db, share: ShareLink):
     print(f"\n{'='*50}")
     print(f"解析分享 ID={share.id}: {share.share_url}")
     
+    parser = get_parser(share.drive_type)
+    if parser is None:
+        print(f"  [跳过] 暂不支持该网盘类型: {share.drive_type}")
+        return False
+
     try:
-        result = await tianyi_parser.parse_share(share.share_url, share.password)
+        # 只需要标题、类型和分享人，文件信息由已有记录重新清洗，类型确定后即停止爬取
+        result = await parser.parse_share(share.share_url, share.password, classify_only=True)
         
         if not result:
             print(f"  [失败] 无法解析")
@@ -28,6 +37,7 @@ async def reparse_share(db, share: ShareLink):
         share.clean_title = result.get("clean_title", "")
         share.share_type = result.get("share_type", "tv")
         share.share_code = result.get("share_code", "")
+        share.cleaner_version = title_cleaner.version
         
         print(f"  raw_title: {share.raw_title}")
         print(f"  clean_title: {share.clean_title}")
@@ -57,17 +67,6 @@ async def reparse_share(db, share: ShareLink):
             
             share.sharer_id = sharer.id
         
-        # 更新现有文件的信息
-        for db_file in share.files:
-            file_info = file_name_cleaner.parse(db_file.file_name)
-            db_file.clean_name = file_info["clean_name"]
-            db_file.file_type = file_info["file_type"]
-            db_file.season_number = file_info["season_number"]
-            db_file.episode_number = file_info["episode_number"]
-            db_file.resolution = file_info["resolution"]
-            db_file.video_codec = file_info["video_codec"]
-            db_file.audio_codec = file_info["audio_codec"]
-        
         db.commit()
         print(f"  [成功] 已更新")
         return True
@@ -80,16 +79,19 @@ async def reparse_share(db, share: ShareLink):
 
 
 async def main():
+    # 用法: python scripts/reparse_shares.py [文件清洗进程数，默认 CPU 核数]
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
     db = SessionLocal()
     
     try:
         # 获取所有需要重新解析的分享
         shares = db.query(ShareLink).filter(
-            ShareLink.status == "active",
-            ShareLink.drive_type == "tianyi"
+            ShareLink.status == "active"
         ).all()
         
         print(f"找到 {len(shares)} 个分享需要重新解析")
+        # 请求速率由解析器的令牌桶控制（系统配置 *_rate_limit）
+        config_cache.load(db)
         
         success = 0
         failed = 0
@@ -99,12 +101,14 @@ async def main():
                 success += 1
             else:
                 failed += 1
-            
-            # 避免请求过快
-            await asyncio.sleep(1)
         
         print(f"\n{'='*50}")
         print(f"解析完成: 成功 {success}, 失败 {failed}")
+
+        # 按当前清洗规则重新清洗现有文件（以及未能重新解析的分享标题），不请求网盘
+        print(f"重新清洗文件信息（{workers} 个进程）...")
+        stats = share_recleaner.run(workers)
+        print(f"文件清洗完成: {stats['files']} 个文件, {stats['shares']} 个分享")
         print(f"{'='*50}")
         
     finally:
@@ -3,8 +3,10 @@ sys.stdout.reconfigure(encoding='utf-8')
 sys.path.insert(0, '.')
 import asyncio
 from app.database import SessionLocal
+from app.core.config_cache import config_cache
 from app.models.models import ShareLink
 from app.api.shares import parse_and_update_share
+from app.services.tmdb_service import wait_prefetches
 
 async def main():
     db = SessionLocal()
@@ -15,6 +17,7 @@ async def main():
     
     total = len(shares)
     print(f'[START] Parsing {total} shares with 5 threads', flush=True)
+    config_cache.load(db)
     db.close()
     
     if total == 0:
@@ -35,9 +38,10 @@ async def main():
                 failed += 1
             if (idx + 1) % 50 == 0:
                 print(f'Progress: {idx+1}/{total} (ok:{success} fail:{failed})', flush=True)
-            await asyncio.sleep(0.2)
     
     await asyncio.gather(*[parse_one(i, s) for i, s in enumerate(shares)])
+    # 等待后台预取的剧集信息写入完成（asyncio.run 退出时会取消未完成的任务）
+    await wait_prefetches()
     print(f'[DONE] Success: {success}, Failed: {failed}', flush=True)
 
 if __name__ == '__main__':
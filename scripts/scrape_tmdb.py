@@ -1,34 +1,37 @@
 """
 为现有分享刮削 TMDB 元数据
+
+用法: python scripts/scrape_tmdb.py [同时刮削的分享数，默认 TMDB 并发上限]
+请求速率由共享的 TMDB 客户端控制（tmdb_rate_limit），超出时排队等待
 """
 import asyncio
 import sys
 sys.path.insert(0, '.')
 
+from app.config import get_settings
 from app.database import SessionLocal
 from app.models.models import ShareLink, MediaMetadata
-from app.services.tmdb_service import TMDBService
+from app.services.tmdb_client import tmdb_client
+from app.services.tmdb_service import TMDBService, wait_prefetches
 
 
 async def scrape_share(db, tmdb_service: TMDBService, share: ShareLink):
-    """为单个分享刮削 TMDB 元数据"""
-    print(f"\n{'='*50}")
-    print(f"刮削分享 ID={share.id}: {share.clean_title}")
-    print(f"  类型: {share.share_type}")
-    
+    """为单个分享刮削 TMDB 元数据（并发执行，每个分享的结果打印为一行）"""
+    prefix = f"分享 ID={share.id} [{share.share_type}] {share.clean_title}"
+
     # 跳过电影合集（需要单独处理每个子文件夹）
     if share.share_type == "movie_collection":
-        print(f"  [跳过] 电影合集需要单独刮削子文件夹")
+        print(f"{prefix}: [跳过] 电影合集需要单独刮削子文件夹")
         return False
-    
+
     # 跳过已有元数据的
     if share.media_id:
-        print(f"  [跳过] 已有元数据 media_id={share.media_id}")
+        print(f"{prefix}: [跳过] 已有元数据 media_id={share.media_id}")
         return True
-    
+
     # 确定 TMDB 媒体类型
     media_type = "tv" if share.share_type == "tv" else "movie"
-    
+
     try:
         # 搜索并缓存
         metadata = await tmdb_service.search_and_cache(
@@ -36,67 +39,76 @@ async def scrape_share(db, tmdb_service: TMDBService, share: ShareLink):
             year=None,  # 暂不使用年份
             media_type=media_type
         )
-        
+
         if metadata:
             # 更新分享记录
             share.media_id = metadata.id
             share.poster_url = metadata.poster_url
             db.commit()
-            
-            print(f"  [成功] 匹配到: {metadata.title} ({metadata.year})")
-            print(f"  TMDB ID: {metadata.tmdb_id}")
-            print(f"  评分: {metadata.rating}")
-            print(f"  海报: {metadata.poster_url}")
+
+            print(
+                f"{prefix}: [成功] {metadata.title} ({metadata.year}) "
+                f"TMDB ID={metadata.tmdb_id} 评分={metadata.rating}"
+            )
+            # 电视剧在后台预取全部季和集信息（脚本结束前等待完成）
+            tmdb_service.prefetch_series(metadata)
             return True
         else:
-            print(f"  [失败] 未找到匹配的 TMDB 记录")
+            print(f"{prefix}: [失败] 未找到匹配的 TMDB 记录")
             return False
-            
+
     except Exception as e:
-        print(f"  [错误] {e}")
+        print(f"{prefix}: [错误] {e}")
         import traceback
         traceback.print_exc()
         return False
 
 
+async def scrape_share_by_id(share_id: int, semaphore: asyncio.Semaphore) -> bool:
+    """并发刮削时每个分享使用独立的数据库会话"""
+    async with semaphore:
+        db = SessionLocal()
+        try:
+            share = db.query(ShareLink).filter(ShareLink.id == share_id).first()
+            if not share:
+                return False
+            return await scrape_share(db, TMDBService(db), share)
+        finally:
+            db.close()
+
+
 async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else get_settings().tmdb_max_concurrency
     db = SessionLocal()
-    tmdb_service = TMDBService(db)
-    
+
     try:
         # 获取所有需要刮削的分享（排除电影合集）
-        shares = db.query(ShareLink).filter(
+        share_ids = [row.id for row in db.query(ShareLink.id).filter(
             ShareLink.status == "active",
             ShareLink.media_id == None,
             ShareLink.share_type.in_(["tv", "movie"])
-        ).all()
-        
-        print(f"找到 {len(shares)} 个分享需要刮削 TMDB 元数据")
-        
-        success = 0
-        failed = 0
-        
-        for share in shares:
-            if await scrape_share(db, tmdb_service, share):
-                success += 1
-            else:
-                failed += 1
-            
-            # 避免请求过快（TMDB 有速率限制）
-            await asyncio.sleep(0.5)
-        
+        )]
+
+        print(f"找到 {len(share_ids)} 个分享需要刮削 TMDB 元数据（并发 {concurrency}）")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(*(scrape_share_by_id(share_id, semaphore) for share_id in share_ids))
+        success = sum(1 for ok in results if ok)
+        failed = len(results) - success
+
         print(f"\n{'='*50}")
         print(f"刮削完成: 成功 {success}, 失败 {failed}")
         print(f"{'='*50}")
-        
+
         # 显示已缓存的元数据统计
         total_metadata = db.query(MediaMetadata).count()
         print(f"\n元数据缓存总数: {total_metadata}")
-        
+
     finally:
         db.close()
+        await wait_prefetches()
+        await tmdb_client.close()
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
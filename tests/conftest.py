@@ -0,0 +1,11 @@
+"""测试公共配置：使用临时 SQLite 数据库，必须在导入 app 之前设置"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_tmp_dir = tempfile.mkdtemp(prefix="video-api-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ.setdefault("REDIS_URL", "")
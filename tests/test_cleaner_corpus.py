@@ -0,0 +1,7 @@
+"""清洗规则回归：scripts/cleaner_corpus.json 中的期望输出（与 cleaner_bench.py --no-bench 相同）"""
+from scripts import cleaner_bench
+
+
+def test_corpus_matches_expected():
+    corpus = cleaner_bench.load_json(cleaner_bench.DEFAULT_CORPUS)
+    assert cleaner_bench.check(corpus, cleaner_bench.build_targets()) == 0
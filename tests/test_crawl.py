@@ -0,0 +1,46 @@
+"""分享目录树爬取：预算和完整性标记"""
+import asyncio
+
+from app.services import parser_base
+from app.services.parser_base import BaseShareParser
+
+# 目录 ID -> [(文件 ID, 文件名, 是否目录)]
+TREE = {
+    "root": [("d1", "Season 1", True), ("f0", "readme.txt", False)],
+    "d1": [("d2", "extras", True), ("f1", "E01.mp4", False)],
+    "d2": [("f2", "making-of.mp4", False)],
+}
+
+
+class TreeParser(BaseShareParser):
+    drive_type = "stub"
+
+    def __init__(self):
+        super().__init__(base_url="http://stub")
+
+    def _extract_share_code(self, share_url):
+        return "code"
+
+    async def _get_share_info(self, share_code, password=None):
+        return {"fileName": "测试剧 第一季", "fileId": "root", "isFolder": True, "shareId": "s"}
+
+    async def _iter_file_list(self, share_info, folder_id, password=None, parent_path=""):
+        yield [
+            self._make_file_entry(file_id, name, 1, is_dir, folder_id, parent_path)
+            for file_id, name, is_dir in TREE[folder_id]
+        ]
+
+
+def test_crawl_within_max_depth_is_complete(monkeypatch):
+    monkeypatch.setattr(parser_base.settings, "share_crawl_max_depth", 5)
+    result = asyncio.run(TreeParser().parse_share("stub://s"))
+    assert result["complete"] is True
+    assert result["file_count"] == 5
+
+
+def test_directory_at_max_depth_marks_truncated(monkeypatch):
+    monkeypatch.setattr(parser_base.settings, "share_crawl_max_depth", 1)
+    result = asyncio.run(TreeParser().parse_share("stub://s"))
+    assert result["complete"] is False
+    # d2 作为目录条目产出，但没有列举
+    assert {f["file_id"] for f in result["files"]} == {"d1", "f0", "d2", "f1"}
@@ -0,0 +1,40 @@
+"""数据库迁移：空库按应用启动流程建表并执行全部迁移"""
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MIGRATIONS = sorted(p.stem for p in (ROOT / "migrations").glob("*.sql"))
+
+
+def test_all_migrations_apply_on_empty_db(tmp_path):
+    db_path = tmp_path / "empty.db"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    # 与应用启动一致：create_all 建表后执行迁移（独立进程，使用新的数据库引擎）
+    script = (
+        "from app.database import Base, engine\n"
+        "import app.models.models, app.models.user, app.models.app_version\n"
+        "Base.metadata.create_all(bind=engine)\n"
+        "from app.migrations import run_migrations\n"
+        "run_migrations()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+
+    conn = sqlite3.connect(db_path)
+    try:
+        applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+        assert applied == set(MIGRATIONS), result.stdout
+
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(media_metadata)")}
+        assert {"imdb_id", "alternative_titles"} <= columns
+
+        # 003 重建表后 (tmdb_id, media_type) 联合唯一
+        conn.execute("INSERT INTO media_metadata (tmdb_id, media_type, title) VALUES (1, 'movie', 'a')")
+        conn.execute("INSERT INTO media_metadata (tmdb_id, media_type, title) VALUES (1, 'tv', 'b')")
+    finally:
+        conn.close()
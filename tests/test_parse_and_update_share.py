@@ -0,0 +1,82 @@
+"""解析分享并写入文件列表：爬取期间不持有数据库写事务"""
+import asyncio
+import itertools
+
+from app.api import shares
+from app.database import Base, SessionLocal, engine
+from app.models.models import ShareFile, ShareLink
+
+
+class StubParser:
+    """分批产出文件，批次之间等待（模拟网盘翻页请求）"""
+
+    def __init__(self, file_ids, batches: int = 3, delay: float = 0.05):
+        self.file_ids = file_ids
+        self.batches = batches
+        self.delay = delay
+
+    async def parse_share(self, share_url, password=None, on_files=None):
+        size = -(-len(self.file_ids) // self.batches)
+        for i in range(0, len(self.file_ids), size):
+            await asyncio.sleep(self.delay)
+            await on_files([
+                {"file_id": file_id, "file_name": f"{file_id}.mp4", "file_size": 1, "is_directory": False}
+                for file_id in self.file_ids[i:i + size]
+            ])
+        return {
+            "raw_title": "stub", "clean_title": "", "share_type": "tv", "share_code": "code",
+            "file_count": len(self.file_ids), "complete": True, "sharer_info": {}
+        }
+
+
+_url_seq = itertools.count()
+
+
+def _create_shares(count: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        rows = [
+            ShareLink(drive_type="stub", share_url=f"https://stub/parse-{next(_url_seq)}", status="pending")
+            for _ in range(count)
+        ]
+        db.add_all(rows)
+        db.commit()
+        return [row.id for row in rows]
+    finally:
+        db.close()
+
+
+def _share_state(share_id):
+    db = SessionLocal()
+    try:
+        share = db.query(ShareLink).filter(ShareLink.id == share_id).first()
+        files = {f.file_id for f in db.query(ShareFile).filter(ShareFile.share_link_id == share_id)}
+        return share.status, files
+    finally:
+        db.close()
+
+
+def test_concurrent_parses_all_succeed(monkeypatch):
+    monkeypatch.setattr(shares, "get_parser", lambda drive_type: StubParser([f"f{i}" for i in range(6)]))
+    share_ids = _create_shares(3)
+
+    async def parse_all():
+        await asyncio.gather(*(
+            shares.parse_and_update_share(share_id, f"https://stub/{share_id}", None, "stub")
+            for share_id in share_ids
+        ))
+
+    asyncio.run(parse_all())
+    for share_id in share_ids:
+        assert _share_state(share_id) == ("active", {f"f{i}" for i in range(6)})
+
+
+def test_reparse_applies_diff_after_crawl(monkeypatch):
+    (share_id,) = _create_shares(1)
+    monkeypatch.setattr(shares, "get_parser", lambda drive_type: StubParser(["a", "b", "c"]))
+    asyncio.run(shares.parse_and_update_share(share_id, "https://stub/x", None, "stub"))
+
+    monkeypatch.setattr(shares, "get_parser", lambda drive_type: StubParser(["b", "c", "d"]))
+    asyncio.run(shares.parse_and_update_share(share_id, "https://stub/x", None, "stub"))
+    assert _share_state(share_id) == ("active", {"b", "c", "d"})
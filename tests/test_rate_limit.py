@@ -0,0 +1,30 @@
+"""自适应令牌桶"""
+from app.core.rate_limit import TokenBucket
+
+
+def test_penalize_unlimited_starts_from_probe_rate():
+    bucket = TokenBucket(0, probe_rate=8.0)
+    bucket.penalize()
+    assert bucket.rate == 8.0
+    bucket.penalize()
+    assert bucket.rate == 4.0
+
+
+def test_unlimited_recovers_to_unlimited():
+    bucket = TokenBucket(0, probe_rate=8.0, recovery_ratio=0.25)
+    bucket.penalize()
+    bucket.penalize()
+    bucket.reward()
+    assert bucket.rate == 6.0
+    bucket.reward()
+    assert bucket.rate == 0
+
+
+def test_limited_rate_backoff_and_recovery():
+    bucket = TokenBucket(10.0, recovery_ratio=0.5)
+    bucket.penalize()
+    assert bucket.rate == 5.0
+    bucket.reward()
+    assert bucket.rate == 10.0
+    bucket.reward()
+    assert bucket.rate == 10.0
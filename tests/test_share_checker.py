@@ -0,0 +1,54 @@
+"""分享有效性检测：多个 worker 认领分享时不重复检测"""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.database import Base, SessionLocal, engine
+from app.models.models import ShareLink
+from app.services.share_checker import ShareChecker
+
+
+def _reset_shares(count: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.query(ShareLink).delete()
+        past = datetime.utcnow() - timedelta(hours=1)
+        for i in range(count):
+            db.add(ShareLink(
+                drive_type="tianyi", share_url=f"https://cloud.189.cn/t/code{i}", share_code=f"code{i}",
+                status="active", next_check_at=None if i % 2 else past
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_claims_are_disjoint():
+    _reset_shares(6)
+    now = datetime.utcnow()
+    first = ShareChecker()._claim_due_shares(now, 4)
+    second = ShareChecker()._claim_due_shares(now, 4)
+
+    first_ids = {share["id"] for share in first}
+    second_ids = {share["id"] for share in second}
+    assert len(first_ids) == 4 and len(second_ids) == 2
+    assert not first_ids & second_ids
+
+
+def test_concurrent_workers_check_each_share_once():
+    _reset_shares(10)
+    checked = []
+
+    class CountingChecker(ShareChecker):
+        async def _check_one(self, share):
+            checked.append(share["id"])
+            await asyncio.sleep(0)
+            return True
+
+    async def run_workers():
+        return await asyncio.gather(CountingChecker().run_once(), CountingChecker().run_once())
+
+    stats = asyncio.run(run_workers())
+    assert sorted(checked) == sorted(set(checked))
+    assert len(checked) == 10
+    assert sum(s["alive"] for s in stats) == 10
@@ -0,0 +1,160 @@
+"""网盘解析器：用 httpx.MockTransport 模拟网盘接口"""
+import asyncio
+from typing import Callable
+
+import httpx
+import pytest
+
+from app.services.aliyun_parser import AliyunShareParser
+from app.services.quark_parser import QuarkShareParser
+from app.services.share_parser import TianYiShareParser
+
+
+def _with_stub(parser, handler: Callable[[httpx.Request], httpx.Response]):
+    """让解析器的共享客户端请求本地桩接口"""
+    parser._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return parser
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+# ---------- 天翼云盘：限流错误码 ----------
+
+def test_tianyi_rate_limit_code_penalizes():
+    parser = _with_stub(TianYiShareParser(), lambda req: httpx.Response(
+        200, json={"res_code": "ErrorAccessTooFrequently", "res_message": "too frequent"}
+    ))
+    rate = parser.rate_limiter.rate
+    assert _run(parser._fetch_share_info("abc", use_cache=False)) is None
+    assert parser.rate_limiter.rate < rate
+
+
+def test_tianyi_ordinary_error_code_does_not_penalize():
+    parser = _with_stub(TianYiShareParser(), lambda req: httpx.Response(
+        200, json={"res_code": "InvalidArgument", "res_message": "bad"}
+    ))
+    rate = parser.rate_limiter.rate
+    assert _run(parser._fetch_share_info("abc", use_cache=False)) is None
+    assert parser.rate_limiter.rate == rate
+
+
+def test_tianyi_http_500_does_not_penalize():
+    parser = _with_stub(TianYiShareParser(), lambda req: httpx.Response(500))
+    rate = parser.rate_limiter.rate
+    _run(parser._fetch_share_info("abc", use_cache=False))
+    assert parser.rate_limiter.rate == rate
+
+
+def test_tianyi_list_error_code_raises():
+    parser = _with_stub(TianYiShareParser(), lambda req: httpx.Response(
+        200, json={"res_code": "ServiceBusy", "res_message": "busy"}
+    ))
+
+    async def first_page():
+        async for page in parser._iter_file_list_v2("1", "2"):
+            return page
+
+    with pytest.raises(RuntimeError):
+        _run(first_page())
+
+
+# ---------- 分享存活检测：正常 / 失效 / 无法判断 ----------
+
+def _check(parser, handler) -> bool:
+    return _run(_with_stub(parser, handler).check_share("abc"))
+
+
+def test_tianyi_check_share_alive():
+    assert _check(TianYiShareParser(), lambda req: httpx.Response(
+        200, json={"res_code": 0, "shareId": 1, "fileId": "2"}
+    )) is True
+
+
+def test_tianyi_check_share_dead():
+    assert _check(TianYiShareParser(), lambda req: httpx.Response(
+        200, json={"res_code": "ShareInfoNotFound", "res_message": "share not found"}
+    )) is False
+
+
+def test_tianyi_check_share_unknown():
+    assert _check(TianYiShareParser(), lambda req: httpx.Response(500)) is None
+    assert _check(TianYiShareParser(), lambda req: httpx.Response(
+        200, json={"res_code": "ServiceBusy", "res_message": "busy"}
+    )) is None
+
+
+def test_aliyun_check_share_alive():
+    assert _check(AliyunShareParser(), lambda req: httpx.Response(
+        200, json={"share_name": "demo", "file_infos": []}
+    )) is True
+
+
+def test_aliyun_check_share_dead():
+    assert _check(AliyunShareParser(), lambda req: httpx.Response(
+        400, json={"code": "ShareLink.Cancelled", "message": "share link cancelled"}
+    )) is False
+
+
+def test_aliyun_check_share_unknown():
+    assert _check(AliyunShareParser(), lambda req: httpx.Response(500, text="gateway error")) is None
+    assert _check(AliyunShareParser(), lambda req: httpx.Response(
+        429, json={"code": "TooManyRequests", "message": "slow down"}
+    )) is None
+
+
+def _quark_handler(token: httpx.Response, detail: httpx.Response = None):
+    def handler(req: httpx.Request) -> httpx.Response:
+        if req.url.path.endswith("/sharepage/token"):
+            return token
+        return detail or httpx.Response(500)
+    return handler
+
+
+def test_quark_check_share_alive():
+    assert _check(QuarkShareParser(), _quark_handler(
+        httpx.Response(200, json={"code": 0, "data": {"stoken": "st"}}),
+        httpx.Response(200, json={"code": 0, "data": {"list": [{"fid": "1"}]}})
+    )) is True
+
+
+def test_quark_check_share_dead():
+    assert _check(QuarkShareParser(), _quark_handler(
+        httpx.Response(404, json={"code": 41006, "message": "分享不存在"})
+    )) is False
+    # token 正常但分享文件已被删除
+    assert _check(QuarkShareParser(), _quark_handler(
+        httpx.Response(200, json={"code": 0, "data": {"stoken": "st"}}),
+        httpx.Response(400, json={"code": 41004, "message": "分享地址已失效"})
+    )) is False
+
+
+def test_quark_check_share_unknown():
+    assert _check(QuarkShareParser(), _quark_handler(httpx.Response(500, text="oops"))) is None
+    # 提取码错误不能说明分享失效
+    assert _check(QuarkShareParser(), _quark_handler(
+        httpx.Response(400, json={"code": 41008, "message": "提取码错误"})
+    )) is None
+    assert _check(QuarkShareParser(), _quark_handler(
+        httpx.Response(200, json={"code": 0, "data": {"stoken": "st"}}),
+        httpx.Response(503, json={"code": 50001, "message": "busy"})
+    )) is None
+
+
+def test_quark_multi_item_root_is_listed_once():
+    paths = []
+
+    def handler(req: httpx.Request) -> httpx.Response:
+        paths.append(req.url.path)
+        if req.url.path.endswith("/sharepage/token"):
+            return httpx.Response(200, json={"code": 0, "data": {"stoken": "st", "title": "测试剧"}})
+        return httpx.Response(200, json={"code": 0, "data": {"list": [
+            {"fid": "1", "file_name": "E01.mp4", "size": 1},
+            {"fid": "2", "file_name": "E02.mp4", "size": 1},
+        ]}})
+
+    parser = _with_stub(QuarkShareParser(), handler)
+    result = _run(parser.parse_share("https://pan.quark.cn/s/abc"))
+    assert result["file_count"] == 2
+    assert sum(path.endswith("/sharepage/detail") for path in paths) == 1
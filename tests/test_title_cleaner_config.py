@@ -0,0 +1,60 @@
+"""追加的清洗规则：多个配置同时变化时只重建一次，结果包含全部配置"""
+import pytest
+
+from app.core.config_cache import ConfigCache, config_cache
+from app.services.title_cleaner import TitleCleaner, title_cleaner
+
+REMOVE_KEY = "title_cleaner_remove_patterns"
+TV_KEY = "title_cleaner_tv_keywords"
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """记录标题清洗器的重建次数，测试结束后恢复配置缓存和追加规则"""
+    values, loaded = dict(config_cache._values), config_cache._loaded
+    calls = []
+    set_extra_rules = title_cleaner.set_extra_rules
+
+    def counting(rules):
+        calls.append(dict(rules))
+        set_extra_rules(rules)
+
+    monkeypatch.setattr(title_cleaner, "set_extra_rules", counting)
+    yield calls
+    monkeypatch.undo()
+    config_cache._replace(values)
+    config_cache._loaded = loaded
+
+
+def test_subscribe_many_called_once_per_change():
+    cache = ConfigCache()
+    received = []
+    cache.subscribe_many(["a", "b"], received.append)
+
+    cache._replace({"a": "1", "b": "2", "c": "3"})
+    cache._replace({"a": "1", "b": "2", "c": "4"})
+    cache.set_local("b", None)
+
+    assert received == [{"a": "1", "b": "2"}, {"a": "1", "b": None}]
+
+
+def test_two_keys_changed_together_rebuild_once(rebuilds):
+    config_cache._replace({**config_cache._values, REMOVE_KEY: "某水印站", TV_KEY: "短剧\n微短剧"})
+
+    assert len(rebuilds) == 1
+    expected = TitleCleaner()
+    expected.set_extra_rules({"remove": ["某水印站"], "tv_keyword": ["短剧", "微短剧"]})
+    assert title_cleaner.version == expected.version
+
+    result = title_cleaner.clean("某水印站 逆袭人生 短剧")
+    assert "水印" not in result.clean_title
+    assert result.share_type == "tv"
+
+
+def test_later_key_change_keeps_other_rules(rebuilds):
+    config_cache._replace({**config_cache._values, REMOVE_KEY: "某水印站", TV_KEY: "短剧"})
+    config_cache.set_local(TV_KEY, "微短剧")
+
+    assert len(rebuilds) == 2
+    assert title_cleaner._extra_rules["remove"] == ("某水印站",)
+    assert title_cleaner._extra_rules["tv_keyword"] == ("微短剧",)
@@ -0,0 +1,104 @@
+"""电视剧集信息预取：后台执行，季和集信息在同一个事务中写入"""
+import asyncio
+
+import pytest
+
+from app.database import Base, SessionLocal, engine
+from app.models.models import MediaMetadata, TvEpisode, TvSeason
+from app.services import tmdb_service
+from app.services.tmdb_service import TMDBService
+
+
+@pytest.fixture
+def media_id():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        media = MediaMetadata(tmdb_id=900001, media_type="tv", title="测试剧")
+        db.add(media)
+        db.commit()
+        yield media.id
+        season_ids = [s.id for s in db.query(TvSeason.id).filter(TvSeason.media_id == media.id)]
+        db.query(TvEpisode).filter(TvEpisode.season_id.in_(season_ids)).delete(synchronize_session=False)
+        db.query(TvSeason).filter(TvSeason.media_id == media.id).delete(synchronize_session=False)
+        db.query(MediaMetadata).filter(MediaMetadata.id == media.id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _stub_tmdb(monkeypatch, fail_batches: bool = False):
+    async def details(self, tmdb_id, media_type):
+        return {"seasons": [{"id": 11, "season_number": 1}, {"id": 12, "season_number": 2}]}
+
+    async def season_batch(self, tmdb_id, numbers):
+        if fail_batches:
+            raise RuntimeError("tmdb down")
+        await asyncio.sleep(0.01)
+        return {n: {"episodes": [{"id": n * 100 + i, "episode_number": i} for i in (1, 2, 3)]} for n in numbers}
+
+    monkeypatch.setattr(TMDBService, "_get_tmdb_details", details)
+    monkeypatch.setattr(TMDBService, "_get_season_batch", season_batch)
+    monkeypatch.setattr(tmdb_service.settings, "tmdb_prefetch_episodes", True)
+
+
+def _counts(media_id):
+    db = SessionLocal()
+    try:
+        seasons = db.query(TvSeason).filter(TvSeason.media_id == media_id).count()
+        episodes = db.query(TvEpisode).join(TvSeason).filter(TvSeason.media_id == media_id).count()
+        return seasons, episodes
+    finally:
+        db.close()
+
+
+def test_prefetch_runs_in_background(monkeypatch, media_id):
+    _stub_tmdb(monkeypatch)
+
+    async def scrape():
+        db = SessionLocal()
+        try:
+            media = db.query(MediaMetadata).filter(MediaMetadata.id == media_id).first()
+            task = TMDBService(db).prefetch_series(media)
+            # 同一部剧重复调度返回同一个任务，调度本身不等待 TMDB
+            assert TMDBService(db).prefetch_series(media) is task
+            assert not task.done()
+        finally:
+            db.close()
+        await tmdb_service.wait_prefetches()
+
+    asyncio.run(scrape())
+    assert _counts(media_id) == (2, 6)
+
+
+def test_seasons_not_written_without_episodes(monkeypatch, media_id):
+    _stub_tmdb(monkeypatch, fail_batches=True)
+
+    async def hydrate():
+        db = SessionLocal()
+        try:
+            media = db.query(MediaMetadata).filter(MediaMetadata.id == media_id).first()
+            with pytest.raises(RuntimeError):
+                await TMDBService(db).hydrate_series(media)
+        finally:
+            db.close()
+
+    asyncio.run(hydrate())
+    assert _counts(media_id) == (0, 0)
+
+
+def test_missing_season_episodes_are_refilled(monkeypatch, media_id):
+    _stub_tmdb(monkeypatch)
+    db = SessionLocal()
+    try:
+        db.add_all([
+            TvSeason(media_id=media_id, season_number=1),
+            TvSeason(media_id=media_id, season_number=2),
+        ])
+        db.commit()
+        media = db.query(MediaMetadata).filter(MediaMetadata.id == media_id).first()
+        episodes = asyncio.run(TMDBService(db).fetch_season_episodes(media, 2))
+        assert [e.episode_number for e in episodes] == [1, 2, 3]
+    finally:
+        db.close()
+    assert _counts(media_id) == (2, 3)